@@ -0,0 +1,65 @@
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import engine_from_config, pool
+
+from app import models  # noqa: F401
+from app.core.config import settings
+from app.db.base import Base
+from app.services.partitions import PARTITION_PREFIX, RETIRED_TABLE
+
+config = context.config
+config.set_main_option("sqlalchemy.url", settings.database_url.replace("%", "%%"))
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def include_object(obj, name, type_, reflected, compare_to) -> bool:
+    # Description search is built per dialect (app/models/transaction.py):
+    # indexes declared with ddl_if exist only on their dialect, and the FTS5
+    # table and its shadow tables are raw DDL outside the metadata.
+    if type_ == "table" and reflected and name.startswith("transactions_fts"):
+        return False
+    # Partitions of transactions, and the table they replaced, are managed by
+    # app/services/partitions.py.
+    if type_ == "table" and reflected and (name.startswith(PARTITION_PREFIX) or name == RETIRED_TABLE):
+        return False
+    if type_ == "index" and not reflected and obj._ddl_if is not None:
+        return obj._ddl_if.dialect == context.get_context().dialect.name
+    return True
+
+
+def run_migrations_offline() -> None:
+    context.configure(
+        url=config.get_main_option("sqlalchemy.url"),
+        target_metadata=target_metadata,
+        include_object=include_object,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    connectable = engine_from_config(
+        config.get_section(config.config_ini_section, {}),
+        prefix="sqlalchemy.",
+        poolclass=pool.NullPool,
+    )
+
+    with connectable.connect() as connection:
+        context.configure(connection=connection, target_metadata=target_metadata, include_object=include_object)
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,41 @@
+"""monthly_summaries rollup
+
+Revision ID: 0001a
+Revises: 0001
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001a"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Revision 0001 used to create this table as well; databases upgraded
+    # through that version already have it.
+    if not op.get_context().as_sql and sa.inspect(op.get_bind()).has_table("monthly_summaries"):
+        return
+    op.create_table(
+        "monthly_summaries",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("month", sa.String(length=7), nullable=False),
+        sa.Column("category_id", sa.Integer(), nullable=False),
+        sa.Column("type", sa.String(length=20), nullable=False),
+        sa.Column("total", sa.Numeric(14, 2), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["category_id"], ["categories.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "month", "category_id", "type"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("monthly_summaries")
@@ -0,0 +1,44 @@
+"""composite indexes for the list, filter and category probe queries
+
+Revision ID: 0002
+Revises: 0001a
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_transactions_user_date_id",
+        "transactions",
+        ["user_id", sa.text("date DESC"), sa.text("id DESC")],
+    )
+    op.create_index("ix_transactions_user_category_date", "transactions", ["user_id", "category_id", "date"])
+    op.create_index("ix_transactions_category_id", "transactions", ["category_id"])
+    op.create_index("ix_budgets_user_month", "budgets", ["user_id", "month"])
+    op.create_index("ix_budgets_category_id", "budgets", ["category_id"])
+    op.create_index("ix_categories_user_id", "categories", ["user_id", "id"])
+    op.create_index("ix_goals_user_id", "goals", ["user_id", "id"])
+    op.create_index("ix_monthly_summaries_category_id", "monthly_summaries", ["category_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_monthly_summaries_category_id", table_name="monthly_summaries")
+    op.drop_index("ix_goals_user_id", table_name="goals")
+    op.drop_index("ix_categories_user_id", table_name="categories")
+    op.drop_index("ix_budgets_category_id", table_name="budgets")
+    op.drop_index("ix_budgets_user_month", table_name="budgets")
+    op.drop_index("ix_transactions_category_id", table_name="transactions")
+    op.drop_index("ix_transactions_user_category_date", table_name="transactions")
+    op.drop_index("ix_transactions_user_date_id", table_name="transactions")
@@ -0,0 +1,42 @@
+"""link goals to a category and let transactions be tagged with a goal
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("goals") as batch:
+        batch.add_column(sa.Column("category_id", sa.Integer(), nullable=True))
+        batch.create_foreign_key("fk_goals_category_id", "categories", ["category_id"], ["id"], ondelete="SET NULL")
+    op.create_index("ix_goals_user_category", "goals", ["user_id", "category_id"])
+
+    with op.batch_alter_table("transactions") as batch:
+        batch.add_column(sa.Column("goal_id", sa.Integer(), nullable=True))
+        batch.create_foreign_key("fk_transactions_goal_id", "goals", ["goal_id"], ["id"], ondelete="SET NULL")
+    op.create_index("ix_transactions_goal_id", "transactions", ["goal_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_transactions_goal_id", table_name="transactions")
+    with op.batch_alter_table("transactions") as batch:
+        batch.drop_constraint("fk_transactions_goal_id", type_="foreignkey")
+        batch.drop_column("goal_id")
+
+    op.drop_index("ix_goals_user_category", table_name="goals")
+    with op.batch_alter_table("goals") as batch:
+        batch.drop_constraint("fk_goals_category_id", type_="foreignkey")
+        batch.drop_column("category_id")
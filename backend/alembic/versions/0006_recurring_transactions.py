@@ -0,0 +1,71 @@
+"""recurring transaction rules and their postings
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "recurring_transactions",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("category_id", sa.Integer(), nullable=False),
+        sa.Column("goal_id", sa.Integer(), nullable=True),
+        sa.Column("amount", sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.Column("type", sa.String(length=20), nullable=False),
+        sa.Column("description", sa.String(length=255), nullable=True),
+        sa.Column("frequency", sa.String(length=10), nullable=False),
+        sa.Column("interval", sa.Integer(), nullable=False),
+        sa.Column("start_date", sa.Date(), nullable=False),
+        sa.Column("end_date", sa.Date(), nullable=True),
+        sa.Column("next_occurrence", sa.Date(), nullable=False),
+        sa.Column("active", sa.Boolean(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["category_id"], ["categories.id"], ondelete="RESTRICT"),
+        sa.ForeignKeyConstraint(["goal_id"], ["goals.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_recurring_transactions_id"), "recurring_transactions", ["id"], unique=False)
+    op.create_index("ix_recurring_transactions_user_id", "recurring_transactions", ["user_id", "id"])
+    op.create_index("ix_recurring_transactions_due", "recurring_transactions", ["active", "next_occurrence"])
+    op.create_index("ix_recurring_transactions_category_id", "recurring_transactions", ["category_id"])
+    op.create_index("ix_recurring_transactions_goal_id", "recurring_transactions", ["goal_id"])
+
+    with op.batch_alter_table("transactions") as batch:
+        batch.add_column(sa.Column("recurring_id", sa.Integer(), nullable=True))
+        batch.add_column(sa.Column("occurrence_date", sa.Date(), nullable=True))
+        batch.create_foreign_key(
+            "fk_transactions_recurring_id", "recurring_transactions", ["recurring_id"], ["id"], ondelete="SET NULL"
+        )
+    op.create_index(
+        "ix_transactions_recurring_occurrence", "transactions", ["recurring_id", "occurrence_date"], unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_transactions_recurring_occurrence", table_name="transactions")
+    with op.batch_alter_table("transactions") as batch:
+        batch.drop_constraint("fk_transactions_recurring_id", type_="foreignkey")
+        batch.drop_column("occurrence_date")
+        batch.drop_column("recurring_id")
+
+    op.drop_index("ix_recurring_transactions_goal_id", table_name="recurring_transactions")
+    op.drop_index("ix_recurring_transactions_category_id", table_name="recurring_transactions")
+    op.drop_index("ix_recurring_transactions_due", table_name="recurring_transactions")
+    op.drop_index("ix_recurring_transactions_user_id", table_name="recurring_transactions")
+    op.drop_index(op.f("ix_recurring_transactions_id"), table_name="recurring_transactions")
+    op.drop_table("recurring_transactions")
@@ -0,0 +1,71 @@
+"""full-text search over transaction descriptions
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.create_index(
+            "ix_transactions_description_fts",
+            "transactions",
+            [sa.text("to_tsvector('simple'::regconfig, coalesce(description, ''))")],
+            postgresql_using="gin",
+        )
+        op.create_index(
+            "ix_transactions_description_trgm",
+            "transactions",
+            ["description"],
+            postgresql_using="gin",
+            postgresql_ops={"description": "gin_trgm_ops"},
+        )
+    elif dialect == "sqlite":
+        op.execute(
+            "CREATE VIRTUAL TABLE transactions_fts USING fts5("
+            "description, content='transactions', content_rowid='id', "
+            "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+        )
+        op.execute(
+            "CREATE TRIGGER transactions_fts_insert AFTER INSERT ON transactions BEGIN "
+            "INSERT INTO transactions_fts(rowid, description) VALUES (new.id, new.description); END"
+        )
+        op.execute(
+            "CREATE TRIGGER transactions_fts_delete AFTER DELETE ON transactions BEGIN "
+            "INSERT INTO transactions_fts(transactions_fts, rowid, description) "
+            "VALUES ('delete', old.id, old.description); END"
+        )
+        op.execute(
+            "CREATE TRIGGER transactions_fts_update AFTER UPDATE OF description ON transactions BEGIN "
+            "INSERT INTO transactions_fts(transactions_fts, rowid, description) "
+            "VALUES ('delete', old.id, old.description); "
+            "INSERT INTO transactions_fts(rowid, description) VALUES (new.id, new.description); END"
+        )
+        op.execute("INSERT INTO transactions_fts(transactions_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.drop_index("ix_transactions_description_trgm", table_name="transactions")
+        op.drop_index("ix_transactions_description_fts", table_name="transactions")
+    elif dialect == "sqlite":
+        op.execute("DROP TRIGGER transactions_fts_update")
+        op.execute("DROP TRIGGER transactions_fts_delete")
+        op.execute("DROP TRIGGER transactions_fts_insert")
+        op.execute("DROP TABLE transactions_fts")
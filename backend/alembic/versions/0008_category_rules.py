@@ -0,0 +1,46 @@
+"""per-user categorization rules
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "category_rules",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("category_id", sa.Integer(), nullable=False),
+        sa.Column("match_type", sa.String(length=10), nullable=False),
+        sa.Column("patterns", sa.JSON(), nullable=False),
+        sa.Column("amount_min", sa.Numeric(precision=12, scale=2), nullable=True),
+        sa.Column("amount_max", sa.Numeric(precision=12, scale=2), nullable=True),
+        sa.Column("priority", sa.Integer(), nullable=False),
+        sa.Column("active", sa.Boolean(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["category_id"], ["categories.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_category_rules_id"), "category_rules", ["id"], unique=False)
+    op.create_index("ix_category_rules_user_priority", "category_rules", ["user_id", "priority", "id"])
+    op.create_index("ix_category_rules_category_id", "category_rules", ["category_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_category_rules_category_id", table_name="category_rules")
+    op.drop_index("ix_category_rules_user_priority", table_name="category_rules")
+    op.drop_index(op.f("ix_category_rules_id"), table_name="category_rules")
+    op.drop_table("category_rules")
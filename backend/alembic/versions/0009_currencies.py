@@ -0,0 +1,87 @@
+"""currency codes and daily fx rates
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0009"
+down_revision: Union[str, None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_CURRENCY_TABLES = ("transactions", "budgets", "goals", "recurring_transactions")
+
+
+def _summaries_table(name: str, with_currency: bool) -> None:
+    key = ["user_id", "month", "category_id", "type"] + (["currency"] if with_currency else [])
+    op.create_table(
+        name,
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("month", sa.String(length=7), nullable=False),
+        sa.Column("category_id", sa.Integer(), nullable=False),
+        sa.Column("type", sa.String(length=20), nullable=False),
+        *([sa.Column("currency", sa.String(length=3), nullable=False)] if with_currency else []),
+        sa.Column("total", sa.Numeric(14, 2), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["category_id"], ["categories.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint(*key),
+    )
+
+
+def upgrade() -> None:
+    # Plain ADD/DROP COLUMN: SQLite supports both natively, and a batch
+    # rebuild of transactions would drop its full-text search triggers.
+    op.add_column("users", sa.Column("base_currency", sa.String(length=3), server_default="USD", nullable=False))
+    for table in _CURRENCY_TABLES:
+        op.add_column(table, sa.Column("currency", sa.String(length=3), server_default="USD", nullable=False))
+    op.create_index(
+        "ix_transactions_user_currency_date", "transactions", ["user_id", "currency", "date"], unique=False
+    )
+
+    # The rollup key gains the currency; every existing row is in the default.
+    op.drop_index("ix_monthly_summaries_category_id", table_name="monthly_summaries")
+    _summaries_table("monthly_summaries_next", with_currency=True)
+    op.execute(
+        "INSERT INTO monthly_summaries_next (user_id, month, category_id, type, currency, total, count) "
+        "SELECT user_id, month, category_id, type, 'USD', total, count FROM monthly_summaries"
+    )
+    op.drop_table("monthly_summaries")
+    op.rename_table("monthly_summaries_next", "monthly_summaries")
+    op.create_index("ix_monthly_summaries_category_id", "monthly_summaries", ["category_id"])
+
+    op.create_table(
+        "fx_rates",
+        sa.Column("currency", sa.String(length=3), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("rate", sa.Numeric(precision=18, scale=8), nullable=False),
+        sa.PrimaryKeyConstraint("currency", "date"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("fx_rates")
+
+    op.drop_index("ix_monthly_summaries_category_id", table_name="monthly_summaries")
+    _summaries_table("monthly_summaries_next", with_currency=False)
+    op.execute(
+        "INSERT INTO monthly_summaries_next (user_id, month, category_id, type, total, count) "
+        "SELECT user_id, month, category_id, type, SUM(total), SUM(count) FROM monthly_summaries "
+        "GROUP BY user_id, month, category_id, type"
+    )
+    op.drop_table("monthly_summaries")
+    op.rename_table("monthly_summaries_next", "monthly_summaries")
+    op.create_index("ix_monthly_summaries_category_id", "monthly_summaries", ["category_id"])
+
+    op.drop_index("ix_transactions_user_currency_date", table_name="transactions")
+    for table in reversed(_CURRENCY_TABLES):
+        op.drop_column(table, "currency")
+    op.drop_column("users", "base_currency")
@@ -0,0 +1,36 @@
+"""date in the recurring occurrence key
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0010"
+down_revision: Union[str, None] = "0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Unique indexes on a table partitioned by date must include the date. A
+    # posting is dated on its occurrence, so the key admits the same rows.
+    op.drop_index("ix_transactions_recurring_occurrence", table_name="transactions")
+    op.create_index(
+        "ix_transactions_recurring_occurrence",
+        "transactions",
+        ["recurring_id", "occurrence_date", "date"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_transactions_recurring_occurrence", table_name="transactions")
+    op.create_index(
+        "ix_transactions_recurring_occurrence", "transactions", ["recurring_id", "occurrence_date"], unique=True
+    )
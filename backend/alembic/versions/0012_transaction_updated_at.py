@@ -0,0 +1,31 @@
+"""last write time of each transaction
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0012"
+down_revision: Union[str, None] = "0011"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Nullable without a server default: SQLite can add that without a batch
+    # rebuild (which would drop the search triggers), and the app sets it on
+    # every insert and update. Rows written before this stay NULL.
+    op.add_column("transactions", sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True))
+    op.create_index("ix_transactions_user_updated_at", "transactions", ["user_id", "updated_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_transactions_user_updated_at", table_name="transactions")
+    op.drop_column("transactions", "updated_at")
@@ -0,0 +1,191 @@
+import datetime as dt
+from decimal import Decimal
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import ColumnElement, Select, func, select
+from sqlalchemy.orm import Session
+
+from app.api.deps import Principal, get_read_db, get_read_principal
+from app.api.fx import missing_rate
+from app.db.functions import money_sum, month_of
+from app.models import Category, MonthlySummary, Transaction
+from app.schemas.analytics import AnalyticsResponse, AnalyticsTotals, CategoryAnalytics, MonthlyAnalytics
+from app.services.fx import MissingRate, converted_totals, load_rates
+from app.services.transactions import transaction_filters
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+
+def _covers_whole_months(start_date: dt.date | None, end_date: dt.date | None) -> bool:
+    starts_on_month = start_date is None or start_date.day == 1
+    ends_on_month = end_date is None or (end_date + dt.timedelta(days=1)).day == 1
+    return starts_on_month and ends_on_month
+
+
+def _summary_filters(
+    user_id: int,
+    start_date: dt.date | None,
+    end_date: dt.date | None,
+    category_id: int | None,
+    transaction_type: str | None,
+) -> list[ColumnElement[bool]]:
+    conditions = [MonthlySummary.user_id == user_id]
+
+    if start_date:
+        conditions.append(MonthlySummary.month >= start_date.strftime("%Y-%m"))
+    if end_date:
+        conditions.append(MonthlySummary.month <= end_date.strftime("%Y-%m"))
+    if category_id:
+        conditions.append(MonthlySummary.category_id == category_id)
+    if transaction_type:
+        conditions.append(MonthlySummary.type == transaction_type)
+    return conditions
+
+
+def summary_query(
+    user_id: int,
+    start_date: dt.date | None = None,
+    end_date: dt.date | None = None,
+    category_id: int | None = None,
+    transaction_type: str | None = None,
+) -> Select:
+    return select(
+        MonthlySummary.month,
+        MonthlySummary.category_id,
+        MonthlySummary.type,
+        MonthlySummary.currency,
+        MonthlySummary.total,
+        MonthlySummary.count,
+    ).where(*_summary_filters(user_id, start_date, end_date, category_id, transaction_type))
+
+
+def partial_month_query(
+    user_id: int,
+    currency: str,
+    start_date: dt.date | None = None,
+    end_date: dt.date | None = None,
+    category_id: int | None = None,
+    transaction_type: str | None = None,
+) -> Select:
+    conditions = transaction_filters(user_id, start_date, end_date, category_id, transaction_type)
+    group_by = (month_of(Transaction.date), Transaction.category_id, Transaction.type)
+    return (
+        select(*group_by, money_sum(Transaction.amount), func.count())
+        .where(*conditions, Transaction.currency == currency)
+        .group_by(*group_by)
+    )
+
+
+def analytics_totals(
+    db: Session,
+    user_id: int,
+    currency: str,
+    start_date: dt.date | None = None,
+    end_date: dt.date | None = None,
+    category_id: int | None = None,
+    transaction_type: Literal["income", "expense"] | None = None,
+) -> dict[tuple[str, int, str], tuple[Decimal, int]]:
+    # Totals per (month, category, type) in the given currency. Amounts already
+    # in that currency are summed as they are: from the monthly_summaries rollup
+    # for whole-month ranges, from the transactions otherwise. Only the other
+    # currencies' transactions are summed per day and converted at that day's rate.
+    conditions = transaction_filters(user_id, start_date, end_date, category_id, transaction_type)
+    group_by = [month_of(Transaction.date), Transaction.category_id, Transaction.type]
+    totals: dict[tuple[str, int, str], tuple[Decimal, int]] = {}
+    if _covers_whole_months(start_date, end_date):
+        foreign: set[str] = set()
+        for month, category, kind, bucket_currency, total, count in db.execute(
+            summary_query(user_id, start_date, end_date, category_id, transaction_type)
+        ):
+            if bucket_currency == currency:
+                totals[(month, category, kind)] = (total, count)
+            else:
+                foreign.add(bucket_currency)
+        if not foreign:
+            return totals
+        conditions.append(Transaction.currency.in_(foreign))
+    else:
+        for month, category, kind, total, count in db.execute(
+            partial_month_query(user_id, currency, start_date, end_date, category_id, transaction_type)
+        ):
+            totals[(month, category, kind)] = (total, count)
+        conditions.append(Transaction.currency != currency)
+
+    for key, (total, count) in converted_totals(db, load_rates(db), currency, conditions, group_by).items():
+        own_total, own_count = totals.get(key, (Decimal(0), 0))
+        totals[key] = (own_total + total, own_count + count)
+    return totals
+
+
+def build_analytics(
+    currency: str, totals: dict[tuple[str, int, str], tuple[Decimal, int]], category_names: dict[int, str]
+) -> AnalyticsResponse:
+    months: dict[str, dict[str, Decimal]] = {}
+    categories: dict[tuple[int, str], tuple[Decimal, int]] = {}
+    for (month, category_id, kind), (total, count) in totals.items():
+        month_totals = months.setdefault(month, {"income": Decimal(0), "expense": Decimal(0)})
+        month_totals[kind] += total
+        category_total, category_count = categories.get((category_id, kind), (Decimal(0), 0))
+        categories[(category_id, kind)] = (category_total + total, category_count + count)
+
+    monthly: list[MonthlyAnalytics] = []
+    total_income = total_expense = Decimal(0)
+    for month in sorted(months):
+        income, expense = months[month]["income"], months[month]["expense"]
+        total_income += income
+        total_expense += expense
+        monthly.append(
+            MonthlyAnalytics(
+                month=month,
+                income=income,
+                expense=expense,
+                balance=income - expense,
+                running_balance=total_income - total_expense,
+            )
+        )
+
+    return AnalyticsResponse(
+        currency=currency,
+        totals=AnalyticsTotals(
+            income=total_income,
+            expense=total_expense,
+            balance=total_income - total_expense,
+        ),
+        monthly=monthly,
+        categories=[
+            CategoryAnalytics(
+                category_id=category_id, name=category_names[category_id], type=kind, total=total, count=count
+            )
+            for (category_id, kind), (total, count) in sorted(categories.items(), key=lambda item: -item[1][0])
+        ],
+    )
+
+
+def compute_analytics(
+    db: Session,
+    principal: Principal,
+    start_date: dt.date | None = None,
+    end_date: dt.date | None = None,
+    category_id: int | None = None,
+    transaction_type: Literal["income", "expense"] | None = None,
+) -> AnalyticsResponse:
+    currency = principal.base_currency
+    try:
+        totals = analytics_totals(db, principal.id, currency, start_date, end_date, category_id, transaction_type)
+    except MissingRate as exc:
+        raise missing_rate(exc)
+    names = dict(db.execute(select(Category.id, Category.name).where(Category.user_id == principal.id)).all())
+    return build_analytics(currency, totals, names)
+
+
+@router.get("", response_model=AnalyticsResponse)
+def get_analytics(
+    start_date: dt.date | None = Query(default=None),
+    end_date: dt.date | None = Query(default=None),
+    category_id: int | None = Query(default=None),
+    type: Literal["income", "expense"] | None = Query(default=None),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_read_principal),
+) -> AnalyticsResponse:
+    return compute_analytics(db, current_user, start_date, end_date, category_id, type)
@@ -0,0 +1,121 @@
+import datetime as dt
+from collections.abc import AsyncIterator
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.api.analytics import compute_analytics
+from app.api.caching import cache_response, cached_response
+from app.api.deps import Principal, async_read_session_factory, get_async_read_db, get_async_read_principal
+from app.api.transactions import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    MAX_SEARCH_LENGTH,
+    STREAM_BATCH_SIZE,
+    SortOrder,
+    encode_ndjson_row,
+    fetch_limit,
+    list_query,
+    page_response,
+)
+from app.models import Budget, Category, Goal
+from app.schemas.analytics import AnalyticsResponse
+from app.schemas.budget import BudgetResponse
+from app.schemas.category import CategoryResponse
+from app.schemas.goal import GoalResponse
+from app.schemas.transaction import TransactionResponse
+
+# Async counterparts of the read-heavy endpoints, mounted ahead of the sync
+# routers when settings.async_database is enabled. Writes stay on the sync path,
+# and the sync routes already document the same interface in OpenAPI.
+router = APIRouter(include_in_schema=False)
+
+
+async def _stream_ndjson(query: Select, session_factory: async_sessionmaker[AsyncSession]) -> AsyncIterator[bytes]:
+    async with session_factory() as db:
+        result = await db.stream(query.execution_options(yield_per=STREAM_BATCH_SIZE))
+        async for row in result:
+            yield encode_ndjson_row(row)
+
+
+@router.get("/transactions", response_model=list[TransactionResponse], tags=["transactions"])
+async def list_transactions(
+    start_date: dt.date | None = Query(default=None),
+    end_date: dt.date | None = Query(default=None),
+    category_id: int | None = Query(default=None),
+    type: Literal["income", "expense"] | None = Query(default=None),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(default=None),
+    q: str | None = Query(default=None, max_length=MAX_SEARCH_LENGTH),
+    sort: SortOrder = Query(default="date"),
+    stream: bool = Query(default=False),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_async_read_principal),
+) -> Response:
+    query = list_query(current_user.id, start_date, end_date, category_id, type, cursor, q, sort)
+
+    if stream:
+        return StreamingResponse(
+            _stream_ndjson(query, async_read_session_factory(current_user.id)), media_type="application/x-ndjson"
+        )
+
+    return page_response((await db.execute(query.limit(fetch_limit(limit, sort)))).all(), limit)
+
+
+@router.get("/categories", response_model=list[CategoryResponse], tags=["categories"])
+async def list_categories(
+    request: Request,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_async_read_principal),
+) -> Response:
+    version, cached = cached_response(request, current_user.id, "categories")
+    if cached is not None:
+        return cached
+
+    categories = await db.scalars(select(Category).where(Category.user_id == current_user.id).order_by(Category.id))
+    return cache_response(request, current_user.id, "categories", version, CategoryResponse, categories)
+
+
+@router.get("/budgets", response_model=list[BudgetResponse], tags=["budgets"])
+async def list_budgets(
+    request: Request,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_async_read_principal),
+) -> Response:
+    version, cached = cached_response(request, current_user.id, "budgets")
+    if cached is not None:
+        return cached
+
+    budgets = await db.scalars(select(Budget).where(Budget.user_id == current_user.id).order_by(Budget.month.desc()))
+    return cache_response(request, current_user.id, "budgets", version, BudgetResponse, budgets)
+
+
+@router.get("/goals", response_model=list[GoalResponse], tags=["goals"])
+async def list_goals(
+    request: Request,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_async_read_principal),
+) -> Response:
+    version, cached = cached_response(request, current_user.id, "goals")
+    if cached is not None:
+        return cached
+
+    goals = await db.scalars(select(Goal).where(Goal.user_id == current_user.id).order_by(Goal.id.desc()))
+    return cache_response(request, current_user.id, "goals", version, GoalResponse, goals)
+
+
+@router.get("/analytics", response_model=AnalyticsResponse, tags=["analytics"])
+async def get_analytics(
+    start_date: dt.date | None = Query(default=None),
+    end_date: dt.date | None = Query(default=None),
+    category_id: int | None = Query(default=None),
+    type: Literal["income", "expense"] | None = Query(default=None),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_async_read_principal),
+) -> AnalyticsResponse:
+    # The rollup read decides whether transactions need converting, so the
+    # computation runs as one unit on the session's sync side.
+    return await db.run_sync(compute_analytics, current_user, start_date, end_date, category_id, type)
@@ -1,14 +1,16 @@
+import dataclasses
 from datetime import datetime, timedelta, timezone
 from secrets import token_urlsafe
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import ColumnElement, Row, select, union, update
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_user
-from app.core.security import create_access_token, hash_password, verify_password
+from app.api.deps import Principal, get_current_principal, invalidate_user
+from app.core.security import create_access_token, hash_password_async, verify_and_update_password_async
 from app.db.session import get_db
-from app.models import User
+from app.models import Budget, Goal, MonthlySummary, RecurringTransaction, User
 from app.schemas.auth import (
     ForgotPasswordRequest,
     ForgotPasswordResponse,
@@ -17,28 +19,27 @@ from app.schemas.auth import (
     UserCreate,
     UserLogin,
     UserResponse,
+    UserUpdate,
 )
+from app.services.fx import load_rates
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
-@router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register(payload: UserCreate, db: Session = Depends(get_db)) -> User:
-    existing = db.scalar(select(User).where(User.email == payload.email))
-    if existing:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
+def _find_credentials(db: Session, *conditions: ColumnElement[bool]) -> Row | None:
+    row = db.execute(select(User.id, User.hashed_password, User.token_version).where(*conditions)).first()
+    # Release the pooled connection before the slow hash runs.
+    db.close()
+    return row
 
-    if not payload.agreed_terms:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="You must agree to the terms and conditions",
-        )
 
+def _create_user(db: Session, payload: UserCreate, hashed_password: str) -> User:
     user = User(
         full_name=payload.full_name,
         email=payload.email,
-        hashed_password=hash_password(payload.password),
+        hashed_password=hashed_password,
         agreed_terms=payload.agreed_terms,
+        base_currency=payload.base_currency,
     )
     db.add(user)
     db.commit()
@@ -46,13 +47,43 @@ def register(payload: UserCreate, db: Session = Depends(get_db)) -> User:
     return user
 
 
+def _store_password_hash(db: Session, user_id: int, hashed_password: str) -> None:
+    db.execute(update(User).where(User.id == user_id).values(hashed_password=hashed_password))
+    db.commit()
+
+
+@router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
+async def register(payload: UserCreate, db: Session = Depends(get_db)) -> User:
+    existing = await run_in_threadpool(_find_credentials, db, User.email == payload.email)
+    if existing:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
+
+    if not payload.agreed_terms:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="You must agree to the terms and conditions",
+        )
+
+    hashed_password = await hash_password_async(payload.password)
+    return await run_in_threadpool(_create_user, db, payload, hashed_password)
+
+
 @router.post("/login", response_model=TokenResponse)
-def login(payload: UserLogin, db: Session = Depends(get_db)) -> TokenResponse:
-    user = db.scalar(select(User).where(User.email == payload.email))
-    if not user or not verify_password(payload.password, user.hashed_password):
+async def login(payload: UserLogin, db: Session = Depends(get_db)) -> TokenResponse:
+    credentials = await run_in_threadpool(_find_credentials, db, User.email == payload.email)
+    if not credentials:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+
+    user_id, hashed_password, token_version = credentials
+    verified, new_hash = await verify_and_update_password_async(payload.password, hashed_password)
+    if not verified:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
-    token = create_access_token(subject=str(user.id))
+    # Hashes made with older bcrypt settings are upgraded transparently.
+    if new_hash:
+        await run_in_threadpool(_store_password_hash, db, user_id, new_hash)
+
+    token = create_access_token(subject=str(user_id), token_version=token_version)
     return TokenResponse(access_token=token)
 
 
@@ -73,23 +104,70 @@ def forgot_password(payload: ForgotPasswordRequest, db: Session = Depends(get_db
     )
 
 
+def _find_reset_user(db: Session, token: str) -> Row | None:
+    row = db.execute(select(User.id, User.reset_token_expires_at).where(User.reset_token == token)).first()
+    db.close()
+    return row
+
+
+def _apply_password_reset(db: Session, user_id: int, token: str, hashed_password: str) -> bool:
+    result = db.execute(
+        update(User)
+        .where(User.id == user_id, User.reset_token == token)
+        .values(
+            hashed_password=hashed_password,
+            reset_token=None,
+            reset_token_expires_at=None,
+            token_version=User.token_version + 1,
+        )
+    )
+    db.commit()
+    invalidate_user(user_id)
+    return result.rowcount == 1
+
+
 @router.post("/reset-password")
-def reset_password(payload: ResetPasswordRequest, db: Session = Depends(get_db)) -> dict[str, str]:
-    user = db.scalar(select(User).where(User.reset_token == payload.token))
-    if not user or not user.reset_token_expires_at:
+async def reset_password(payload: ResetPasswordRequest, db: Session = Depends(get_db)) -> dict[str, str]:
+    reset = await run_in_threadpool(_find_reset_user, db, payload.token)
+    if not reset or not reset.reset_token_expires_at:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid reset token")
 
-    if user.reset_token_expires_at < datetime.now(timezone.utc):
+    if reset.reset_token_expires_at < datetime.now(timezone.utc):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Reset token expired")
 
-    user.hashed_password = hash_password(payload.new_password)
-    user.reset_token = None
-    user.reset_token_expires_at = None
-    db.commit()
+    hashed_password = await hash_password_async(payload.new_password)
+    # The token is checked again on write so a concurrent reset cannot reuse it.
+    if not await run_in_threadpool(_apply_password_reset, db, reset.id, payload.token, hashed_password):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid reset token")
 
     return {"message": "Password reset successful"}
 
 
 @router.get("/me", response_model=UserResponse)
-def me(current_user: User = Depends(get_current_user)) -> User:
+def me(current_user: Principal = Depends(get_current_principal)) -> Principal:
     return current_user
+
+
+@router.patch("/me", response_model=UserResponse)
+def update_me(
+    payload: UserUpdate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+) -> Principal:
+    # Everything already on the books has to convert into the new base currency.
+    held = union(
+        select(MonthlySummary.currency).where(MonthlySummary.user_id == current_user.id),
+        select(Budget.currency).where(Budget.user_id == current_user.id),
+        select(Goal.currency).where(Goal.user_id == current_user.id),
+        select(RecurringTransaction.currency).where(RecurringTransaction.user_id == current_user.id),
+    )
+    rates = load_rates(db)
+    if not all(rates.convertible(currency, payload.base_currency) for currency in db.scalars(held)):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown currency {payload.base_currency}"
+        )
+
+    db.execute(update(User).where(User.id == current_user.id).values(base_currency=payload.base_currency))
+    db.commit()
+    invalidate_user(current_user.id)
+    return dataclasses.replace(current_user, base_currency=payload.base_currency)
@@ -1,11 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+import calendar
+import datetime as dt
+from decimal import Decimal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import Select, and_, select
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_user
+from app.api.caching import cache_response, cached_response, response_cache
+from app.api.deps import Principal, get_current_principal, get_read_db, get_read_principal
+from app.api.fx import ensure_currency, missing_rate
+from app.db.functions import month_of
 from app.db.session import get_db
-from app.models import Budget, Category, User
-from app.schemas.budget import BudgetCreate, BudgetResponse, BudgetUpdate
+from app.models import Budget, Category, MonthlySummary, Transaction
+from app.schemas.budget import BudgetCreate, BudgetResponse, BudgetStatus, BudgetUpdate
+from app.services.fx import MissingRate, converted_totals, load_rates
+from app.services.transactions import transaction_filters
 
 router = APIRouter(prefix="/budgets", tags=["budgets"])
 
@@ -20,27 +29,157 @@ def _ensure_expense_category(db: Session, user_id: int, category_id: int) -> Non
 
 @router.get("", response_model=list[BudgetResponse])
 def list_budgets(
-    db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
-) -> list[Budget]:
-    return list(db.scalars(select(Budget).where(Budget.user_id == current_user.id).order_by(Budget.month.desc())))
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+) -> Response:
+    version, cached = cached_response(request, current_user.id, "budgets")
+    if cached is not None:
+        return cached
+
+    budgets = db.scalars(select(Budget).where(Budget.user_id == current_user.id).order_by(Budget.month.desc()))
+    return cache_response(request, current_user.id, "budgets", version, BudgetResponse, budgets)
+
+
+def _projected_spent(month: str, spent: Decimal, today: dt.date) -> Decimal:
+    year, month_number = (int(part) for part in month.split("-"))
+    if (year, month_number) != (today.year, today.month):
+        return spent
+    days_in_month = calendar.monthrange(year, month_number)[1]
+    return spent / today.day * days_in_month
+
+
+def _month_bounds(months: set[str]) -> tuple[dt.date, dt.date]:
+    year, month_number = (int(part) for part in max(months).split("-"))
+    last = dt.date(year, month_number, calendar.monthrange(year, month_number)[1])
+    return dt.date.fromisoformat(f"{min(months)}-01"), last
+
+
+def _spending(
+    db: Session, user_id: int, budgets: list[Budget], buckets: dict[int, dict[str, Decimal]]
+) -> dict[int, Decimal]:
+    # Buckets in the budget's own currency count as they are; only the
+    # transactions behind the other buckets are read back and converted at
+    # their day's rate, which takes a query per budget currency involved.
+    foreign: dict[str, set[str]] = {}
+    for budget in budgets:
+        for currency in buckets.get(budget.id, {}):
+            if currency != budget.currency:
+                foreign.setdefault(budget.currency, set()).add(currency)
+
+    converted: dict[str, dict[tuple, tuple[Decimal, int]]] = {}
+    if foreign:
+        months = {budget.month for budget in budgets}
+        category_ids = {budget.category_id for budget in budgets}
+        first_day, last_day = _month_bounds(months)
+        rates = load_rates(db)
+        for target, currencies in foreign.items():
+            conditions = transaction_filters(user_id, first_day, last_day, transaction_type="expense")
+            conditions += [Transaction.category_id.in_(category_ids), Transaction.currency.in_(currencies)]
+            group_by = [month_of(Transaction.date), Transaction.category_id]
+            converted[target] = converted_totals(db, rates, target, conditions, group_by)
+
+    spending = {}
+    for budget in budgets:
+        own = buckets.get(budget.id, {}).get(budget.currency, Decimal(0))
+        foreign_total = converted.get(budget.currency, {}).get((budget.month, budget.category_id), (Decimal(0), 0))
+        spending[budget.id] = own + foreign_total[0]
+    return spending
+
+
+def status_query(
+    user_id: int, month: str | None = None, start_month: str | None = None, end_month: str | None = None
+) -> Select:
+    conditions = [Budget.user_id == user_id]
+    if month:
+        conditions.append(Budget.month == month)
+    if start_month:
+        conditions.append(Budget.month >= start_month)
+    if end_month:
+        conditions.append(Budget.month <= end_month)
+    # Each budget comes with its month's spending from the monthly_summaries
+    # rollup, one row per currency bucket (or one with no bucket at all).
+    return (
+        select(Budget, Category.name, MonthlySummary.currency, MonthlySummary.total)
+        .join(Category, Category.id == Budget.category_id)
+        .outerjoin(
+            MonthlySummary,
+            and_(
+                MonthlySummary.user_id == Budget.user_id,
+                MonthlySummary.month == Budget.month,
+                MonthlySummary.category_id == Budget.category_id,
+                MonthlySummary.type == "expense",
+            ),
+        )
+        .where(*conditions)
+        .order_by(Budget.month.desc(), Budget.id)
+    )
+
+
+@router.get("/status", response_model=list[BudgetStatus])
+def list_budget_status(
+    month: str | None = Query(default=None, pattern=r"^\d{4}-\d{2}$"),
+    start_month: str | None = Query(default=None, pattern=r"^\d{4}-\d{2}$"),
+    end_month: str | None = Query(default=None, pattern=r"^\d{4}-\d{2}$"),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_read_principal),
+) -> list[BudgetStatus]:
+    rows: dict[int, tuple[Budget, str]] = {}
+    buckets: dict[int, dict[str, Decimal]] = {}
+    for budget, category_name, currency, total in db.execute(
+        status_query(current_user.id, month, start_month, end_month)
+    ):
+        rows.setdefault(budget.id, (budget, category_name))
+        if currency is not None:
+            buckets.setdefault(budget.id, {})[currency] = total
+    try:
+        spending = _spending(db, current_user.id, [budget for budget, _ in rows.values()], buckets)
+    except MissingRate as exc:
+        raise missing_rate(exc)
+
+    today = dt.date.today()
+    statuses = []
+    for budget, category_name in rows.values():
+        amount, spent = budget.amount, spending.get(budget.id, Decimal(0))
+        projected = _projected_spent(budget.month, spent, today)
+        statuses.append(
+            BudgetStatus(
+                id=budget.id,
+                category_id=budget.category_id,
+                month=budget.month,
+                amount=amount,
+                currency=budget.currency,
+                category_name=category_name,
+                spent=spent,
+                remaining=amount - spent,
+                percent_used=round(spent / amount * 100, 2),
+                projected_spent=round(projected, 2),
+                projected_overrun=round(max(projected - amount, Decimal(0)), 2),
+            )
+        )
+    return statuses
 
 
 @router.post("", response_model=BudgetResponse, status_code=status.HTTP_201_CREATED)
 def create_budget(
     payload: BudgetCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ) -> Budget:
     _ensure_expense_category(db, current_user.id, payload.category_id)
+    currency = payload.currency or current_user.base_currency
+    ensure_currency(db, currency, current_user.base_currency)
 
     budget = Budget(
         user_id=current_user.id,
         category_id=payload.category_id,
         amount=payload.amount,
+        currency=currency,
         month=payload.month,
     )
     db.add(budget)
     db.commit()
+    response_cache.invalidate(current_user.id, "budgets")
     db.refresh(budget)
     return budget
 
@@ -50,7 +189,7 @@ def update_budget(
     budget_id: int,
     payload: BudgetUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ) -> Budget:
     budget = db.scalar(select(Budget).where(Budget.id == budget_id, Budget.user_id == current_user.id))
     if budget is None:
@@ -59,11 +198,14 @@ def update_budget(
     updates = payload.model_dump(exclude_unset=True)
     next_category_id = updates.get("category_id", budget.category_id)
     _ensure_expense_category(db, current_user.id, next_category_id)
+    if updates.get("currency") is not None:
+        ensure_currency(db, updates["currency"], current_user.base_currency)
 
     for key, value in updates.items():
         setattr(budget, key, value)
 
     db.commit()
+    response_cache.invalidate(current_user.id, "budgets")
     db.refresh(budget)
     return budget
 
@@ -72,7 +214,7 @@ def update_budget(
 def delete_budget(
     budget_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ) -> None:
     budget = db.scalar(select(Budget).where(Budget.id == budget_id, Budget.user_id == current_user.id))
     if budget is None:
@@ -80,3 +222,4 @@ def delete_budget(
 
     db.delete(budget)
     db.commit()
+    response_cache.invalidate(current_user.id, "budgets")
@@ -0,0 +1,94 @@
+import hashlib
+import uuid
+from collections.abc import Iterable
+
+from fastapi import Request, Response, status
+from pydantic import BaseModel
+
+from app.core.cache import CacheBackend, create_cache_backend
+from app.core.config import settings
+
+
+class ResponseCache:
+    # Entries are keyed under a per-(user, resource) version token. Invalidation
+    # swaps the token, which orphans every cached query variant at once; a lost
+    # token (eviction, restart) simply yields a fresh one, never a stale hit.
+    def __init__(self, backend: CacheBackend) -> None:
+        self.backend = backend
+
+    def version(self, user_id: int, resource: str) -> str:
+        version_key = f"resp:{resource}:{user_id}:version"
+        version = self.backend.get(version_key)
+        if version is None:
+            version = uuid.uuid4().hex.encode()
+            self.backend.set(version_key, version)
+        return version.decode()
+
+    def _key(self, user_id: int, resource: str, version: str, params: str) -> str:
+        return f"resp:{resource}:{user_id}:{version}:{params}"
+
+    def get(self, user_id: int, resource: str, version: str, params: str) -> tuple[str, bytes] | None:
+        cached = self.backend.get(self._key(user_id, resource, version, params))
+        if cached is None:
+            return None
+        etag, _, body = cached.partition(b"\n")
+        return etag.decode(), body
+
+    def set(self, user_id: int, resource: str, version: str, params: str, body: bytes) -> str:
+        etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        self.backend.set(self._key(user_id, resource, version, params), etag.encode() + b"\n" + body)
+        return etag
+
+    def invalidate(self, user_id: int, *resources: str) -> None:
+        for resource in resources:
+            self.backend.set(f"resp:{resource}:{user_id}:version", uuid.uuid4().hex.encode())
+
+
+response_cache = ResponseCache(
+    create_cache_backend(
+        settings.response_cache_url,
+        settings.response_cache_size,
+        settings.response_cache_ttl_seconds,
+    )
+)
+
+
+def _query_key(request: Request) -> str:
+    return "&".join(f"{key}={value}" for key, value in sorted(request.query_params.multi_items()))
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def _respond(request: Request, etag: str, body: bytes) -> Response:
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if _etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def cached_response(request: Request, user_id: int, resource: str) -> tuple[str, Response | None]:
+    # The version is read before the handler runs its query and the body is
+    # stored under it. A write that invalidates in between then orphans the
+    # body instead of caching it under the new version.
+    version = response_cache.version(user_id, resource)
+    cached = response_cache.get(user_id, resource, version, _query_key(request))
+    return version, (_respond(request, *cached) if cached else None)
+
+
+def cache_response(
+    request: Request,
+    user_id: int,
+    resource: str,
+    version: str,
+    schema: type[BaseModel],
+    rows: Iterable[object],
+) -> Response:
+    body = b"[" + b",".join(schema.model_validate(row).model_dump_json(by_alias=True).encode() for row in rows) + b"]"
+    etag = response_cache.set(user_id, resource, version, _query_key(request), body)
+    return _respond(request, etag, body)
@@ -1,31 +1,41 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import delete, select
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_user
+from app.api.caching import cache_response, cached_response, response_cache
+from app.api.deps import Principal, get_current_principal
 from app.db.session import get_db
-from app.models import Budget, Category, Transaction, User
+from app.models import Budget, Category, CategoryRule, RecurringTransaction, Transaction
 from app.schemas.category import CategoryCreate, CategoryResponse, CategoryUpdate
+from app.services.rules import invalidate_rules
 
 router = APIRouter(prefix="/categories", tags=["categories"])
 
 
 @router.get("", response_model=list[CategoryResponse])
 def list_categories(
-    db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
-) -> list[Category]:
-    return list(db.scalars(select(Category).where(Category.user_id == current_user.id).order_by(Category.id)))
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+) -> Response:
+    version, cached = cached_response(request, current_user.id, "categories")
+    if cached is not None:
+        return cached
+
+    categories = db.scalars(select(Category).where(Category.user_id == current_user.id).order_by(Category.id))
+    return cache_response(request, current_user.id, "categories", version, CategoryResponse, categories)
 
 
 @router.post("", response_model=CategoryResponse, status_code=status.HTTP_201_CREATED)
 def create_category(
     payload: CategoryCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ) -> Category:
     category = Category(user_id=current_user.id, name=payload.name, type=payload.type)
     db.add(category)
     db.commit()
+    response_cache.invalidate(current_user.id, "categories")
     db.refresh(category)
     return category
 
@@ -35,7 +45,7 @@ def update_category(
     category_id: int,
     payload: CategoryUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ) -> Category:
     category = db.scalar(
         select(Category).where(Category.id == category_id, Category.user_id == current_user.id)
@@ -48,6 +58,8 @@ def update_category(
         setattr(category, key, value)
 
     db.commit()
+    response_cache.invalidate(current_user.id, "categories")
+    invalidate_rules(current_user.id)
     db.refresh(category)
     return category
 
@@ -56,7 +68,7 @@ def update_category(
 def delete_category(
     category_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ) -> None:
     category = db.scalar(
         select(Category).where(Category.id == category_id, Category.user_id == current_user.id)
@@ -66,11 +78,17 @@ def delete_category(
 
     in_use = db.scalar(select(Transaction.id).where(Transaction.category_id == category_id).limit(1))
     budgeted = db.scalar(select(Budget.id).where(Budget.category_id == category_id).limit(1))
-    if in_use or budgeted:
+    scheduled = db.scalar(
+        select(RecurringTransaction.id).where(RecurringTransaction.category_id == category_id).limit(1)
+    )
+    if in_use or budgeted or scheduled:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Category is in use by transactions or budgets",
+            detail="Category is in use by transactions, budgets or recurring transactions",
         )
 
+    db.execute(delete(CategoryRule).where(CategoryRule.category_id == category_id))
     db.delete(category)
     db.commit()
+    response_cache.invalidate(current_user.id, "categories")
+    invalidate_rules(current_user.id)
@@ -1,19 +1,59 @@
+from collections.abc import AsyncGenerator, Generator
+from dataclasses import dataclass
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
+from app.core.cache import TTLCache
 from app.core.config import settings
-from app.db.session import get_db
+from app.db.session import (
+    AsyncReadSessionLocal,
+    AsyncSessionLocal,
+    ReadSessionLocal,
+    RoutingSession,
+    SessionLocal,
+    get_db,
+    wrote_recently,
+)
 from app.models import User
 
 security = HTTPBearer(auto_error=False)
 
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials | None = Depends(security),
-    db: Session = Depends(get_db),
-) -> User:
+@dataclass(frozen=True, slots=True)
+class Principal:
+    id: int
+    full_name: str
+    email: str
+    agreed_terms: bool
+    token_version: int
+    base_currency: str
+
+
+# Per-process cache of the user fields needed for auth. Writes that change them
+# (password reset bumps token_version, a new base currency) call invalidate_user; other workers pick
+# the change up once the TTL expires.
+user_cache: TTLCache[int, Principal] = TTLCache(settings.user_cache_size, settings.user_cache_ttl_seconds)
+
+_principal_columns = (
+    User.id,
+    User.full_name,
+    User.email,
+    User.agreed_terms,
+    User.token_version,
+    User.base_currency,
+)
+
+
+def invalidate_user(user_id: int) -> None:
+    user_cache.invalidate(user_id)
+
+
+def _claims_from_credentials(credentials: HTTPAuthorizationCredentials | None) -> tuple[int, int]:
     if credentials is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
 
@@ -21,12 +61,100 @@ def get_current_user(
     try:
         payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
         subject = payload.get("sub")
-        user_id = int(subject)
+        return int(subject), int(payload.get("ver", 0))
     except (JWTError, TypeError, ValueError):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
-    user = db.get(User, user_id)
-    if user is None:
+
+def get_claims(credentials: HTTPAuthorizationCredentials | None = Depends(security)) -> tuple[int, int]:
+    return _claims_from_credentials(credentials)
+
+
+def _load_principal(db: Session, user_id: int) -> Principal | None:
+    principal = user_cache.get(user_id)
+    if principal is None:
+        row = db.execute(select(*_principal_columns).where(User.id == user_id)).first()
+        if row is not None:
+            principal = Principal(*row)
+            user_cache.set(user_id, principal)
+    return principal
+
+
+async def _load_principal_async(db: AsyncSession, user_id: int) -> Principal | None:
+    principal = user_cache.get(user_id)
+    if principal is None:
+        row = (await db.execute(select(*_principal_columns).where(User.id == user_id))).first()
+        if row is not None:
+            principal = Principal(*row)
+            user_cache.set(user_id, principal)
+    return principal
+
+
+def _check_principal(principal: Principal | None, token_version: int) -> Principal:
+    if principal is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    if principal.token_version != token_version:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token revoked")
+    return principal
+
+
+def get_current_principal(
+    credentials: HTTPAuthorizationCredentials | None = Depends(security),
+    db: Session = Depends(get_db),
+) -> Principal:
+    user_id, token_version = _claims_from_credentials(credentials)
+    # Lets a commit on the request's session mark the user as a recent writer.
+    db.info["user_id"] = user_id
+    return _check_principal(_load_principal(db, user_id), token_version)
+
+
+def read_session_factory(user_id: int) -> sessionmaker[Session]:
+    return SessionLocal if wrote_recently(user_id) else ReadSessionLocal
+
+
+def get_read_db(claims: tuple[int, int] = Depends(get_claims)) -> Generator[Session, None, None]:
+    # For read-heavy endpoints: a replica, unless the user has just written and
+    # the replicas may not have caught up with it yet.
+    user_id, _ = claims
+    db = read_session_factory(user_id)()
+    db.info["user_id"] = user_id
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_read_principal(
+    claims: tuple[int, int] = Depends(get_claims),
+    db: Session = Depends(get_read_db),
+) -> Principal:
+    # Resolved on the read session, so a replica-routed request never holds a
+    # primary connection. Only a user the replica has not caught up with yet
+    # (one who has just registered) is looked up on the primary.
+    user_id, token_version = claims
+    principal = _load_principal(db, user_id)
+    if principal is None and isinstance(db, RoutingSession):
+        with SessionLocal() as primary:
+            principal = _load_principal(primary, user_id)
+    return _check_principal(principal, token_version)
+
+
+def async_read_session_factory(user_id: int) -> async_sessionmaker[AsyncSession]:
+    return AsyncSessionLocal if wrote_recently(user_id) else AsyncReadSessionLocal
+
+
+async def get_async_read_db(claims: tuple[int, int] = Depends(get_claims)) -> AsyncGenerator[AsyncSession, None]:
+    async with async_read_session_factory(claims[0])() as db:
+        yield db
+
 
-    return user
+async def get_async_read_principal(
+    claims: tuple[int, int] = Depends(get_claims),
+    db: AsyncSession = Depends(get_async_read_db),
+) -> Principal:
+    user_id, token_version = claims
+    principal = await _load_principal_async(db, user_id)
+    if principal is None and isinstance(db.sync_session, RoutingSession):
+        async with AsyncSessionLocal() as primary:
+            principal = await _load_principal_async(primary, user_id)
+    return _check_principal(principal, token_version)
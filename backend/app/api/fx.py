@@ -0,0 +1,54 @@
+import datetime as dt
+from decimal import Decimal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.api.deps import Principal, get_current_principal
+from app.db.session import get_db
+from app.schemas.fx import Conversion, CurrencyList
+from app.services.fx import MissingRate, RateTable, load_rates
+
+router = APIRouter(prefix="/fx", tags=["fx"])
+
+
+def ensure_currency(db: Session, currency: str, base_currency: str) -> None:
+    # Anything stored in a currency has to be convertible into the user's base
+    # currency, or analytics could not total it.
+    if not load_rates(db).convertible(currency, base_currency):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown currency {currency}")
+
+
+def rate_table(db: Session = Depends(get_db)) -> RateTable:
+    return load_rates(db)
+
+
+def missing_rate(exc: MissingRate) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+
+@router.get("/currencies", response_model=CurrencyList)
+def list_currencies(
+    rates: RateTable = Depends(rate_table),
+    current_user: Principal = Depends(get_current_principal),
+) -> CurrencyList:
+    return CurrencyList(pivot=rates.pivot, currencies=rates.currencies)
+
+
+@router.get("/convert", response_model=Conversion)
+def convert(
+    amount: Decimal = Query(gt=0, max_digits=12, decimal_places=2),
+    currency: str = Query(pattern=r"^[A-Z]{3}$"),
+    target: str | None = Query(default=None, pattern=r"^[A-Z]{3}$"),
+    date: dt.date | None = Query(default=None),
+    rates: RateTable = Depends(rate_table),
+    current_user: Principal = Depends(get_current_principal),
+) -> Conversion:
+    target = target or current_user.base_currency
+    day = date or dt.date.today()
+    try:
+        converted = rates.convert(amount, currency, day, target)
+        rate = rates.rate(target, day) / rates.rate(currency, day)
+    except MissingRate as exc:
+        raise missing_rate(exc)
+    return Conversion(amount=amount, currency=currency, date=day, target=target, rate=rate, converted=converted)
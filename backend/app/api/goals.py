@@ -1,37 +1,82 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_user
+from app.api.caching import cache_response, cached_response, response_cache
+from app.api.deps import Principal, get_current_principal, get_read_db, get_read_principal
+from app.api.fx import ensure_currency
 from app.db.session import get_db
-from app.models import Goal, User
-from app.schemas.goal import GoalCreate, GoalResponse, GoalUpdate
+from app.models import Category, Goal, RecurringTransaction, Transaction
+from app.schemas.goal import GoalCreate, GoalForecast, GoalResponse, GoalUpdate
+from app.services import goals as goal_progress
 
 router = APIRouter(prefix="/goals", tags=["goals"])
 
 
+def _ensure_category(db: Session, user_id: int, category_id: int | None) -> None:
+    if category_id is None:
+        return
+    category = db.scalar(select(Category.id).where(Category.id == category_id, Category.user_id == user_id))
+    if category is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid category")
+
+
+def _get_goal(db: Session, user_id: int, goal_id: int) -> Goal:
+    goal = db.scalar(select(Goal).where(Goal.id == goal_id, Goal.user_id == user_id))
+    if goal is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Goal not found")
+    return goal
+
+
 @router.get("", response_model=list[GoalResponse])
 def list_goals(
-    db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
-) -> list[Goal]:
-    return list(db.scalars(select(Goal).where(Goal.user_id == current_user.id).order_by(Goal.id.desc())))
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+) -> Response:
+    version, cached = cached_response(request, current_user.id, "goals")
+    if cached is not None:
+        return cached
+
+    goals = db.scalars(select(Goal).where(Goal.user_id == current_user.id).order_by(Goal.id.desc()))
+    return cache_response(request, current_user.id, "goals", version, GoalResponse, goals)
+
+
+@router.get("/{goal_id}/forecast", response_model=GoalForecast)
+def forecast_goal(
+    goal_id: int,
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_read_principal),
+) -> GoalForecast:
+    return goal_progress.forecast(db, _get_goal(db, current_user.id, goal_id))
 
 
 @router.post("", response_model=GoalResponse, status_code=status.HTTP_201_CREATED)
 def create_goal(
     payload: GoalCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ) -> Goal:
+    _ensure_category(db, current_user.id, payload.category_id)
+    currency = payload.currency or current_user.base_currency
+    ensure_currency(db, currency, current_user.base_currency)
+
     goal = Goal(
         user_id=current_user.id,
         name=payload.name,
         target_amount=payload.target_amount,
+        currency=currency,
         current_amount=payload.current_amount,
         deadline=payload.deadline,
+        category_id=payload.category_id,
     )
     db.add(goal)
+    db.flush()
+    if goal.category_id is not None:
+        goal.current_amount = payload.current_amount + goal_progress.linked_total(db, goal)
     db.commit()
+    response_cache.invalidate(current_user.id, "goals")
     db.refresh(goal)
     return goal
 
@@ -41,17 +86,29 @@ def update_goal(
     goal_id: int,
     payload: GoalUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ) -> Goal:
-    goal = db.scalar(select(Goal).where(Goal.id == goal_id, Goal.user_id == current_user.id))
-    if goal is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Goal not found")
+    goal = _get_goal(db, current_user.id, goal_id)
 
     updates = payload.model_dump(exclude_unset=True)
+    if updates.get("currency") is not None:
+        ensure_currency(db, updates["currency"], current_user.base_currency)
+    relinked = any(key in updates and updates[key] != getattr(goal, key) for key in ("category_id", "currency"))
+    if relinked:
+        if "category_id" in updates:
+            _ensure_category(db, current_user.id, updates["category_id"])
+        previous_total = goal_progress.linked_total(db, goal)
+
     for key, value in updates.items():
         setattr(goal, key, value)
 
+    # Moving the category link or the currency are the only changes that need
+    # a rescan: swap the old link's contributions for the new one's.
+    if relinked:
+        goal.current_amount = goal.current_amount - previous_total + goal_progress.linked_total(db, goal)
+
     db.commit()
+    response_cache.invalidate(current_user.id, "goals")
     db.refresh(goal)
     return goal
 
@@ -60,11 +117,22 @@ def update_goal(
 def delete_goal(
     goal_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ) -> None:
-    goal = db.scalar(select(Goal).where(Goal.id == goal_id, Goal.user_id == current_user.id))
-    if goal is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Goal not found")
+    goal = _get_goal(db, current_user.id, goal_id)
 
+    db.execute(
+        update(Transaction)
+        .where(Transaction.user_id == current_user.id, Transaction.goal_id == goal.id)
+        .values(goal_id=None)
+        .execution_options(synchronize_session=False)
+    )
+    db.execute(
+        update(RecurringTransaction)
+        .where(RecurringTransaction.user_id == current_user.id, RecurringTransaction.goal_id == goal.id)
+        .values(goal_id=None)
+        .execution_options(synchronize_session=False)
+    )
     db.delete(goal)
     db.commit()
+    response_cache.invalidate(current_user.id, "goals")
@@ -1,8 +1,15 @@
 from fastapi import APIRouter
 
+from app.api.deps import user_cache
+
 router = APIRouter(tags=["health"])
 
 
 @router.get("/health")
 def health_check() -> dict[str, str]:
     return {"status": "ok"}
+
+
+@router.get("/health/auth-cache")
+def auth_cache_stats() -> dict[str, int | float]:
+    return user_cache.stats()
@@ -0,0 +1,65 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.api.deps import Principal, get_read_db, get_read_principal
+from app.api.fx import missing_rate
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models import MonthlySummary, Transaction
+from app.schemas.insights import InsightsResponse
+from app.services.fx import MissingRate, load_rates
+from app.services.insights import compute_insights, load_ledger
+
+router = APIRouter(prefix="/insights", tags=["insights"])
+
+MAX_HORIZON = 24
+
+insights_cache: TTLCache[tuple[int, int, str], tuple[int, InsightsResponse]] = TTLCache(
+    settings.insights_cache_size, settings.insights_cache_ttl_seconds
+)
+
+
+def _watermark(db: Session, user_id: int, currency: str) -> int:
+    # Every insert, delete and amount/category/month/currency change moves a
+    # rollup bucket. Edits that leave the buckets as they were (a date within
+    # the month, a description) still move the user's latest updated_at, and a
+    # delete always lowers a bucket's count. Buckets in other currencies also
+    # depend on the loaded rates.
+    buckets = db.execute(
+        select(
+            MonthlySummary.month,
+            MonthlySummary.category_id,
+            MonthlySummary.type,
+            MonthlySummary.currency,
+            MonthlySummary.total,
+            MonthlySummary.count,
+        )
+        .where(MonthlySummary.user_id == user_id)
+        .order_by(MonthlySummary.month, MonthlySummary.category_id, MonthlySummary.type, MonthlySummary.currency)
+    ).all()
+    last_write = db.scalar(select(func.max(Transaction.updated_at)).where(Transaction.user_id == user_id))
+    converted = any(bucket.currency != currency for bucket in buckets)
+    rates_version = load_rates(db).version if converted else None
+    return hash((tuple(tuple(bucket) for bucket in buckets), last_write, rates_version))
+
+
+@router.get("", response_model=InsightsResponse)
+def get_insights(
+    horizon: int = Query(default=6, ge=1, le=MAX_HORIZON),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_read_principal),
+) -> InsightsResponse:
+    key = (current_user.id, horizon, current_user.base_currency)
+    watermark = _watermark(db, current_user.id, current_user.base_currency)
+    cached = insights_cache.get(key)
+    if cached is not None and cached[0] == watermark:
+        return cached[1]
+
+    try:
+        ledger = load_ledger(db, current_user.id, current_user.base_currency)
+    except MissingRate as exc:
+        raise missing_rate(exc)
+    insights = compute_insights(ledger, horizon)
+    insights_cache.set(key, (watermark, insights))
+    return insights
@@ -0,0 +1,92 @@
+from pathlib import Path
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import FileResponse
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.api.caching import response_cache
+from app.api.deps import Principal, get_current_principal
+from app.core.config import settings
+from app.db.session import get_db
+from app.models import Job
+from app.schemas.job import JobResponse
+from app.services import jobs
+from app.services.exports import MEDIA_TYPES
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+RECENT_JOBS = 50
+
+# Cached resources each job kind can change. Invalidation happens in the
+# process that serves requests once the job finishes, wherever it ran.
+JOB_RESOURCES: dict[str, tuple[str, ...]] = {
+    "import_transactions": ("goals",),
+    "apply_rules": ("goals",),
+}
+
+
+def invalidate_job_resources(user_id: int, kind: str) -> None:
+    response_cache.invalidate(user_id, *JOB_RESOURCES.get(kind, ()))
+
+
+def accepted_response(job: Job) -> Response:
+    return Response(
+        content=JobResponse.model_validate(job).model_dump_json(),
+        status_code=status.HTTP_202_ACCEPTED,
+        media_type="application/json",
+        headers={"Location": f"/api/jobs/{job.id}"},
+    )
+
+
+def _get_job(db: Session, user_id: int, job_id: int) -> Job:
+    job = db.scalar(select(Job).where(Job.id == job_id, Job.user_id == user_id))
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return job
+
+
+@router.get("", response_model=list[JobResponse])
+def list_jobs(
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+) -> list[Job]:
+    return list(
+        db.scalars(select(Job).where(Job.user_id == current_user.id).order_by(Job.id.desc()).limit(RECENT_JOBS))
+    )
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+def get_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+) -> Job:
+    return _get_job(db, current_user.id, job_id)
+
+
+@router.get("/{job_id}/download")
+def download_export(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+) -> FileResponse:
+    job = _get_job(db, current_user.id, job_id)
+    if job.kind != "export_transactions":
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job has no download")
+    if job.status != "succeeded" or job.result is None:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Export is not ready")
+
+    path = Path(settings.export_dir) / job.result["file"]
+    if not path.is_file():
+        raise HTTPException(status_code=status.HTTP_410_GONE, detail="Export file is no longer available")
+    export_format = job.result["format"]
+    return FileResponse(path, media_type=MEDIA_TYPES[export_format], filename=f"transactions-{job.id}.{export_format}")
+
+
+@router.post("/rollups", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+def rebuild_rollups(
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+) -> Response:
+    return accepted_response(jobs.enqueue(db, current_user.id, "rebuild_rollups", {}))
@@ -0,0 +1,71 @@
+import logging
+import time
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import metrics
+from app.core.config import settings
+from app.db.instrumentation import STATEMENT_LOG_LENGTH, RequestStats, current_request
+
+logger = logging.getLogger("app.db.repeated")
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def export_metrics() -> PlainTextResponse:
+    return PlainTextResponse(metrics.render_metrics(), media_type="text/plain; version=0.0.4")
+
+
+class MetricsMiddleware:
+    # Plain ASGI rather than BaseHTTPMiddleware so streamed bodies pass
+    # through untouched; latency runs until the last body chunk is sent.
+    # Routes are labelled by their path template to keep cardinality bounded.
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope)
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        token = current_request.set(stats)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            current_request.reset(token)
+            self._record(stats, status_code, elapsed)
+
+    def _record(self, stats: RequestStats, status_code: int, elapsed: float) -> None:
+        method, route = stats.method, stats.route
+        metrics.http_request_duration.observe(elapsed, method, route, str(status_code))
+        metrics.http_request_queries.observe(stats.queries, method, route)
+        metrics.http_request_db_time.observe(stats.db_seconds, method, route)
+        metrics.http_request_rows.observe(stats.rows, method, route)
+
+        # The same statement text issued over and over within one request is
+        # the signature of an N+1: a query per row instead of one per set.
+        repeated = stats.repeated_statements(settings.repeated_statement_threshold)
+        if repeated:
+            metrics.repeated_statements.inc(route)
+        for statement, count in repeated:
+            logger.warning(
+                "Possible N+1 on %s %s: statement ran %d times: %s",
+                method,
+                route,
+                count,
+                " ".join(statement.split())[:STATEMENT_LOG_LENGTH],
+            )
@@ -0,0 +1,156 @@
+import datetime as dt
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app.api.caching import response_cache
+from app.api.deps import Principal, get_current_principal
+from app.api.fx import ensure_currency
+from app.db.session import get_db
+from app.models import Category, Goal, RecurringTransaction, Transaction
+from app.schemas.recurring import (
+    RecurringTransactionCreate,
+    RecurringTransactionResponse,
+    RecurringTransactionUpdate,
+)
+from app.services.recurring import PostingReport, first_occurrence_on_or_after
+
+router = APIRouter(prefix="/recurring", tags=["recurring"])
+
+_SCHEDULE_FIELDS = {"frequency", "interval", "start_date"}
+
+
+def invalidate_posted_goals(report: PostingReport) -> None:
+    for user_id in report.goal_users:
+        response_cache.invalidate(user_id, "goals")
+
+
+def _ensure_category(db: Session, user_id: int, category_id: int, entry_type: str) -> None:
+    category = db.scalar(select(Category).where(Category.id == category_id, Category.user_id == user_id))
+    if category is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid category")
+    if category.type != entry_type:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Category type mismatch")
+
+
+def _ensure_goal(db: Session, user_id: int, goal_id: int | None) -> None:
+    if goal_id is None:
+        return
+    goal = db.scalar(select(Goal.id).where(Goal.id == goal_id, Goal.user_id == user_id))
+    if goal is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid goal")
+
+
+def _get_rule(db: Session, user_id: int, rule_id: int) -> RecurringTransaction:
+    rule = db.scalar(
+        select(RecurringTransaction).where(RecurringTransaction.id == rule_id, RecurringTransaction.user_id == user_id)
+    )
+    if rule is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Recurring transaction not found")
+    return rule
+
+
+@router.get("", response_model=list[RecurringTransactionResponse])
+def list_recurring(
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+) -> list[RecurringTransaction]:
+    return list(
+        db.scalars(
+            select(RecurringTransaction)
+            .where(RecurringTransaction.user_id == current_user.id)
+            .order_by(RecurringTransaction.id)
+        )
+    )
+
+
+@router.post("", response_model=RecurringTransactionResponse, status_code=status.HTTP_201_CREATED)
+def create_recurring(
+    payload: RecurringTransactionCreate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+) -> RecurringTransaction:
+    _ensure_category(db, current_user.id, payload.category_id, payload.entry_type)
+    _ensure_goal(db, current_user.id, payload.goal_id)
+    currency = payload.currency or current_user.base_currency
+    ensure_currency(db, currency, current_user.base_currency)
+
+    # Occurrences before today are left to the scheduler, which backfills them
+    # on its next tick.
+    rule = RecurringTransaction(
+        user_id=current_user.id,
+        category_id=payload.category_id,
+        goal_id=payload.goal_id,
+        amount=payload.amount,
+        currency=currency,
+        type=payload.entry_type,
+        description=payload.description,
+        frequency=payload.frequency,
+        interval=payload.interval,
+        start_date=payload.start_date,
+        end_date=payload.end_date,
+        next_occurrence=payload.start_date,
+    )
+    db.add(rule)
+    db.commit()
+    db.refresh(rule)
+    return rule
+
+
+@router.put("/{rule_id}", response_model=RecurringTransactionResponse)
+def update_recurring(
+    rule_id: int,
+    payload: RecurringTransactionUpdate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+) -> RecurringTransaction:
+    rule = _get_rule(db, current_user.id, rule_id)
+
+    updates = payload.model_dump(exclude_unset=True, by_alias=False)
+    next_type = updates.get("entry_type", rule.type)
+    next_category_id = updates.get("category_id", rule.category_id)
+    _ensure_category(db, current_user.id, next_category_id, next_type)
+    if "goal_id" in updates:
+        _ensure_goal(db, current_user.id, updates["goal_id"])
+    if updates.get("currency") is not None:
+        ensure_currency(db, updates["currency"], current_user.base_currency)
+
+    for key, value in updates.items():
+        setattr(rule, "type" if key == "entry_type" else key, value)
+    if rule.end_date is not None and rule.end_date < rule.start_date:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="end_date must not be before start_date")
+
+    if _SCHEDULE_FIELDS & updates.keys():
+        # Resume the new schedule after the last posting, so changing it never
+        # re-posts a period that was already booked.
+        last_posted = db.scalar(
+            select(func.max(Transaction.occurrence_date)).where(Transaction.recurring_id == rule.id)
+        )
+        resume_from = max(rule.start_date, last_posted + dt.timedelta(days=1)) if last_posted else rule.start_date
+        rule.next_occurrence = first_occurrence_on_or_after(
+            rule.start_date, rule.frequency, rule.interval, resume_from
+        )
+
+    db.commit()
+    db.refresh(rule)
+    return rule
+
+
+@router.delete("/{rule_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_recurring(
+    rule_id: int,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+) -> None:
+    rule = _get_rule(db, current_user.id, rule_id)
+
+    # Transactions already posted stay in the ledger, unlinked from the rule.
+    db.execute(
+        update(Transaction)
+        .where(Transaction.user_id == current_user.id, Transaction.recurring_id == rule.id)
+        .values(recurring_id=None)
+        .execution_options(synchronize_session=False)
+    )
+    db.delete(rule)
+    db.commit()
@@ -0,0 +1,129 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.api.caching import response_cache
+from app.api.deps import Principal, get_current_principal
+from app.api.jobs import accepted_response
+from app.db.session import get_db
+from app.models import Category, CategoryRule
+from app.schemas.job import JobResponse
+from app.schemas.rule import (
+    CategoryRuleCreate,
+    CategoryRuleResponse,
+    CategoryRuleUpdate,
+    RuleApplyRequest,
+    check_rule_fields,
+)
+from app.schemas.transaction import TransactionBatchResponse
+from app.services import jobs
+from app.services.rules import apply_rules, invalidate_rules
+from app.services.transactions import selection_filters
+
+router = APIRouter(prefix="/rules", tags=["rules"])
+
+
+def _ensure_category(db: Session, user_id: int, category_id: int) -> None:
+    category = db.scalar(select(Category.id).where(Category.id == category_id, Category.user_id == user_id))
+    if category is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid category")
+
+
+def _get_rule(db: Session, user_id: int, rule_id: int) -> CategoryRule:
+    rule = db.scalar(select(CategoryRule).where(CategoryRule.id == rule_id, CategoryRule.user_id == user_id))
+    if rule is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Rule not found")
+    return rule
+
+
+@router.get("", response_model=list[CategoryRuleResponse])
+def list_rules(
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+) -> list[CategoryRule]:
+    return list(
+        db.scalars(
+            select(CategoryRule)
+            .where(CategoryRule.user_id == current_user.id)
+            .order_by(CategoryRule.priority, CategoryRule.id)
+        )
+    )
+
+
+@router.post("", response_model=CategoryRuleResponse, status_code=status.HTTP_201_CREATED)
+def create_rule(
+    payload: CategoryRuleCreate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+) -> CategoryRule:
+    _ensure_category(db, current_user.id, payload.category_id)
+
+    rule = CategoryRule(user_id=current_user.id, **payload.model_dump())
+    db.add(rule)
+    db.commit()
+    invalidate_rules(current_user.id)
+    db.refresh(rule)
+    return rule
+
+
+@router.put("/{rule_id}", response_model=CategoryRuleResponse)
+def update_rule(
+    rule_id: int,
+    payload: CategoryRuleUpdate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+) -> CategoryRule:
+    rule = _get_rule(db, current_user.id, rule_id)
+
+    updates = payload.model_dump(exclude_unset=True)
+    if updates.get("category_id") is not None:
+        _ensure_category(db, current_user.id, updates["category_id"])
+    for key in ("category_id", "match_type", "patterns", "priority", "active"):
+        if key in updates and updates[key] is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"{key} cannot be null")
+
+    for key, value in updates.items():
+        setattr(rule, key, value)
+    try:
+        check_rule_fields(rule.match_type, rule.patterns, rule.amount_min, rule.amount_max)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+    db.commit()
+    invalidate_rules(current_user.id)
+    db.refresh(rule)
+    return rule
+
+
+@router.delete("/{rule_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_rule(
+    rule_id: int,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+) -> None:
+    db.delete(_get_rule(db, current_user.id, rule_id))
+    db.commit()
+    invalidate_rules(current_user.id)
+
+
+@router.post(
+    "/apply",
+    response_model=TransactionBatchResponse,
+    responses={status.HTTP_202_ACCEPTED: {"model": JobResponse}},
+)
+def apply_rules_to_history(
+    payload: RuleApplyRequest,
+    background: bool = Query(default=False),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+) -> TransactionBatchResponse | Response:
+    if background:
+        job = jobs.enqueue(db, current_user.id, "apply_rules", payload.model_dump(mode="json", by_alias=True))
+        return accepted_response(job)
+
+    conditions = selection_filters(current_user.id, payload.ids, payload.filter)
+    affected, goals_changed = apply_rules(db, current_user.id, conditions)
+    db.commit()
+    if goals_changed:
+        response_cache.invalidate(current_user.id, "goals")
+    return TransactionBatchResponse(affected=affected)
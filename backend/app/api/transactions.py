@@ -1,17 +1,68 @@
+import base64
+import csv
 import datetime as dt
-from typing import Literal
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Any, Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import and_, select
-from sqlalchemy.orm import Session
+import orjson
 
-from app.api.deps import get_current_user
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import ColumnElement, Float, Row, Select, and_, cast, exists, or_, select
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.datastructures import UploadFile
+
+from app.api.caching import response_cache
+from app.api.deps import Principal, get_current_principal, get_read_db, get_read_principal, read_session_factory
+from app.api.fx import ensure_currency
+from app.api.jobs import accepted_response
 from app.db.session import get_db
-from app.models import Category, Transaction, User
-from app.schemas.transaction import TransactionCreate, TransactionResponse, TransactionUpdate
+from app.models import Category, Goal, Transaction
+from app.schemas.job import JobResponse
+from app.schemas.transaction import (
+    BulkImportResponse,
+    TransactionBatchResponse,
+    TransactionBatchUpdate,
+    TransactionCreate,
+    TransactionResponse,
+    TransactionSelection,
+    TransactionUpdate,
+)
+from app.services import goals as goal_progress
+from app.services import jobs, rollups
+from app.services.exports import MEDIA_TYPES, ExportFormat, stream_export
+from app.services.imports import import_transactions, iter_csv_rows, iter_ofx_rows
+from app.services.rules import load_matcher
+from app.services.search import ranked_search, search_terms
+from app.services.transactions import batch_delete, batch_update, selection_filters, transaction_filters
 
 router = APIRouter(prefix="/transactions", tags=["transactions"])
 
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+STREAM_BATCH_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+MAX_SEARCH_LENGTH = 200
+
+SortOrder = Literal["date", "relevance"]
+
+# Reads skip ORM entities and Pydantic: these columns are selected as plain
+# tuples and encoded with orjson. Their labels and order reproduce the by-alias
+# JSON of TransactionResponse. The amount's nearest float prints back as its
+# exact two-place value, so it is cast in SQL rather than built as a Decimal.
+RESPONSE_COLUMNS = (
+    cast(Transaction.amount, Float).label("amount"),
+    Transaction.currency,
+    Transaction.category_id,
+    Transaction.type,
+    Transaction.date,
+    Transaction.description,
+    Transaction.goal_id,
+    Transaction.id,
+)
+_RESPONSE_KEYS = tuple(column.key for column in RESPONSE_COLUMNS)
+
 
 def _ensure_category(
     db: Session,
@@ -26,58 +77,355 @@ def _ensure_category(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Category type mismatch")
 
 
+def _ensure_goal(db: Session, user_id: int, goal_id: int | None) -> None:
+    if goal_id is None:
+        return
+    goal = db.scalar(select(Goal.id).where(Goal.id == goal_id, Goal.user_id == user_id))
+    if goal is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid goal")
+
+
+def encode_cursor(cursor_date: dt.date, cursor_id: int) -> str:
+    raw = f"{cursor_date.isoformat()}|{cursor_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[dt.date, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw_date, raw_id = base64.urlsafe_b64decode(padded.encode()).decode().split("|")
+        return dt.date.fromisoformat(raw_date), int(raw_id)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def parse_search(q: str | None) -> list[str] | None:
+    if q is None:
+        return None
+    terms = search_terms(q)
+    if not terms:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Search query has no words")
+    return terms
+
+
+def list_query(
+    user_id: int,
+    start_date: dt.date | None = None,
+    end_date: dt.date | None = None,
+    category_id: int | None = None,
+    transaction_type: Literal["income", "expense"] | None = None,
+    cursor: str | None = None,
+    q: str | None = None,
+    sort: SortOrder = "date",
+) -> Select:
+    terms = parse_search(q)
+
+    if sort == "relevance":
+        if not terms:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="sort=relevance requires q")
+        if cursor:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Relevance-sorted results have no cursor"
+            )
+        conditions = transaction_filters(user_id, start_date, end_date, category_id, transaction_type)
+        query = select(*RESPONSE_COLUMNS).where(and_(*conditions))
+        return ranked_search(query, terms).order_by(Transaction.id.desc())
+
+    conditions = transaction_filters(user_id, start_date, end_date, category_id, transaction_type, terms)
+    if cursor:
+        cursor_date, cursor_id = _decode_cursor(cursor)
+        conditions.append(
+            or_(
+                Transaction.date < cursor_date,
+                and_(Transaction.date == cursor_date, Transaction.id < cursor_id),
+            )
+        )
+
+    return (
+        select(*RESPONSE_COLUMNS)
+        .where(and_(*conditions))
+        .order_by(Transaction.date.desc(), Transaction.id.desc())
+    )
+
+
+def paginate(rows: Sequence[Row], limit: int) -> tuple[Sequence[Row], str | None]:
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, encode_cursor(rows[-1].date, rows[-1].id)
+    return rows, None
+
+
+def encode_rows(rows: Iterable[Row]) -> bytes:
+    return orjson.dumps([dict(zip(_RESPONSE_KEYS, row)) for row in rows])
+
+
+def encode_ndjson_row(row: Row) -> bytes:
+    return orjson.dumps(dict(zip(_RESPONSE_KEYS, row)), option=orjson.OPT_APPEND_NEWLINE)
+
+
+def fetch_limit(limit: int, sort: SortOrder) -> int:
+    # One extra row tells whether a next page exists. Relevance order has no
+    # keyset to resume from, so it returns the top matches only.
+    return limit if sort == "relevance" else limit + 1
+
+
+def page_response(rows: Sequence[Row], limit: int) -> Response:
+    rows, next_cursor = paginate(rows, limit)
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return Response(content=encode_rows(rows), media_type="application/json", headers=headers)
+
+
+def _stream_ndjson(query: Select, session_factory: sessionmaker[Session]) -> Iterator[bytes]:
+    # The request-scoped session is closed before the body is sent, so the
+    # stream owns its own session and reads through a server-side cursor.
+    with session_factory() as db:
+        for row in db.execute(query.execution_options(yield_per=STREAM_BATCH_SIZE)):
+            yield encode_ndjson_row(row)
+
+
 @router.get("", response_model=list[TransactionResponse])
 def list_transactions(
     start_date: dt.date | None = Query(default=None),
     end_date: dt.date | None = Query(default=None),
     category_id: int | None = Query(default=None),
     type: Literal["income", "expense"] | None = Query(default=None),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-) -> list[Transaction]:
-    conditions = [Transaction.user_id == current_user.id]
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(default=None),
+    q: str | None = Query(default=None, max_length=MAX_SEARCH_LENGTH),
+    sort: SortOrder = Query(default="date"),
+    stream: bool = Query(default=False),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_read_principal),
+) -> Response:
+    query = list_query(current_user.id, start_date, end_date, category_id, type, cursor, q, sort)
+
+    if stream:
+        return StreamingResponse(
+            _stream_ndjson(query, read_session_factory(current_user.id)), media_type="application/x-ndjson"
+        )
 
-    if start_date:
-        conditions.append(Transaction.date >= start_date)
-    if end_date:
-        conditions.append(Transaction.date <= end_date)
-    if category_id:
-        conditions.append(Transaction.category_id == category_id)
-    if type:
-        conditions.append(Transaction.type == type)
+    return page_response(db.execute(query.limit(fetch_limit(limit, sort))).all(), limit)
 
-    query = select(Transaction).where(and_(*conditions)).order_by(Transaction.date.desc(), Transaction.id.desc())
-    return list(db.scalars(query))
+
+def _stream_export(
+    export_format: str, conditions: list[ColumnElement[bool]], session_factory: sessionmaker[Session]
+) -> Iterator[bytes]:
+    with session_factory() as db:
+        yield from stream_export(db, export_format, conditions)
+
+
+@router.get("/export", responses={status.HTTP_202_ACCEPTED: {"model": JobResponse}})
+def export_transactions(
+    format: ExportFormat = Query(default="csv"),
+    start_date: dt.date | None = Query(default=None),
+    end_date: dt.date | None = Query(default=None),
+    category_id: int | None = Query(default=None),
+    type: Literal["income", "expense"] | None = Query(default=None),
+    q: str | None = Query(default=None, max_length=MAX_SEARCH_LENGTH),
+    background: bool = Query(default=False),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_read_principal),
+) -> Response:
+    if background:
+        filters = {
+            "start_date": start_date.isoformat() if start_date else None,
+            "end_date": end_date.isoformat() if end_date else None,
+            "category_id": category_id,
+            "type": type,
+            "q": q,
+        }
+        job = jobs.enqueue(db, current_user.id, "export_transactions", {"format": format, "filters": filters})
+        return accepted_response(job)
+
+    conditions = transaction_filters(current_user.id, start_date, end_date, category_id, type, parse_search(q))
+    return StreamingResponse(
+        _stream_export(format, conditions, read_session_factory(current_user.id)),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="transactions.{format}"'},
+    )
 
 
 @router.post("", response_model=TransactionResponse, status_code=status.HTTP_201_CREATED)
 def create_transaction(
     payload: TransactionCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ) -> Transaction:
-    _ensure_category(db, current_user.id, payload.category_id, payload.entry_type)
+    category_id = payload.category_id
+    if category_id is None:
+        category_id = load_matcher(db, current_user.id).match(payload.description, payload.amount, payload.entry_type)
+        if category_id is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No category given and no rule matched")
+    _ensure_category(db, current_user.id, category_id, payload.entry_type)
+    _ensure_goal(db, current_user.id, payload.goal_id)
+    currency = payload.currency or current_user.base_currency
+    ensure_currency(db, currency, current_user.base_currency)
 
     transaction = Transaction(
         user_id=current_user.id,
         amount=payload.amount,
-        category_id=payload.category_id,
+        currency=currency,
+        category_id=category_id,
         type=payload.entry_type,
         date=payload.entry_date,
         description=payload.description,
+        goal_id=payload.goal_id,
     )
     db.add(transaction)
+    rollups.credit(db, rollups.bucket_of(transaction), transaction.amount)
+    goals_changed = goal_progress.contribute(
+        db, current_user.id, transaction.category_id, transaction.goal_id, transaction.currency, transaction.amount
+    )
     db.commit()
+    if goals_changed:
+        response_cache.invalidate(current_user.id, "goals")
     db.refresh(transaction)
     return transaction
 
 
+@router.post(
+    "/bulk",
+    response_model=BulkImportResponse,
+    responses={status.HTTP_202_ACCEPTED: {"model": JobResponse}},
+)
+async def bulk_import_transactions(
+    request: Request,
+    atomic: bool = Query(default=False),
+    background: bool = Query(default=False),
+    income_category_id: int | None = Query(default=None),
+    expense_category_id: int | None = Query(default=None),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+) -> BulkImportResponse | Response:
+    content_type = request.headers.get("content-type", "")
+
+    if content_type.startswith("multipart/form-data"):
+        form = await request.form()
+        upload = form.get("file")
+        if not isinstance(upload, UploadFile):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Missing file upload")
+        filename = (upload.filename or "").lower()
+        if filename.endswith((".ofx", ".qfx")):
+            file_format, parse = "ofx", iter_ofx_rows
+        elif filename.endswith(".csv"):
+            file_format, parse = "csv", iter_csv_rows
+        else:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Unsupported file format")
+        content = (await upload.read()).decode("utf-8-sig", errors="replace") if background else None
+        rows = None if background else parse(upload.file)
+    else:
+        rows = content = await request.json()
+        file_format = "json"
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Expected a JSON array of transactions")
+
+    default_category_ids = {
+        kind: category
+        for kind, category in (("income", income_category_id), ("expense", expense_category_id))
+        if category is not None
+    }
+    if background:
+        job = await run_in_threadpool(
+            jobs.enqueue,
+            db,
+            current_user.id,
+            "import_transactions",
+            {
+                "format": file_format,
+                "content": content,
+                "atomic": atomic,
+                "default_category_ids": default_category_ids,
+            },
+        )
+        return accepted_response(job)
+
+    try:
+        report = await run_in_threadpool(
+            import_transactions, db, current_user.id, rows, atomic, default_category_ids
+        )
+    except csv.Error as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Malformed CSV file: {exc}")
+    if atomic and report.errors:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=report.model_dump())
+    if report.inserted:
+        response_cache.invalidate(current_user.id, "goals")
+    return report
+
+
+def _ensure_batch_types(
+    db: Session, user_id: int, conditions: list[ColumnElement[bool]], changes: dict[str, Any]
+) -> None:
+    # Validated once for the whole selection: the target category must exist
+    # and agree with the type each selected row ends up with.
+    if "category_id" in changes:
+        category = db.scalar(
+            select(Category).where(Category.id == changes["category_id"], Category.user_id == user_id)
+        )
+        if category is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid category")
+        if "type" in changes:
+            mismatch = category.type != changes["type"]
+        else:
+            mismatch = db.scalar(select(exists().where(*conditions, Transaction.type != category.type)))
+    elif "type" in changes:
+        mismatch = db.scalar(
+            select(
+                exists().where(
+                    *conditions, Category.id == Transaction.category_id, Category.type != changes["type"]
+                )
+            )
+        )
+    else:
+        return
+    if mismatch:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Category type mismatch")
+
+
+@router.patch("/batch", response_model=TransactionBatchResponse)
+def batch_update_transactions(
+    payload: TransactionBatchUpdate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+) -> TransactionBatchResponse:
+    conditions = selection_filters(current_user.id, payload.ids, payload.filter)
+    changes = {
+        "type" if key == "entry_type" else "date" if key == "entry_date" else key: value
+        for key, value in payload.changes.model_dump(exclude_unset=True, by_alias=False).items()
+    }
+    _ensure_batch_types(db, current_user.id, conditions, changes)
+    if "goal_id" in changes:
+        _ensure_goal(db, current_user.id, changes["goal_id"])
+    if "currency" in changes:
+        ensure_currency(db, changes["currency"], current_user.base_currency)
+
+    affected, goals_changed = batch_update(db, current_user.id, conditions, changes)
+    db.commit()
+    if goals_changed:
+        response_cache.invalidate(current_user.id, "goals")
+    return TransactionBatchResponse(affected=affected)
+
+
+@router.delete("/batch", response_model=TransactionBatchResponse)
+def batch_delete_transactions(
+    payload: TransactionSelection,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+) -> TransactionBatchResponse:
+    affected, goals_changed = batch_delete(
+        db, current_user.id, selection_filters(current_user.id, payload.ids, payload.filter)
+    )
+    db.commit()
+    if goals_changed:
+        response_cache.invalidate(current_user.id, "goals")
+    return TransactionBatchResponse(affected=affected)
+
+
 @router.put("/{transaction_id}", response_model=TransactionResponse)
 def update_transaction(
     transaction_id: int,
     payload: TransactionUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ) -> Transaction:
     transaction = db.scalar(
         select(Transaction).where(Transaction.id == transaction_id, Transaction.user_id == current_user.id)
@@ -89,12 +437,34 @@ def update_transaction(
     next_type = updates.get("entry_type", transaction.type)
     next_category_id = updates.get("category_id", transaction.category_id)
     _ensure_category(db, current_user.id, next_category_id, next_type)
+    if "goal_id" in updates:
+        _ensure_goal(db, current_user.id, updates["goal_id"])
+    if updates.get("currency") is not None:
+        ensure_currency(db, updates["currency"], current_user.base_currency)
 
+    previous_bucket, previous_amount = rollups.bucket_of(transaction), transaction.amount
+    previous_link = (transaction.category_id, transaction.goal_id, transaction.currency)
     for key, value in updates.items():
         mapped_key = "type" if key == "entry_type" else "date" if key == "entry_date" else key
         setattr(transaction, mapped_key, value)
 
+    rollups.debit(db, previous_bucket, previous_amount)
+    rollups.credit(db, rollups.bucket_of(transaction), transaction.amount)
+    goals_changed = goal_progress.contribute(db, current_user.id, *previous_link, -previous_amount)
+    goals_changed = (
+        goal_progress.contribute(
+            db,
+            current_user.id,
+            transaction.category_id,
+            transaction.goal_id,
+            transaction.currency,
+            transaction.amount,
+        )
+        or goals_changed
+    )
     db.commit()
+    if goals_changed:
+        response_cache.invalidate(current_user.id, "goals")
     db.refresh(transaction)
     return transaction
 
@@ -103,7 +473,7 @@ def update_transaction(
 def delete_transaction(
     transaction_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ) -> None:
     transaction = db.scalar(
         select(Transaction).where(Transaction.id == transaction_id, Transaction.user_id == current_user.id)
@@ -111,5 +481,16 @@ def delete_transaction(
     if transaction is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Transaction not found")
 
+    rollups.debit(db, rollups.bucket_of(transaction), transaction.amount)
+    goals_changed = goal_progress.contribute(
+        db,
+        current_user.id,
+        transaction.category_id,
+        transaction.goal_id,
+        transaction.currency,
+        -transaction.amount,
+    )
     db.delete(transaction)
     db.commit()
+    if goals_changed:
+        response_cache.invalidate(current_user.id, "goals")
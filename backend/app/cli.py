@@ -0,0 +1,248 @@
+import argparse
+import asyncio
+import datetime as dt
+import sys
+from pathlib import Path
+
+from sqlalchemy import Select, select
+from sqlalchemy.orm import Session
+
+from app.api.analytics import partial_month_query, summary_query
+from app.api.budgets import status_query
+from app.api.jobs import invalidate_job_resources
+from app.api.recurring import invalidate_posted_goals
+from app.api.transactions import DEFAULT_PAGE_SIZE, encode_cursor, list_query
+from app.core.config import settings
+from app.db.explain import explain, scanned_relations, uses_index
+from app.db.session import SessionLocal
+from app.models import Budget, Category, Goal, Transaction
+from app.services.exports import export_query
+from app.services.fx import import_rates, read_rates
+from app.services.jobs import JobRunner
+from app.services.partitions import (
+    COPY_BATCH_SIZE,
+    INTERVALS,
+    PARTITION_PREFIX,
+    RETIRED_TABLE,
+    archive_partitions,
+    create_partitions,
+    is_partitioned,
+    list_partitions,
+    partition_transactions,
+)
+from app.services.recurring import run_tick
+from app.services.rollups import rebuild_monthly_summaries, verify_monthly_summaries
+from app.services.transactions import transaction_filters
+
+
+def _rebuild_rollups(args: argparse.Namespace) -> int:
+    with SessionLocal() as db:
+        if not args.verify_only:
+            rows = rebuild_monthly_summaries(db, args.user_id)
+            db.commit()
+            print(f"Rebuilt {rows} monthly summary rows")
+
+        mismatches = verify_monthly_summaries(db, args.user_id)
+
+    for user_id, month, category_id, transaction_type, currency in mismatches:
+        print(
+            f"Mismatch: user={user_id} month={month} category={category_id} type={transaction_type} "
+            f"currency={currency}"
+        )
+    print("Rollups verified" if not mismatches else f"{len(mismatches)} rollup buckets out of sync")
+    return 1 if mismatches else 0
+
+
+def _import_fx_rates(args: argparse.Namespace) -> int:
+    with SessionLocal() as db, open(args.path, encoding="utf-8-sig", newline="") as stream:
+        try:
+            imported = import_rates(db, read_rates(stream))
+        except ValueError as exc:
+            print(f"{args.path}: {exc}", file=sys.stderr)
+            return 1
+    print(f"Imported {imported} FX rates")
+    return 0
+
+
+def endpoint_queries(user_id: int = 1) -> dict[str, Select]:
+    # Built by the endpoints' own query builders, so a plan checked here is the
+    # plan the endpoint runs. Pages fetch one row more than they return.
+    page = DEFAULT_PAGE_SIZE + 1
+    year_start, year_end = dt.date(2024, 1, 1), dt.date(2024, 12, 31)
+    return {
+        "list_transactions": list_query(user_id).limit(page),
+        "list_transactions (date range)": list_query(user_id, year_start).limit(page),
+        "list_transactions (cursor)": list_query(user_id, cursor=encode_cursor(year_start, 1000)).limit(page),
+        "list_transactions (category)": list_query(user_id, year_start, category_id=1).limit(page),
+        "list_categories": select(Category).where(Category.user_id == user_id).order_by(Category.id),
+        "list_budgets": select(Budget).where(Budget.user_id == user_id).order_by(Budget.month.desc()),
+        "list_goals": select(Goal).where(Goal.user_id == user_id).order_by(Goal.id.desc()),
+        "analytics (whole months)": summary_query(user_id, year_start, year_end),
+        "analytics (partial months)": partial_month_query(user_id, "USD", dt.date(2024, 1, 5), dt.date(2024, 2, 10)),
+        "budget_status": status_query(user_id, start_month="2024-01", end_month="2024-12"),
+        "delete_category (transaction probe)": select(Transaction.id).where(Transaction.category_id == 1).limit(1),
+        "delete_category (budget probe)": select(Budget.id).where(Budget.category_id == 1).limit(1),
+    }
+
+
+def pruning_queries(start: dt.date, end: dt.date, user_id: int = 1) -> dict[str, Select]:
+    return {
+        "list_transactions": list_query(user_id, start, end).limit(DEFAULT_PAGE_SIZE + 1),
+        "export_transactions": export_query(transaction_filters(user_id, start, end), "csv"),
+        "analytics (partial months)": partial_month_query(user_id, "USD", start, end),
+    }
+
+
+def _explain_pruning(db: Session, verbose: bool) -> int:
+    # A date range inside the current partition has to leave only that
+    # partition in the plan, the default one included.
+    partitions, default = list_partitions(db)
+    if not partitions:
+        return 0
+    today = dt.date.today()
+    target = next((partition for partition in partitions if partition.start <= today < partition.end), partitions[-1])
+    start, end = target.start, target.end - dt.timedelta(days=1)
+    total = len(partitions) + (default is not None)
+
+    unpruned = 0
+    for name, query in pruning_queries(start, end).items():
+        plan = explain(db, query)
+        scanned = {relation for relation in scanned_relations(plan) if relation.startswith(PARTITION_PREFIX)}
+        pruned = scanned <= {target.name}
+        unpruned += not pruned
+        print(f"{'ok  ' if pruned else 'ALL '} {name} ({start} to {end}): {len(scanned)} of {total} partitions")
+        if verbose or not pruned:
+            for line in plan:
+                print(f"       {line}")
+    return unpruned
+
+
+def _explain_queries(args: argparse.Namespace) -> int:
+    missing = 0
+    with SessionLocal() as db:
+        for name, query in endpoint_queries().items():
+            plan = explain(db, query)
+            indexed = uses_index(plan)
+            missing += not indexed
+            print(f"{'ok  ' if indexed else 'SCAN'} {name}")
+            if args.verbose or not indexed:
+                for line in plan:
+                    print(f"       {line}")
+        if is_partitioned(db):
+            missing += _explain_pruning(db, args.verbose)
+        db.rollback()
+
+    return 1 if missing else 0
+
+
+def _partition_transactions(args: argparse.Namespace) -> int:
+    with SessionLocal() as db:
+        try:
+            copied = partition_transactions(
+                db,
+                args.interval,
+                args.ahead,
+                since=args.since,
+                batch_size=args.batch_size,
+                on_progress=lambda rows: print(f"Copied {rows} rows", flush=True),
+            )
+        except ValueError as exc:
+            print(exc, file=sys.stderr)
+            return 1
+    print(f"Partitioned transactions by {args.interval} ({copied} rows copied); the old table is {RETIRED_TABLE}")
+    return 0
+
+
+def _maintain_partitions(args: argparse.Namespace) -> int:
+    with SessionLocal() as db:
+        if not is_partitioned(db):
+            print("transactions is not partitioned; run partition-transactions first", file=sys.stderr)
+            return 1
+        created = create_partitions(db, args.ahead, settings.transaction_partition_interval)
+        archived = archive_partitions(db, args.archive_before, Path(args.archive_dir)) if args.archive_before else []
+
+    for name in created:
+        print(f"Created {name}")
+    for name, path, rows in archived:
+        print(f"Archived {name} ({rows} rows) to {path}")
+    return 0
+
+
+def _post_recurring(args: argparse.Namespace) -> int:
+    report = run_tick(args.through)
+    invalidate_posted_goals(report)
+    print(f"Posted {report.posted} recurring transactions")
+    return 0
+
+
+async def _serve_jobs(runner: JobRunner) -> None:
+    runner.start(on_finished=invalidate_job_resources)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.stop()
+
+
+def _run_jobs(args: argparse.Namespace) -> int:
+    print(f"Running jobs with {args.workers} {args.mode} workers")
+    try:
+        asyncio.run(_serve_jobs(JobRunner(args.workers, args.mode, settings.job_poll_interval_seconds)))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rebuild = commands.add_parser("rebuild-rollups", help="Recompute monthly_summaries from transactions")
+    rebuild.add_argument("--user-id", type=int, default=None)
+    rebuild.add_argument("--verify-only", action="store_true")
+    rebuild.set_defaults(handler=_rebuild_rollups)
+
+    plans = commands.add_parser("explain-queries", help="Check that endpoint queries are served by an index")
+    plans.add_argument("--verbose", action="store_true")
+    plans.set_defaults(handler=_explain_queries)
+
+    recurring = commands.add_parser(
+        "post-recurring", help="Post due recurring transactions, backfilling any missed since the last run"
+    )
+    recurring.add_argument("--through", type=dt.date.fromisoformat, default=None)
+    recurring.set_defaults(handler=_post_recurring)
+
+    fx_rates = commands.add_parser(
+        "import-fx-rates",
+        help="Load daily FX rates from a CSV file (date,currency,rate rows, or the ECB history layout)",
+    )
+    fx_rates.add_argument("path")
+    fx_rates.set_defaults(handler=_import_fx_rates)
+
+    partition = commands.add_parser(
+        "partition-transactions", help="Convert transactions to a table partitioned by date, online (PostgreSQL)"
+    )
+    partition.add_argument("--interval", choices=INTERVALS, default=settings.transaction_partition_interval)
+    partition.add_argument("--ahead", type=int, default=settings.transaction_partitions_ahead)
+    partition.add_argument("--since", type=dt.date.fromisoformat, default=None)
+    partition.add_argument("--batch-size", type=int, default=COPY_BATCH_SIZE)
+    partition.set_defaults(handler=_partition_transactions)
+
+    maintain = commands.add_parser(
+        "maintain-partitions", help="Create upcoming transaction partitions and archive old ones (PostgreSQL)"
+    )
+    maintain.add_argument("--ahead", type=int, default=settings.transaction_partitions_ahead)
+    maintain.add_argument("--archive-before", type=dt.date.fromisoformat, default=None)
+    maintain.add_argument("--archive-dir", default=settings.partition_archive_dir)
+    maintain.set_defaults(handler=_maintain_partitions)
+
+    worker = commands.add_parser("run-jobs", help="Process queued background jobs outside the web server")
+    worker.add_argument("--workers", type=int, default=max(settings.job_workers, 1))
+    worker.add_argument("--mode", choices=["thread", "process"], default="process")
+    worker.set_defaults(handler=_run_jobs)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,16 +8,54 @@ class Settings(BaseSettings):
     app_name: str = "Personal Finance Tracker API"
     env: str = "development"
     database_url: str
+    database_replica_urls: list[str] = Field(default_factory=list)
+    replica_read_your_writes_seconds: int = 5
+    replica_retry_seconds: int = 30
+    async_database: bool = False
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout: int = 30
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    metrics_enabled: bool = True
+    slow_query_threshold_ms: float = 200.0
+    repeated_statement_threshold: int = 10
     secret_key: str
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 60
+    user_cache_size: int = 10000
+    user_cache_ttl_seconds: int = 60
+    response_cache_url: str | None = None
+    response_cache_size: int = 5000
+    response_cache_ttl_seconds: int = 300
+    insights_cache_size: int = 1000
+    insights_cache_ttl_seconds: int = 3600
+    rule_matcher_cache_size: int = 1000
+    rule_matcher_cache_ttl_seconds: int = 3600
+    job_workers: int = 2
+    job_mode: str = "thread"
+    job_max_attempts: int = 3
+    job_retry_backoff_seconds: float = 5.0
+    job_poll_interval_seconds: float = 2.0
+    job_stale_seconds: int = 900
+    recurring_interval_seconds: int = 3600
+    fx_pivot_currency: str = "EUR"
+    fx_rates_ttl_seconds: int = 300
+    fx_rate_cache_size: int = 65536
+    export_dir: str = "exports"
+    transaction_partition_interval: str = "month"
+    transaction_partitions_ahead: int = 3
+    partition_archive_dir: str = "archive"
+    bcrypt_rounds: int = 12
+    password_hash_workers: int = 2
+    password_hash_queue_limit: int = 32
     cors_origins: list[str] = Field(default_factory=lambda: ["http://localhost:5173"])
 
     model_config = SettingsConfigDict(env_file=".env", case_sensitive=False)
 
-    @field_validator("cors_origins", mode="before")
+    @field_validator("cors_origins", "database_replica_urls", mode="before")
     @classmethod
-    def parse_cors_origins(cls, value: str | list[str]) -> list[str]:
+    def parse_comma_list(cls, value: str | list[str]) -> list[str]:
         if isinstance(value, str):
             return [item.strip() for item in value.split(",") if item.strip()]
         return value
@@ -0,0 +1,33 @@
+import re
+
+from sqlalchemy import Executable, text
+from sqlalchemy.orm import Session
+
+_SCANNED_RELATION = re.compile(r" on (\w+)")
+_INDEX_MARKERS = ("USING INDEX", "USING COVERING INDEX", "USING PRIMARY KEY", "Index Scan", "Index Only Scan")
+
+
+def explain(db: Session, statement: Executable) -> list[str]:
+    dialect = db.get_bind().dialect
+    compiled = statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True})
+
+    if dialect.name == "sqlite":
+        return [row[-1] for row in db.execute(text(f"EXPLAIN QUERY PLAN {compiled}"))]
+
+    # Tiny tables make the planner prefer sequential scans; we want to know
+    # whether an index is usable for the query shape, not what today's row
+    # counts favour.
+    db.execute(text("SET LOCAL enable_seqscan = off"))
+    return [row[0] for row in db.execute(text(f"EXPLAIN {compiled}"))]
+
+
+def uses_index(plan: list[str]) -> bool:
+    return any(marker in line for line in plan for marker in _INDEX_MARKERS) and not any(
+        line.lstrip(" -|`").startswith(("SCAN ", "Seq Scan")) for line in plan
+    )
+
+
+def scanned_relations(plan: list[str]) -> set[str]:
+    # PostgreSQL names the table after "on" in every scan node, so on a
+    # partitioned table these are the partitions left after pruning.
+    return {match.group(1) for line in plan for match in _SCANNED_RELATION.finditer(line)}
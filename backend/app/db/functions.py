@@ -0,0 +1,92 @@
+from sqlalchemy import BigInteger, Integer, Numeric, String
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+
+class month_of(FunctionElement):
+    type = String()
+    name = "month_of"
+    inherit_cache = True
+
+
+@compiles(month_of)
+def _month_of_default(element, compiler, **kw) -> str:
+    return f"to_char({compiler.process(element.clauses, **kw)}, 'YYYY-MM')"
+
+
+@compiles(month_of, "sqlite")
+def _month_of_sqlite(element, compiler, **kw) -> str:
+    return f"strftime('%Y-%m', {compiler.process(element.clauses, **kw)})"
+
+
+class epoch_days(FunctionElement):
+    type = Integer()
+    name = "epoch_days"
+    inherit_cache = True
+
+
+@compiles(epoch_days)
+def _epoch_days_default(element, compiler, **kw) -> str:
+    return f"({compiler.process(element.clauses, **kw)} - DATE '1970-01-01')"
+
+
+@compiles(epoch_days, "sqlite")
+def _epoch_days_sqlite(element, compiler, **kw) -> str:
+    return f"CAST(julianday({compiler.process(element.clauses, **kw)}) - 2440587.5 AS INTEGER)"
+
+
+# SQLite stores NUMERIC amounts as REAL, so a plain sum drifts by fractions of
+# a cent over many rows. These sum whole cents there instead, which is exact;
+# PostgreSQL's numeric arithmetic already is.
+class cents(FunctionElement):
+    type = BigInteger()
+    name = "cents"
+    inherit_cache = True
+
+
+@compiles(cents)
+def _cents_default(element, compiler, **kw) -> str:
+    return f"CAST(round({compiler.process(element.clauses, **kw)} * 100) AS BIGINT)"
+
+
+class sum_cents(FunctionElement):
+    type = BigInteger()
+    name = "sum_cents"
+    inherit_cache = True
+
+
+@compiles(sum_cents)
+def _sum_cents_default(element, compiler, **kw) -> str:
+    return f"CAST(sum(round({compiler.process(element.clauses, **kw)} * 100)) AS BIGINT)"
+
+
+class money_sum(FunctionElement):
+    type = Numeric(14, 2)
+    name = "money_sum"
+    inherit_cache = True
+
+
+@compiles(money_sum)
+def _money_sum_default(element, compiler, **kw) -> str:
+    return f"sum({compiler.process(element.clauses, **kw)})"
+
+
+@compiles(money_sum, "sqlite")
+def _money_sum_sqlite(element, compiler, **kw) -> str:
+    return f"(sum(round({compiler.process(element.clauses, **kw)} * 100)) / 100.0)"
+
+
+class money_text(FunctionElement):
+    type = String()
+    name = "money_text"
+    inherit_cache = True
+
+
+@compiles(money_text)
+def _money_text_default(element, compiler, **kw) -> str:
+    return f"CAST({compiler.process(element.clauses, **kw)} AS TEXT)"
+
+
+@compiles(money_text, "sqlite")
+def _money_text_sqlite(element, compiler, **kw) -> str:
+    return f"printf('%.2f', {compiler.process(element.clauses, **kw)})"
@@ -0,0 +1,78 @@
+import logging
+import time
+from collections import Counter
+from collections.abc import MutableMapping
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import Engine, event
+
+from app.core import metrics
+from app.core.config import settings
+
+logger = logging.getLogger("app.db.slow")
+
+STATEMENT_LOG_LENGTH = 500
+
+
+@dataclass
+class RequestStats:
+    scope: MutableMapping[str, Any]
+    queries: int = 0
+    db_seconds: float = 0.0
+    rows: int = 0
+    statements: Counter[str] = field(default_factory=Counter)
+
+    @property
+    def method(self) -> str:
+        return self.scope["method"]
+
+    @property
+    def route(self) -> str:
+        # The router writes the matched route into the scope, so this is
+        # known from the first query on, before the response starts.
+        route = self.scope.get("route")
+        return route.path if route is not None else "unmatched"
+
+    def repeated_statements(self, threshold: int) -> list[tuple[str, int]]:
+        return [(statement, count) for statement, count in self.statements.items() if count >= threshold]
+
+
+# Set by the metrics middleware for the duration of a request. Sync endpoints
+# run in a worker thread with a copy of the context, and the stats object is
+# shared rather than copied, so their queries land on the right request.
+current_request: ContextVar[RequestStats | None] = ContextVar("current_request", default=None)
+
+
+def _before_cursor_execute(
+    conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+) -> None:
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(
+    conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+) -> None:
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    metrics.db_query_duration.observe(elapsed)
+
+    stats = current_request.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += elapsed
+        # SQLite reports -1 for SELECTs; PostgreSQL reports the rows fetched.
+        stats.rows += max(cursor.rowcount, 0)
+        stats.statements[statement] += 1
+
+    if elapsed * 1000 >= settings.slow_query_threshold_ms:
+        route = stats.route if stats is not None else "background"
+        metrics.slow_queries.inc(route)
+        logger.warning(
+            "Slow query (%.1f ms) on %s: %s", elapsed * 1000, route, " ".join(statement.split())[:STATEMENT_LOG_LENGTH]
+        )
+
+
+def instrument_engine(engine: Engine) -> None:
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
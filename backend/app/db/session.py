@@ -1,13 +1,174 @@
-from collections.abc import Generator
+import itertools
+import logging
+import time
+from collections.abc import AsyncGenerator, Generator, Iterator
+from typing import Any
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy import URL, Engine, create_engine, event, make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import ORMExecuteState, Session, sessionmaker
+from sqlalchemy.sql.dml import UpdateBase
 
+from app.core.cache import create_cache_backend
 from app.core.config import settings
+from app.db.instrumentation import instrument_engine
 
-engine = create_engine(settings.database_url, echo=False)
+logger = logging.getLogger(__name__)
+
+_ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+
+def _engine_options(url: URL) -> dict[str, Any]:
+    options: dict[str, Any] = {
+        "echo": False,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "pool_recycle": settings.db_pool_recycle,
+    }
+    # SQLite uses a single-connection or null pool that rejects sizing options.
+    if url.get_backend_name() != "sqlite":
+        options.update(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+        )
+    return options
+
+
+def _async_url(url: URL) -> URL:
+    backend = url.get_backend_name()
+    if backend not in _ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend!r} databases")
+    return url.set(drivername=f"{backend}+{_ASYNC_DRIVERS[backend]}")
+
+
+def _enable_wal(dbapi_connection: Any, connection_record: Any) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.close()
+
+
+def _create_engine(url: URL) -> Engine:
+    engine = create_engine(url, **_engine_options(url))
+    if url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:"):
+        # WAL lets a long read (an export streaming through its cursor) run while
+        # other sessions commit, such as the job heartbeat it writes itself.
+        event.listen(engine, "connect", _enable_wal)
+    if settings.metrics_enabled:
+        instrument_engine(engine)
+    return engine
+
+
+def _create_async_engine(url: URL) -> AsyncEngine:
+    engine = create_async_engine(_async_url(url), **_engine_options(url))
+    if settings.metrics_enabled:
+        instrument_engine(engine.sync_engine)
+    return engine
+
+
+# Replicas that failed to connect, and when to try them again.
+_replica_down_until: dict[Engine, float] = {}
+
+
+def _replica_available(replica: Engine) -> bool:
+    if _replica_down_until.get(replica, 0.0) > time.monotonic():
+        return False
+    try:
+        replica.connect().close()
+    except DBAPIError:
+        logger.warning("Replica %s is unavailable, reading from the primary", replica.url, exc_info=True)
+        _replica_down_until[replica] = time.monotonic() + settings.replica_retry_seconds
+        return False
+    _replica_down_until.pop(replica, None)
+    return True
+
+
+class RoutingSession(Session):
+    # Reads go to one replica for the whole session, picked round-robin. The
+    # primary takes flushes and INSERT/UPDATE/DELETE statements, and every
+    # statement after the first of them, so a session always reads its own writes.
+    # A replica that cannot be reached sends the session's reads to the primary.
+    def __init__(self, *args: Any, primary: Engine, replicas: Iterator[Engine], **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.primary = primary
+        self.replica: Engine | None = next(replicas)
+        self._replica_checked = False
+
+    def get_bind(self, mapper: Any = None, clause: Any = None, **kwargs: Any) -> Engine:
+        if self.replica is not None and not (self._flushing or isinstance(clause, UpdateBase)):
+            if self._replica_checked or _replica_available(self.replica):
+                self._replica_checked = True
+                return self.replica
+        self.replica = None
+        return self.primary
+
+
+database_url = make_url(settings.database_url)
+engine = _create_engine(database_url)
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
 
+async_engine = _create_async_engine(database_url) if settings.async_database else None
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+replica_urls = [make_url(url) for url in settings.database_replica_urls]
+replica_engines = [_create_engine(url) for url in replica_urls]
+ReadSessionLocal = (
+    sessionmaker(
+        class_=RoutingSession,
+        primary=engine,
+        replicas=itertools.cycle(replica_engines),
+        autocommit=False,
+        autoflush=False,
+    )
+    if replica_engines
+    else SessionLocal
+)
+AsyncReadSessionLocal = (
+    async_sessionmaker(
+        sync_session_class=RoutingSession,
+        primary=async_engine.sync_engine,
+        replicas=itertools.cycle([_create_async_engine(url).sync_engine for url in replica_urls]),
+        autoflush=False,
+        expire_on_commit=False,
+    )
+    if replica_engines and async_engine is not None
+    else AsyncSessionLocal
+)
+
+# Replicas lag the primary. For a few seconds after one of a user's sessions
+# commits a write, that user's reads stay on the primary so they see it. The
+# sessions learn whose they are from the auth dependency; the marks share the
+# response cache's backend so every worker sees them.
+recent_writers = create_cache_backend(
+    settings.response_cache_url, settings.user_cache_size, settings.replica_read_your_writes_seconds
+)
+
+
+def wrote_recently(user_id: int) -> bool:
+    return bool(replica_engines) and recent_writers.get(f"wrote:{user_id}") is not None
+
+
+def _note_flush(session: Session, flush_context: Any) -> None:
+    session.info["wrote"] = True
+
+
+def _note_statement(state: ORMExecuteState) -> None:
+    if state.is_insert or state.is_update or state.is_delete:
+        state.session.info["wrote"] = True
+
+
+def _mark_writer(session: Session) -> None:
+    user_id = session.info.get("user_id")
+    if session.info.pop("wrote", False) and user_id is not None:
+        recent_writers.set(f"wrote:{user_id}", b"1")
+
+
+if replica_engines:
+    for _factory in (SessionLocal, ReadSessionLocal):
+        event.listen(_factory, "after_flush", _note_flush)
+        event.listen(_factory, "do_orm_execute", _note_statement)
+        event.listen(_factory, "after_commit", _mark_writer)
+
 
 def get_db() -> Generator[Session, None, None]:
     db = SessionLocal()
@@ -15,3 +176,8 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,27 +1,54 @@
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
+from app.api.analytics import router as analytics_router
+from app.api.async_reads import router as async_reads_router
 from app.api.auth import router as auth_router
 from app.api.budgets import router as budgets_router
 from app.api.categories import router as categories_router
+from app.api.fx import router as fx_router
 from app.api.goals import router as goals_router
 from app.api.health import router as health_router
-from app.api.transactions import router as transactions_router
+from app.api.insights import router as insights_router
+from app.api.jobs import invalidate_job_resources, router as jobs_router
+from app.api.metrics import MetricsMiddleware, router as metrics_router
+from app.api.recurring import invalidate_posted_goals, router as recurring_router
+from app.api.rules import router as rules_router
+from app.api.transactions import NEXT_CURSOR_HEADER, router as transactions_router
 from app.core.config import settings
-from app.db.base import Base
-from app.db.session import engine
-from app import models  # noqa: F401
+from app.core.security import PasswordHasherBusy, password_hasher
+from app.db.session import async_engine
+from app.services.jobs import job_runner
+from app.services.recurring import RecurringScheduler
+
+
+recurring_scheduler = RecurringScheduler(settings.recurring_interval_seconds)
 
 
 @asynccontextmanager
 async def lifespan(_: FastAPI):
-    Base.metadata.create_all(bind=engine)
+    job_runner.start(on_finished=invalidate_job_resources)
+    recurring_scheduler.start(on_posted=invalidate_posted_goals)
     yield
+    await recurring_scheduler.stop()
+    await job_runner.stop()
+    password_hasher.shutdown()
+    if async_engine is not None:
+        await async_engine.dispose()
+
+
+async def password_hasher_busy_handler(_: Request, __: PasswordHasherBusy) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Authentication is busy, please retry shortly"},
+        headers={"Retry-After": "1"},
+    )
 
 
-def create_app() -> FastAPI:
+def create_app(async_reads: bool = settings.async_database) -> FastAPI:
     app = FastAPI(title=settings.app_name, lifespan=lifespan)
 
     app.add_middleware(
@@ -30,14 +57,34 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
     )
 
+    # Added last so it wraps everything else, CORS preflights included.
+    if settings.metrics_enabled:
+        app.add_middleware(MetricsMiddleware)
+
+    app.add_exception_handler(PasswordHasherBusy, password_hasher_busy_handler)
+
+    # Routes are matched in registration order, so the async reads shadow
+    # their sync counterparts when enabled.
+    if async_reads:
+        app.include_router(async_reads_router, prefix="/api")
+
     app.include_router(health_router, prefix="/api")
     app.include_router(auth_router, prefix="/api")
     app.include_router(categories_router, prefix="/api")
     app.include_router(transactions_router, prefix="/api")
+    app.include_router(recurring_router, prefix="/api")
+    app.include_router(rules_router, prefix="/api")
     app.include_router(budgets_router, prefix="/api")
     app.include_router(goals_router, prefix="/api")
+    app.include_router(analytics_router, prefix="/api")
+    app.include_router(insights_router, prefix="/api")
+    app.include_router(fx_router, prefix="/api")
+    app.include_router(jobs_router, prefix="/api")
+    if settings.metrics_enabled:
+        app.include_router(metrics_router, prefix="/api")
 
     return app
 
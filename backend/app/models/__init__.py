@@ -1,7 +1,25 @@
+from app.models.archived_partition import ArchivedPartition
 from app.models.budget import Budget
 from app.models.category import Category
+from app.models.category_rule import CategoryRule
+from app.models.fx_rate import FxRate
 from app.models.goal import Goal
+from app.models.job import Job
+from app.models.monthly_summary import MonthlySummary
+from app.models.recurring_transaction import RecurringTransaction
 from app.models.transaction import Transaction
 from app.models.user import User
 
-__all__ = ["User", "Category", "Transaction", "Budget", "Goal"]
+__all__ = [
+    "User",
+    "Category",
+    "Transaction",
+    "Budget",
+    "Goal",
+    "MonthlySummary",
+    "Job",
+    "RecurringTransaction",
+    "CategoryRule",
+    "FxRate",
+    "ArchivedPartition",
+]
@@ -0,0 +1,21 @@
+from datetime import date, datetime
+
+from sqlalchemy import Date, DateTime, Integer, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class ArchivedPartition(Base):
+    __tablename__ = "archived_partitions"
+
+    # Transactions dated in [start_date, end_date) were archived and dropped.
+    # Their months' monthly_summaries rows are the only totals left for them.
+    name: Mapped[str] = mapped_column(String(63), primary_key=True)
+    start_date: Mapped[date] = mapped_column(Date, nullable=False)
+    end_date: Mapped[date] = mapped_column(Date, nullable=False)
+    path: Mapped[str] = mapped_column(Text, nullable=False)
+    rows: Mapped[int] = mapped_column(Integer, nullable=False)
+    archived_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
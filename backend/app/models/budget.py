@@ -1,4 +1,6 @@
-from sqlalchemy import ForeignKey, Numeric, String
+from decimal import Decimal
+
+from sqlalchemy import ForeignKey, Index, Numeric, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -12,8 +14,13 @@ class Budget(Base):
     category_id: Mapped[int] = mapped_column(
         ForeignKey("categories.id", ondelete="RESTRICT"), nullable=False
     )
-    amount: Mapped[float] = mapped_column(Numeric(12, 2), nullable=False)
+    amount: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False)
+    currency: Mapped[str] = mapped_column(String(3), server_default="USD", nullable=False)
     month: Mapped[str] = mapped_column(String(7), nullable=False)
 
     user = relationship("User", back_populates="budgets")
     category = relationship("Category", back_populates="budgets")
+
+
+Index("ix_budgets_user_month", Budget.user_id, Budget.month)
+Index("ix_budgets_category_id", Budget.category_id)
@@ -0,0 +1,25 @@
+from decimal import Decimal
+from typing import Any
+
+from sqlalchemy import JSON, Boolean, ForeignKey, Index, Integer, Numeric, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class CategoryRule(Base):
+    __tablename__ = "category_rules"
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    category_id: Mapped[int] = mapped_column(ForeignKey("categories.id", ondelete="CASCADE"), nullable=False)
+    match_type: Mapped[str] = mapped_column(String(10), nullable=False)
+    patterns: Mapped[list[Any]] = mapped_column(JSON, default=list, nullable=False)
+    amount_min: Mapped[Decimal | None] = mapped_column(Numeric(12, 2), nullable=True)
+    amount_max: Mapped[Decimal | None] = mapped_column(Numeric(12, 2), nullable=True)
+    priority: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+
+
+Index("ix_category_rules_user_priority", CategoryRule.user_id, CategoryRule.priority, CategoryRule.id)
+Index("ix_category_rules_category_id", CategoryRule.category_id)
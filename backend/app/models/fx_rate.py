@@ -0,0 +1,16 @@
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import Date, Numeric, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class FxRate(Base):
+    __tablename__ = "fx_rates"
+
+    # Units of currency per one unit of settings.fx_pivot_currency.
+    currency: Mapped[str] = mapped_column(String(3), primary_key=True)
+    date: Mapped[date] = mapped_column(Date, primary_key=True)
+    rate: Mapped[Decimal] = mapped_column(Numeric(18, 8), nullable=False)
@@ -1,11 +1,16 @@
-from datetime import date
+from datetime import date, datetime, timezone
+from decimal import Decimal
 
-from sqlalchemy import Date, ForeignKey, Numeric, String
+from sqlalchemy import DDL, Date, DateTime, ForeignKey, Index, Numeric, String, event, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
 
 
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
 class Transaction(Base):
     __tablename__ = "transactions"
 
@@ -14,10 +19,74 @@ class Transaction(Base):
     category_id: Mapped[int] = mapped_column(
         ForeignKey("categories.id", ondelete="RESTRICT"), nullable=False
     )
-    amount: Mapped[float] = mapped_column(Numeric(12, 2), nullable=False)
+    amount: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False)
+    currency: Mapped[str] = mapped_column(String(3), server_default="USD", nullable=False)
     type: Mapped[str] = mapped_column(String(20), nullable=False)
     date: Mapped[date] = mapped_column(Date, nullable=False)
     description: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    goal_id: Mapped[int | None] = mapped_column(ForeignKey("goals.id", ondelete="SET NULL"), nullable=True)
+    recurring_id: Mapped[int | None] = mapped_column(
+        ForeignKey("recurring_transactions.id", ondelete="SET NULL"), nullable=True
+    )
+    occurrence_date: Mapped[date | None] = mapped_column(Date, nullable=True)
+    # Set in Python rather than by the database: SQLite's CURRENT_TIMESTAMP has
+    # whole-second resolution, too coarse for the insights cache watermark.
+    updated_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), default=_utcnow, onupdate=_utcnow, nullable=True
+    )
 
     user = relationship("User", back_populates="transactions")
     category = relationship("Category", back_populates="transactions")
+
+
+Index("ix_transactions_user_date_id", Transaction.user_id, Transaction.date.desc(), Transaction.id.desc())
+Index("ix_transactions_user_category_date", Transaction.user_id, Transaction.category_id, Transaction.date)
+Index("ix_transactions_category_id", Transaction.category_id)
+# Finds the rows that need FX conversion without touching the rest of the ledger.
+Index("ix_transactions_user_currency_date", Transaction.user_id, Transaction.currency, Transaction.date)
+Index("ix_transactions_goal_id", Transaction.goal_id)
+Index("ix_transactions_user_updated_at", Transaction.user_id, Transaction.updated_at)
+# One posting per rule occurrence; NULLs (hand-entered rows) never collide. A
+# posting is dated on its occurrence, and the date is part of the key so the
+# index stays valid once the table is partitioned by date (app/services/partitions.py).
+Index(
+    "ix_transactions_recurring_occurrence",
+    Transaction.recurring_id,
+    Transaction.occurrence_date,
+    Transaction.date,
+    unique=True,
+)
+
+# Description search (app/services/search.py). PostgreSQL indexes the tsvector
+# of the description for word and prefix matches, and its trigrams for fuzzy
+# ones. SQLite keeps an external-content FTS5 table in step through triggers.
+description_document = func.to_tsvector(text("'simple'::regconfig"), func.coalesce(Transaction.description, text("''")))
+
+Index("ix_transactions_description_fts", description_document, postgresql_using="gin").ddl_if(dialect="postgresql")
+Index(
+    "ix_transactions_description_trgm",
+    Transaction.description,
+    postgresql_using="gin",
+    postgresql_ops={"description": "gin_trgm_ops"},
+).ddl_if(dialect="postgresql")
+
+SQLITE_SEARCH_DDL = (
+    "CREATE VIRTUAL TABLE transactions_fts USING fts5("
+    "description, content='transactions', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    "CREATE TRIGGER transactions_fts_insert AFTER INSERT ON transactions BEGIN "
+    "INSERT INTO transactions_fts(rowid, description) VALUES (new.id, new.description); END",
+    "CREATE TRIGGER transactions_fts_delete AFTER DELETE ON transactions BEGIN "
+    "INSERT INTO transactions_fts(transactions_fts, rowid, description) VALUES ('delete', old.id, old.description); END",
+    "CREATE TRIGGER transactions_fts_update AFTER UPDATE OF description ON transactions BEGIN "
+    "INSERT INTO transactions_fts(transactions_fts, rowid, description) VALUES ('delete', old.id, old.description); "
+    "INSERT INTO transactions_fts(rowid, description) VALUES (new.id, new.description); END",
+)
+
+event.listen(
+    Transaction.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+for statement in SQLITE_SEARCH_DDL:
+    event.listen(Transaction.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
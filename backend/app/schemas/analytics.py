@@ -0,0 +1,32 @@
+from pydantic import BaseModel
+
+from app.schemas.money import Money
+
+
+class AnalyticsTotals(BaseModel):
+    income: Money
+    expense: Money
+    balance: Money
+
+
+class MonthlyAnalytics(BaseModel):
+    month: str
+    income: Money
+    expense: Money
+    balance: Money
+    running_balance: Money
+
+
+class CategoryAnalytics(BaseModel):
+    category_id: int
+    name: str
+    type: str
+    total: Money
+    count: int
+
+
+class AnalyticsResponse(BaseModel):
+    currency: str
+    totals: AnalyticsTotals
+    monthly: list[MonthlyAnalytics]
+    categories: list[CategoryAnalytics]
@@ -1,11 +1,14 @@
 from pydantic import BaseModel, EmailStr, Field
 
+from app.schemas.fx import CurrencyCode
+
 
 class UserCreate(BaseModel):
     full_name: str = Field(min_length=2, max_length=120)
     email: EmailStr
     password: str = Field(min_length=8)
     agreed_terms: bool
+    base_currency: CurrencyCode = "USD"
 
 
 class UserLogin(BaseModel):
@@ -32,10 +35,15 @@ class UserResponse(BaseModel):
     full_name: str
     email: EmailStr
     agreed_terms: bool
+    base_currency: str
 
     model_config = {"from_attributes": True}
 
 
+class UserUpdate(BaseModel):
+    base_currency: CurrencyCode
+
+
 class TokenResponse(BaseModel):
     access_token: str
     token_type: str = "bearer"
@@ -1,19 +1,25 @@
 from pydantic import BaseModel, Field
 
+from app.schemas.fx import CurrencyCode
+from app.schemas.money import Amount, Money
+
 
 class BudgetBase(BaseModel):
     category_id: int
-    amount: float = Field(gt=0)
+    amount: Amount = Field(gt=0)
+    currency: CurrencyCode
     month: str = Field(pattern=r"^\d{4}-\d{2}$")
 
 
 class BudgetCreate(BudgetBase):
-    pass
+    # Left out, the user's base currency.
+    currency: CurrencyCode | None = None
 
 
 class BudgetUpdate(BaseModel):
     category_id: int | None = None
-    amount: float | None = Field(default=None, gt=0)
+    amount: Amount | None = Field(default=None, gt=0)
+    currency: CurrencyCode | None = None
     month: str | None = Field(default=None, pattern=r"^\d{4}-\d{2}$")
 
 
@@ -21,3 +27,12 @@ class BudgetResponse(BudgetBase):
     id: int
 
     model_config = {"from_attributes": True}
+
+
+class BudgetStatus(BudgetResponse):
+    category_name: str
+    spent: Money
+    remaining: Money
+    percent_used: float
+    projected_spent: Money
+    projected_overrun: Money
@@ -0,0 +1,22 @@
+import datetime as dt
+from typing import Annotated
+
+from pydantic import BaseModel, Field
+
+from app.schemas.money import Money
+
+CurrencyCode = Annotated[str, Field(pattern=r"^[A-Z]{3}$")]
+
+
+class CurrencyList(BaseModel):
+    pivot: str
+    currencies: list[str]
+
+
+class Conversion(BaseModel):
+    amount: Money
+    currency: str
+    date: dt.date
+    target: str
+    rate: float
+    converted: Money
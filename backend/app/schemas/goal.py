@@ -1,27 +1,56 @@
 from datetime import date
+from decimal import Decimal
 
 from pydantic import BaseModel, Field
 
+from app.schemas.fx import CurrencyCode
+from app.schemas.money import Amount, Money
+
 
 class GoalBase(BaseModel):
     name: str = Field(min_length=1, max_length=120)
-    target_amount: float = Field(gt=0)
-    current_amount: float = Field(default=0, ge=0)
+    target_amount: Amount = Field(gt=0)
+    currency: CurrencyCode
+    current_amount: Amount = Field(default=Decimal(0), ge=0)
     deadline: date | None = None
+    category_id: int | None = None
 
 
 class GoalCreate(GoalBase):
-    pass
+    # Left out, the user's base currency.
+    currency: CurrencyCode | None = None
 
 
 class GoalUpdate(BaseModel):
     name: str | None = Field(default=None, min_length=1, max_length=120)
-    target_amount: float | None = Field(default=None, gt=0)
-    current_amount: float | None = Field(default=None, ge=0)
+    target_amount: Amount | None = Field(default=None, gt=0)
+    currency: CurrencyCode | None = None
+    current_amount: Amount | None = Field(default=None, ge=0)
     deadline: date | None = None
+    category_id: int | None = None
 
 
 class GoalResponse(GoalBase):
     id: int
 
     model_config = {"from_attributes": True}
+
+
+class MonthlyContribution(BaseModel):
+    month: str
+    amount: Money
+
+
+class GoalForecast(BaseModel):
+    goal_id: int
+    currency: str
+    target_amount: Money
+    current_amount: Money
+    remaining: Money
+    monthly_rate: float
+    months_to_completion: int | None
+    projected_completion: date | None
+    deadline: date | None
+    on_track: bool | None
+    required_monthly: float | None
+    history: list[MonthlyContribution]
@@ -0,0 +1,42 @@
+import datetime as dt
+
+from pydantic import BaseModel
+
+
+class MonthlyInsight(BaseModel):
+    month: str
+    income: float
+    expense: float
+    net: float
+    rolling_net_3: float
+    rolling_net_6: float
+
+
+class CategorySeasonality(BaseModel):
+    category_id: int
+    monthly_average: float
+    factors: list[float]
+
+
+class ForecastMonth(BaseModel):
+    month: str
+    income: float
+    expense: float
+    net: float
+    cumulative_net: float
+
+
+class TransactionOutlier(BaseModel):
+    transaction_id: int
+    date: dt.date
+    amount: float
+    category_id: int
+    score: float
+
+
+class InsightsResponse(BaseModel):
+    transaction_count: int
+    months: list[MonthlyInsight]
+    seasonality: list[CategorySeasonality]
+    forecast: list[ForecastMonth]
+    outliers: list[TransactionOutlier]
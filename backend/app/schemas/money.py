@@ -0,0 +1,11 @@
+from decimal import Decimal
+from typing import Annotated
+
+from pydantic import Field, PlainSerializer
+
+# Amounts are exact Decimals in the API and plain numbers in JSON. A value with
+# two decimal places and at most 15 digits converts to a float whose shortest
+# repr is those same digits, so nothing is lost on the wire.
+Money = Annotated[Decimal, PlainSerializer(float, return_type=float, when_used="json")]
+# What a single stored amount fits: NUMERIC(12, 2).
+Amount = Annotated[Money, Field(max_digits=12, decimal_places=2)]
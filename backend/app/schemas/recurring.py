@@ -0,0 +1,68 @@
+import datetime as dt
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+from app.schemas.fx import CurrencyCode
+from app.schemas.money import Amount
+from app.schemas.transaction import TransactionKind
+
+Frequency = Literal["daily", "weekly", "monthly", "yearly"]
+
+
+class RecurringTransactionBase(BaseModel):
+    amount: Amount = Field(gt=0)
+    currency: CurrencyCode
+    category_id: int
+    entry_type: TransactionKind = Field(alias="type")
+    description: str | None = Field(default=None, max_length=255)
+    goal_id: int | None = None
+    frequency: Frequency
+    interval: int = Field(default=1, ge=1, le=366)
+    start_date: dt.date
+    end_date: dt.date | None = None
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class RecurringTransactionCreate(RecurringTransactionBase):
+    # Left out, the user's base currency.
+    currency: CurrencyCode | None = None
+
+    @model_validator(mode="after")
+    def check_dates(self) -> "RecurringTransactionCreate":
+        if self.end_date is not None and self.end_date < self.start_date:
+            raise ValueError("end_date must not be before start_date")
+        return self
+
+
+class RecurringTransactionUpdate(BaseModel):
+    amount: Amount | None = Field(default=None, gt=0)
+    currency: CurrencyCode | None = None
+    category_id: int | None = None
+    entry_type: TransactionKind | None = Field(default=None, alias="type")
+    description: str | None = Field(default=None, max_length=255)
+    goal_id: int | None = None
+    frequency: Frequency | None = None
+    interval: int | None = Field(default=None, ge=1, le=366)
+    start_date: dt.date | None = None
+    end_date: dt.date | None = None
+    active: bool | None = None
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    @model_validator(mode="after")
+    def check_changes(self) -> "RecurringTransactionUpdate":
+        changes = self.model_dump(exclude_unset=True, by_alias=True)
+        for key in ("amount", "currency", "category_id", "type", "frequency", "interval", "start_date", "active"):
+            if key in changes and changes[key] is None:
+                raise ValueError(f"{key} cannot be null")
+        return self
+
+
+class RecurringTransactionResponse(RecurringTransactionBase):
+    id: int
+    next_occurrence: dt.date
+    active: bool
+
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True)
@@ -0,0 +1,84 @@
+from decimal import Decimal
+from typing import Annotated, Any, Literal
+
+import re2
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints, model_validator
+
+from app.schemas.money import Amount
+from app.schemas.transaction import TransactionFilter
+
+MatchType = Literal["contains", "merchant", "regex"]
+RulePattern = Annotated[str, StringConstraints(strip_whitespace=True, min_length=1, max_length=200)]
+
+# Regex rules run on RE2, which matches in time linear in the description
+# whatever the pattern, so no rule can make categorization backtrack. Its
+# syntax has no backreferences or lookarounds; such patterns are refused.
+_REGEX_OPTIONS = re2.Options()
+_REGEX_OPTIONS.case_sensitive = False
+_REGEX_OPTIONS.log_errors = False
+
+
+def compile_regex(pattern: str) -> Any:
+    try:
+        return re2.compile(pattern, options=_REGEX_OPTIONS)
+    except re2.error as exc:
+        reason = exc.args[0].decode() if isinstance(exc.args[0], bytes) else str(exc.args[0])
+        raise ValueError(f"Invalid regular expression {pattern!r}: {reason}")
+
+
+def check_rule_fields(
+    match_type: str, patterns: list[str], amount_min: Decimal | None, amount_max: Decimal | None
+) -> None:
+    # A rule with nothing to match on would categorize every transaction.
+    if not patterns and amount_min is None and amount_max is None:
+        raise ValueError("A rule needs at least one pattern or an amount bound")
+    if match_type == "regex":
+        for pattern in patterns:
+            compile_regex(pattern)
+    if amount_min is not None and amount_max is not None and amount_min > amount_max:
+        raise ValueError("amount_min must not exceed amount_max")
+
+
+class CategoryRuleBase(BaseModel):
+    category_id: int
+    match_type: MatchType = "contains"
+    patterns: list[RulePattern] = Field(default_factory=list, max_length=50)
+    amount_min: Amount | None = Field(default=None, ge=0)
+    amount_max: Amount | None = Field(default=None, ge=0)
+    priority: int = 0
+    active: bool = True
+
+
+class CategoryRuleCreate(CategoryRuleBase):
+    @model_validator(mode="after")
+    def check_rule(self) -> "CategoryRuleCreate":
+        check_rule_fields(self.match_type, self.patterns, self.amount_min, self.amount_max)
+        return self
+
+
+class CategoryRuleUpdate(BaseModel):
+    category_id: int | None = None
+    match_type: MatchType | None = None
+    patterns: list[RulePattern] | None = Field(default=None, max_length=50)
+    amount_min: Amount | None = Field(default=None, ge=0)
+    amount_max: Amount | None = Field(default=None, ge=0)
+    priority: int | None = None
+    active: bool | None = None
+
+
+class CategoryRuleResponse(CategoryRuleBase):
+    id: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class RuleApplyRequest(BaseModel):
+    # Without ids or filter, rules are re-applied to the whole ledger.
+    ids: list[int] | None = Field(default=None, min_length=1)
+    filter: TransactionFilter | None = None
+
+    @model_validator(mode="after")
+    def check_selection(self) -> "RuleApplyRequest":
+        if self.ids is not None and self.filter is not None:
+            raise ValueError("Select transactions with either ids or filter")
+        return self
@@ -1,36 +1,113 @@
 import datetime as dt
+import re
 from typing import Literal
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+
+from app.schemas.fx import CurrencyCode
+from app.schemas.money import Amount
 
 TransactionKind = Literal["income", "expense"]
 
+MAX_BATCH_IDS = 5000
+
 
 class TransactionBase(BaseModel):
-    amount: float = Field(gt=0)
+    amount: Amount = Field(gt=0)
+    currency: CurrencyCode
     category_id: int
     entry_type: TransactionKind = Field(alias="type")
     entry_date: dt.date = Field(alias="date")
     description: str | None = Field(default=None, max_length=255)
+    goal_id: int | None = None
 
     model_config = ConfigDict(populate_by_name=True)
 
 
 class TransactionCreate(TransactionBase):
-    pass
+    # Left out, the category comes from the user's categorization rules and
+    # the currency is the user's base currency.
+    currency: CurrencyCode | None = None
+    category_id: int | None = None
 
 
 class TransactionUpdate(BaseModel):
-    amount: float | None = Field(default=None, gt=0)
+    amount: Amount | None = Field(default=None, gt=0)
+    currency: CurrencyCode | None = None
     category_id: int | None = None
     entry_type: TransactionKind | None = Field(default=None, alias="type")
     entry_date: dt.date | None = Field(default=None, alias="date")
     description: str | None = Field(default=None, max_length=255)
+    goal_id: int | None = None
 
     model_config = ConfigDict(populate_by_name=True)
 
+    @model_validator(mode="after")
+    def check_changes(self) -> "TransactionUpdate":
+        changes = self.model_dump(exclude_unset=True, by_alias=True)
+        for key in ("amount", "currency", "category_id", "type", "date"):
+            if key in changes and changes[key] is None:
+                raise ValueError(f"{key} cannot be null")
+        return self
+
 
 class TransactionResponse(TransactionBase):
     id: int
 
     model_config = ConfigDict(from_attributes=True, populate_by_name=True)
+
+
+class BulkRowError(BaseModel):
+    row: int
+    detail: str
+
+
+class BulkImportResponse(BaseModel):
+    inserted: int
+    failed: int
+    errors: list[BulkRowError]
+
+
+class TransactionFilter(BaseModel):
+    start_date: dt.date | None = None
+    end_date: dt.date | None = None
+    category_id: int | None = None
+    entry_type: TransactionKind | None = Field(default=None, alias="type")
+    q: str | None = Field(default=None, max_length=200)
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    @field_validator("q")
+    @classmethod
+    def check_q(cls, q: str | None) -> str | None:
+        if q is not None and not re.search(r"[^\W_]", q):
+            raise ValueError("Search query has no words")
+        return q
+
+
+class TransactionSelection(BaseModel):
+    ids: list[int] | None = Field(default=None, min_length=1, max_length=MAX_BATCH_IDS)
+    filter: TransactionFilter | None = None
+
+    @model_validator(mode="after")
+    def check_selection(self) -> "TransactionSelection":
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Select transactions with either ids or filter")
+        # An empty filter would match the whole ledger.
+        if self.filter is not None and not self.filter.model_dump(exclude_none=True):
+            raise ValueError("filter needs at least one condition")
+        return self
+
+
+class TransactionBatchUpdate(TransactionSelection):
+    changes: TransactionUpdate
+
+    @model_validator(mode="after")
+    def check_changes(self) -> "TransactionBatchUpdate":
+        if not self.changes.model_fields_set:
+            raise ValueError("changes must set at least one field")
+        return self
+
+
+class TransactionBatchResponse(BaseModel):
+    affected: int
@@ -0,0 +1,196 @@
+import csv
+import io
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from typing import Any, BinaryIO, Literal
+
+import numpy as np
+import orjson
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import ColumnElement, Float, Row, Select, and_, cast, select
+from sqlalchemy.orm import Session
+
+from app.db.functions import cents, money_text
+from app.models import Category, Transaction
+
+ExportFormat = Literal["csv", "parquet", "ndjson"]
+
+FETCH_BATCH_SIZE = 1000
+PARQUET_ROW_GROUP_SIZE = 100_000
+
+MEDIA_TYPES: dict[str, str] = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+# Amounts never become Decimals on the way out: each format selects them
+# already encoded, exactly. CSV gets two-place text, NDJSON the float whose
+# shortest repr is that text (as the transaction list does), and Parquet
+# integer cents that are laid straight into its scaled decimal128 column.
+AMOUNT_ENCODINGS: dict[str, ColumnElement[Any]] = {
+    "csv": money_text(Transaction.amount),
+    "ndjson": cast(Transaction.amount, Float),
+    "parquet": cents(Transaction.amount),
+}
+
+
+def export_columns(export_format: str) -> tuple[ColumnElement[Any], ...]:
+    return (
+        Transaction.id,
+        Transaction.date,
+        Transaction.type,
+        AMOUNT_ENCODINGS[export_format].label("amount"),
+        Transaction.currency,
+        Transaction.category_id,
+        Category.name.label("category"),
+        Transaction.description,
+        Transaction.goal_id,
+    )
+
+
+_EXPORT_KEYS = tuple(column.key for column in export_columns("csv"))
+
+PARQUET_SCHEMA = pa.schema(
+    [
+        pa.field("id", pa.int64(), nullable=False),
+        pa.field("date", pa.date32(), nullable=False),
+        pa.field("type", pa.string(), nullable=False),
+        pa.field("amount", pa.decimal128(12, 2), nullable=False),
+        pa.field("currency", pa.string(), nullable=False),
+        pa.field("category_id", pa.int64(), nullable=False),
+        pa.field("category", pa.string(), nullable=False),
+        pa.field("description", pa.string()),
+        pa.field("goal_id", pa.int64()),
+    ]
+)
+
+
+def export_query(conditions: Sequence[ColumnElement[bool]], export_format: str) -> Select:
+    # yield_per makes the result a server-side cursor read in fixed batches, so
+    # memory stays flat however many rows match.
+    return (
+        select(*export_columns(export_format))
+        .join(Category, Category.id == Transaction.category_id)
+        .where(and_(*conditions))
+        .order_by(Transaction.date.desc(), Transaction.id.desc())
+        .execution_options(yield_per=FETCH_BATCH_SIZE)
+    )
+
+
+def _decimal_array(cents: Sequence[int], decimal_type: pa.Decimal128Type) -> pa.Array:
+    # A decimal128 value is a 16-byte little-endian two's-complement integer
+    # scaled by 10**scale: the cents widened with their sign as the high word.
+    low = np.fromiter(cents, dtype=np.int64, count=len(cents))
+    words = np.column_stack((low, low >> 63))
+    return pa.Array.from_buffers(decimal_type, len(low), [None, pa.py_buffer(words.tobytes())])
+
+
+def _csv_chunks(batches: Iterable[Sequence[Row]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(_EXPORT_KEYS)
+    yield buffer.getvalue().encode()
+    for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(batch)
+        yield buffer.getvalue().encode()
+
+
+def _ndjson_chunks(batches: Iterable[Sequence[Row]]) -> Iterator[bytes]:
+    for batch in batches:
+        yield b"".join(
+            orjson.dumps(dict(zip(_EXPORT_KEYS, row)), option=orjson.OPT_APPEND_NEWLINE)
+            for row in batch
+        )
+
+
+class _ChunkSink(io.RawIOBase):
+    # Collects what ParquetWriter writes so it can be handed out per row group.
+    def __init__(self) -> None:
+        self.chunks: list[bytes] = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        chunk = bytes(data)
+        self.chunks.append(chunk)
+        self.position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self.position
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def _row_groups(batches: Iterable[Sequence[Row]]) -> Iterator[list[Row]]:
+    group: list[Row] = []
+    for batch in batches:
+        group.extend(batch)
+        if len(group) >= PARQUET_ROW_GROUP_SIZE:
+            yield group
+            group = []
+    if group:
+        yield group
+
+
+def _parquet_chunks(batches: Iterable[Sequence[Row]]) -> Iterator[bytes]:
+    # One row group per PARQUET_ROW_GROUP_SIZE rows, each with min/max/null
+    # statistics, so readers can skip groups by date or amount. Only the group
+    # being built is held in memory.
+    sink = _ChunkSink()
+    with pq.ParquetWriter(sink, PARQUET_SCHEMA, compression="zstd", write_statistics=True) as writer:
+        for group in _row_groups(batches):
+            columns = list(zip(*group))
+            table = pa.Table.from_arrays(
+                [
+                    _decimal_array(column, field.type) if field.name == "amount" else pa.array(column, type=field.type)
+                    for column, field in zip(columns, PARQUET_SCHEMA)
+                ],
+                schema=PARQUET_SCHEMA,
+            )
+            writer.write_table(table, row_group_size=PARQUET_ROW_GROUP_SIZE)
+            yield sink.drain()
+    yield sink.drain()
+
+
+_WRITERS: dict[str, Callable[[Iterable[Sequence[Row]]], Iterator[bytes]]] = {
+    "csv": _csv_chunks,
+    "ndjson": _ndjson_chunks,
+    "parquet": _parquet_chunks,
+}
+
+
+def stream_export(db: Session, export_format: str, conditions: Sequence[ColumnElement[bool]]) -> Iterator[bytes]:
+    result = db.execute(export_query(conditions, export_format))
+    yield from _WRITERS[export_format](result.partitions())
+
+
+def write_export(
+    db: Session,
+    export_format: str,
+    conditions: Sequence[ColumnElement[bool]],
+    stream: BinaryIO,
+    on_progress: Callable[[int], None] | None = None,
+) -> int:
+    exported = 0
+
+    def counted(batches: Iterable[Sequence[Row]]) -> Iterator[Sequence[Row]]:
+        nonlocal exported
+        for batch in batches:
+            yield batch
+            exported += len(batch)
+            if on_progress is not None:
+                on_progress(exported)
+
+    result = db.execute(export_query(conditions, export_format))
+    for chunk in _WRITERS[export_format](counted(result.partitions())):
+        stream.write(chunk)
+    return exported
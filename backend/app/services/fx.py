@@ -0,0 +1,215 @@
+import bisect
+import csv
+import datetime as dt
+import itertools
+from collections.abc import Hashable, Iterable, Iterator, Sequence
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+from typing import Any, TextIO
+
+import numpy as np
+from sqlalchemy import ColumnElement, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db.functions import epoch_days, sum_cents
+from app.models import FxRate, Transaction
+
+IMPORT_BATCH_SIZE = 5000
+
+_EPOCH = dt.date(1970, 1, 1)
+_CENT = Decimal("0.01")
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+class MissingRate(LookupError):
+    def __init__(self, currency: str) -> None:
+        super().__init__(f"No FX rates for {currency}")
+        self.currency = currency
+
+
+class RateTable:
+    # Rates are units of each currency per one unit of the pivot currency, kept
+    # per currency as two arrays sorted by epoch day. A day without a published
+    # rate (weekends, holidays) takes the latest earlier one; days before the
+    # first rate take the first.
+    def __init__(self, pivot: str, series: dict[str, tuple[np.ndarray, np.ndarray]]) -> None:
+        self.pivot = pivot
+        self._series = series
+        self._days = {currency: days.tolist() for currency, (days, _) in series.items()}
+        self.version = hash(
+            tuple(
+                (currency, days.size, int(days[-1]), float(rates.sum()))
+                for currency, (days, rates) in series.items()
+            )
+        )
+        self.rate = lru_cache(maxsize=settings.fx_rate_cache_size)(self._rate)
+
+    @property
+    def currencies(self) -> list[str]:
+        return sorted({self.pivot, *self._series})
+
+    def has(self, currency: str) -> bool:
+        return currency == self.pivot or currency in self._series
+
+    def convertible(self, currency: str, target: str) -> bool:
+        return currency == target or (self.has(currency) and self.has(target))
+
+    def _rate(self, currency: str, day: dt.date) -> float:
+        if currency == self.pivot:
+            return 1.0
+        if currency not in self._series:
+            raise MissingRate(currency)
+        index = bisect.bisect_right(self._days[currency], (day - _EPOCH).days) - 1
+        return float(self._series[currency][1][max(index, 0)])
+
+    def rates(self, currency: str, days: np.ndarray) -> np.ndarray:
+        if currency == self.pivot:
+            return np.ones(days.shape)
+        if currency not in self._series:
+            raise MissingRate(currency)
+        known, rates = self._series[currency]
+        return rates[np.maximum(np.searchsorted(known, days, side="right") - 1, 0)]
+
+    def convert(self, amount: Decimal, currency: str, day: dt.date, target: str) -> Decimal:
+        if currency == target:
+            return amount
+        factor = Decimal(repr(self.rate(target, day) / self.rate(currency, day)))
+        return (amount * factor).quantize(_CENT)
+
+    def factors(self, currencies: np.ndarray, days: np.ndarray, target: str) -> np.ndarray:
+        # One searchsorted per distinct currency instead of a lookup per row.
+        factors = np.ones(currencies.shape)
+        for currency in np.unique(currencies):
+            if currency == target:
+                continue
+            rows = currencies == currency
+            factors[rows] = self.rates(target, days[rows]) / self.rates(currency, days[rows])
+        return factors
+
+
+rate_cache: TTLCache[str, RateTable] = TTLCache(1, settings.fx_rates_ttl_seconds)
+
+
+def load_rates(db: Session) -> RateTable:
+    # The whole table is small (a few thousand rows per currency over a decade)
+    # and read in one ordered scan of the primary key.
+    table = rate_cache.get("rates")
+    if table is None:
+        rows = db.execute(
+            select(FxRate.currency, epoch_days(FxRate.date), FxRate.rate).order_by(FxRate.currency, FxRate.date)
+        ).all()
+        series = {}
+        for currency, group in itertools.groupby(rows, key=lambda row: row[0]):
+            points = list(group)
+            series[currency] = (
+                np.fromiter((point[1] for point in points), dtype=np.int64, count=len(points)),
+                np.fromiter((point[2] for point in points), dtype=np.float64, count=len(points)),
+            )
+        table = RateTable(settings.fx_pivot_currency, series)
+        rate_cache.set("rates", table)
+    return table
+
+
+def converted_totals(
+    db: Session,
+    rates: RateTable,
+    target: str,
+    conditions: Sequence[ColumnElement[bool]],
+    group_by: Sequence[ColumnElement[Any]],
+) -> dict[tuple[Hashable, ...], tuple[Decimal, int]]:
+    # Transactions are summed in SQL per group, currency and day as whole cents,
+    # then every day's total is converted at once with that day's rate and
+    # summed per group. Only the converted sums are rounded, once, to a cent.
+    width = len(group_by)
+    rows = db.execute(
+        select(
+            *group_by, Transaction.currency, epoch_days(Transaction.date), sum_cents(Transaction.amount), func.count()
+        )
+        .where(*conditions)
+        .group_by(*group_by, Transaction.currency, Transaction.date)
+    ).all()
+    if not rows:
+        return {}
+
+    groups: dict[tuple[Hashable, ...], int] = {}
+    index = np.fromiter((groups.setdefault(tuple(row[:width]), len(groups)) for row in rows), np.int64, len(rows))
+    currencies = np.array([row[width] for row in rows])
+    days = np.fromiter((row[width + 1] for row in rows), np.int64, len(rows))
+    amounts = np.fromiter((row[width + 2] for row in rows), np.int64, len(rows))
+    counts = np.fromiter((row[width + 3] for row in rows), np.int64, len(rows))
+
+    converted = amounts * rates.factors(currencies, days, target)
+    totals = np.bincount(index, weights=converted, minlength=len(groups))
+    group_counts = np.bincount(index, weights=counts, minlength=len(groups))
+    return {
+        key: (Decimal(int(np.rint(totals[position]))).scaleb(-2), int(group_counts[position]))
+        for key, position in groups.items()
+    }
+
+
+def _rate_row(line: int, day: str, currency: str, rate: str) -> dict[str, Any]:
+    currency = currency.strip().upper()
+    if len(currency) != 3 or not currency.isalpha():
+        raise ValueError(f"line {line}: invalid currency {currency!r}")
+    try:
+        value = Decimal(rate.strip())
+        parsed_day = dt.date.fromisoformat(day.strip())
+    except (InvalidOperation, ValueError):
+        raise ValueError(f"line {line}: invalid date or rate")
+    if value <= 0:
+        raise ValueError(f"line {line}: rate must be positive")
+    return {"currency": currency, "date": parsed_day, "rate": value}
+
+
+def read_rates(stream: TextIO) -> Iterator[dict[str, Any]]:
+    # Either "date,currency,rate" rows, or the wide layout of the ECB reference
+    # rate history: a date column followed by one column per currency, with
+    # "N/A" or blanks where a currency had no rate that day.
+    reader = csv.reader(stream)
+    header = [column.strip() for column in next(reader, [])]
+    lowered = [column.lower() for column in header]
+    if {"date", "currency", "rate"} <= set(lowered):
+        positions = [lowered.index(column) for column in ("date", "currency", "rate")]
+        for line, row in enumerate(reader, start=2):
+            if any(cell.strip() for cell in row):
+                yield _rate_row(line, *(row[position] for position in positions))
+        return
+
+    currencies = header[1:]
+    for line, row in enumerate(reader, start=2):
+        for currency, rate in zip(currencies, row[1:]):
+            if currency and rate.strip() and rate.strip().upper() != "N/A":
+                yield _rate_row(line, row[0], currency, rate)
+
+
+def _upsert_rates(db: Session, batch: dict[tuple[str, dt.date], dict[str, Any]]) -> None:
+    dialect_insert = _UPSERT_INSERTS.get(db.get_bind().dialect.name)
+    if dialect_insert is None:
+        for row in batch.values():
+            db.merge(FxRate(**row))
+        return
+    stmt = dialect_insert(FxRate)
+    stmt = stmt.on_conflict_do_update(index_elements=["currency", "date"], set_={"rate": stmt.excluded.rate})
+    db.execute(stmt, list(batch.values()))
+
+
+def import_rates(db: Session, rows: Iterable[dict[str, Any]]) -> int:
+    # Re-importing a file overwrites the rates it covers. Within a batch the
+    # last row for a (currency, date) wins, as one upsert cannot touch a row twice.
+    imported = 0
+    batch: dict[tuple[str, dt.date], dict[str, Any]] = {}
+    for row in rows:
+        batch[(row["currency"], row["date"])] = row
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            _upsert_rates(db, batch)
+            imported += len(batch)
+            batch = {}
+    if batch:
+        _upsert_rates(db, batch)
+        imported += len(batch)
+    db.commit()
+    rate_cache.clear()
+    return imported
@@ -0,0 +1,170 @@
+import datetime as dt
+import math
+from collections.abc import Sequence
+from decimal import Decimal
+
+import numpy as np
+from sqlalchemy import ColumnElement, bindparam, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.db.functions import money_sum, month_of
+from app.models import Goal, Transaction
+from app.schemas.goal import GoalForecast, MonthlyContribution
+
+# Recent months dominate the contribution rate; a month this far back counts half.
+RATE_HALF_LIFE_MONTHS = 3.0
+RATE_WINDOW_MONTHS = 12
+# Completion further out than this is reported as not projected.
+MAX_FORECAST_MONTHS = 100 * 12
+
+ContributionKey = tuple[int, int | None, str]
+
+
+def _linked_goals(user_id: int, category_id: int, goal_id: int | None, currency: str) -> list[ColumnElement[bool]]:
+    links = [Goal.category_id == category_id]
+    if goal_id is not None:
+        links.append(Goal.id == goal_id)
+    return [Goal.user_id == user_id, Goal.currency == currency, or_(*links)]
+
+
+def contribute(
+    db: Session, user_id: int, category_id: int, goal_id: int | None, currency: str, amount: Decimal
+) -> bool:
+    # A transaction counts once towards the goal it is tagged with and towards
+    # every goal linked to its category, as long as the goal is kept in the
+    # transaction's currency.
+    result = db.execute(
+        update(Goal)
+        .where(*_linked_goals(user_id, category_id, goal_id, currency))
+        .values(current_amount=Goal.current_amount + amount)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount > 0
+
+
+def apply_contributions(db: Session, user_id: int, totals: dict[ContributionKey, Decimal]) -> bool:
+    touched = False
+    for (category_id, goal_id, currency), amount in totals.items():
+        touched = contribute(db, user_id, category_id, goal_id, currency, amount) or touched
+    return touched
+
+
+def apply_contributions_for_users(db: Session, totals: dict[tuple[int, int, int | None, str], Decimal]) -> set[int]:
+    # Same matching as contribute(), for many users at once: one goal lookup
+    # and one executemany UPDATE instead of an UPDATE per (user, link).
+    goals = db.execute(
+        select(Goal.id, Goal.user_id, Goal.category_id, Goal.currency).where(
+            Goal.user_id.in_({key[0] for key in totals})
+        )
+    ).all()
+    owners = {goal_id: (user_id, currency) for goal_id, user_id, _, currency in goals}
+    by_category: dict[tuple[int, int, str], list[int]] = {}
+    for goal_id, user_id, category_id, currency in goals:
+        if category_id is not None:
+            by_category.setdefault((user_id, category_id, currency), []).append(goal_id)
+
+    increments: dict[int, Decimal] = {}
+    for (user_id, category_id, goal_id, currency), amount in totals.items():
+        linked = set(by_category.get((user_id, category_id, currency), ()))
+        if goal_id is not None and owners.get(goal_id) == (user_id, currency):
+            linked.add(goal_id)
+        for linked_id in linked:
+            increments[linked_id] = increments.get(linked_id, Decimal(0)) + amount
+
+    if increments:
+        goals_table = Goal.__table__
+        db.execute(
+            update(goals_table)
+            .where(goals_table.c.id == bindparam("goal_id"))
+            .values(current_amount=goals_table.c.current_amount + bindparam("increment")),
+            [{"goal_id": goal_id, "increment": amount} for goal_id, amount in increments.items()],
+        )
+    return {owners[goal_id][0] for goal_id in increments}
+
+
+def _contribution_filter(goal: Goal) -> list[ColumnElement[bool]]:
+    links = [Transaction.goal_id == goal.id]
+    if goal.category_id is not None:
+        links.append(Transaction.category_id == goal.category_id)
+    return [Transaction.user_id == goal.user_id, Transaction.currency == goal.currency, or_(*links)]
+
+
+def linked_total(db: Session, goal: Goal) -> Decimal:
+    total = db.scalar(select(money_sum(Transaction.amount)).where(*_contribution_filter(goal)))
+    return total if total is not None else Decimal(0)
+
+
+def _month_index(month: str) -> int:
+    year, month_number = month.split("-")
+    return int(year) * 12 + int(month_number) - 1
+
+
+def _month_end(index: int) -> dt.date:
+    year, month_number = divmod(index + 1, 12)
+    return dt.date(year, month_number + 1, 1) - dt.timedelta(days=1)
+
+
+def _monthly_rate(months: Sequence[str], amounts: Sequence[float], current_index: int) -> float:
+    if not months:
+        return 0.0
+
+    indexes = np.fromiter((_month_index(month) for month in months), dtype=np.int64, count=len(months))
+    first = min(max(int(indexes.min()), current_index - RATE_WINDOW_MONTHS + 1), current_index)
+    series = np.zeros(current_index - first + 1)
+    in_window = (indexes >= first) & (indexes <= current_index)
+    np.add.at(series, indexes[in_window] - first, np.asarray(amounts, dtype=np.float64)[in_window])
+
+    age = np.arange(series.size)[::-1]
+    weights = 0.5 ** (age / RATE_HALF_LIFE_MONTHS)
+    return float(series @ weights / weights.sum())
+
+
+def forecast(db: Session, goal: Goal, today: dt.date | None = None) -> GoalForecast:
+    today = today or dt.date.today()
+    month = month_of(Transaction.date).label("month")
+    rows = db.execute(
+        select(month, money_sum(Transaction.amount))
+        .where(*_contribution_filter(goal))
+        .group_by(month)
+        .order_by(month)
+    ).all()
+    months = [row[0] for row in rows]
+    amounts = [row[1] for row in rows]
+
+    # The contribution rate is a weighted average, so floats are fine there;
+    # the amounts themselves stay exact.
+    current_index = today.year * 12 + today.month - 1
+    rate = _monthly_rate(months, [float(amount) for amount in amounts], current_index)
+    remaining = max(goal.target_amount - goal.current_amount, Decimal(0))
+
+    months_to_completion: int | None = None
+    projected_completion: dt.date | None = None
+    if remaining == 0:
+        months_to_completion, projected_completion = 0, today
+    elif rate > 0 and float(remaining) / rate <= MAX_FORECAST_MONTHS:
+        months_to_completion = math.ceil(float(remaining) / rate)
+        projected_completion = _month_end(current_index + months_to_completion)
+
+    required_monthly: float | None = None
+    on_track: bool | None = None
+    if goal.deadline is not None:
+        months_left = max(goal.deadline.year * 12 + goal.deadline.month - 1 - current_index, 0) + 1
+        required_monthly = round(float(remaining) / months_left, 2)
+        on_track = projected_completion is not None and projected_completion <= _month_end(
+            goal.deadline.year * 12 + goal.deadline.month - 1
+        )
+
+    return GoalForecast(
+        goal_id=goal.id,
+        currency=goal.currency,
+        target_amount=goal.target_amount,
+        current_amount=goal.current_amount,
+        remaining=remaining,
+        monthly_rate=round(rate, 2),
+        months_to_completion=months_to_completion,
+        projected_completion=projected_completion,
+        deadline=goal.deadline,
+        on_track=on_track,
+        required_monthly=required_monthly,
+        history=[MonthlyContribution(month=m, amount=a) for m, a in zip(months, amounts)],
+    )
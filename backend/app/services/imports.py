@@ -0,0 +1,232 @@
+import csv
+import io
+import re
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+from typing import Any, BinaryIO
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.models import Category, Goal, Transaction, User
+from app.schemas.transaction import BulkImportResponse, BulkRowError, TransactionCreate
+from app.services import goals as goal_progress
+from app.services import rollups
+from app.services.fx import RateTable, load_rates
+from app.services.rules import RuleMatcher, load_matcher
+
+BATCH_SIZE = 1000
+
+_OFX_TAG = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<\r\n]*)")
+
+
+@dataclass
+class ImportCheckpoint:
+    # How far a non-atomic import got: the input rows behind its last commit,
+    # what they inserted and the rows they rejected.
+    rows: int = 0
+    inserted: int = 0
+    errors: list[BulkRowError] = field(default_factory=list)
+
+
+def iter_csv_rows(stream: BinaryIO) -> Iterator[dict[str, Any]]:
+    # Undecodable bytes become U+FFFD, as in the background path, rather than
+    # failing the whole upload halfway through.
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding="utf-8-sig", errors="replace", newline=""))
+    for row in reader:
+        yield {key.strip().lower(): value.strip() if value else None for key, value in row.items() if key}
+
+
+def _ofx_date(value: str) -> str:
+    digits = value[:8]
+    return f"{digits[:4]}-{digits[4:6]}-{digits[6:8]}" if digits.isdigit() and len(digits) == 8 else value
+
+
+def iter_ofx_rows(stream: BinaryIO) -> Iterator[dict[str, Any]]:
+    current: dict[str, str] | None = None
+    for line in io.TextIOWrapper(stream, encoding="utf-8", errors="replace"):
+        for closing, tag, value in _OFX_TAG.findall(line):
+            tag = tag.upper()
+            if tag == "STMTTRN":
+                if closing and current is not None:
+                    yield {
+                        "amount": current.get("TRNAMT"),
+                        "date": _ofx_date(current.get("DTPOSTED", "")),
+                        "description": current.get("NAME") or current.get("MEMO"),
+                    }
+                current = None if closing else {}
+            elif current is not None and not closing:
+                current[tag] = value.strip()
+
+
+def _validation_detail(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" if error["loc"] else error["msg"]
+        for error in exc.errors()
+    )
+
+
+def _resolve_row(
+    raw: dict[str, Any],
+    categories: dict[int, str],
+    categories_by_name: dict[str, int],
+    default_category_ids: dict[str, int],
+    goal_ids: set[int],
+    matcher: RuleMatcher,
+    rates: RateTable,
+    base_currency: str,
+) -> dict[str, Any]:
+    values = dict(raw)
+
+    # Bank exports carry signed amounts instead of a type column.
+    if not values.get("type") and values.get("amount") not in (None, ""):
+        try:
+            signed = Decimal(str(values["amount"]))
+        except InvalidOperation:
+            raise ValueError("amount: Input should be a valid number")
+        if not signed.is_finite():
+            raise ValueError("amount: Input should be a finite number")
+        values["type"] = "expense" if signed < 0 else "income"
+        values["amount"] = str(abs(signed))
+
+    if values.get("currency"):
+        values["currency"] = str(values["currency"]).upper()
+
+    if not values.get("category_id"):
+        name = values.get("category")
+        if name:
+            values["category_id"] = categories_by_name.get(str(name).lower())
+            if values["category_id"] is None:
+                raise ValueError("Invalid category")
+
+    try:
+        payload = TransactionCreate.model_validate(values)
+    except ValidationError as exc:
+        raise ValueError(_validation_detail(exc))
+
+    category_id = payload.category_id
+    if category_id is None:
+        category_id = matcher.match(payload.description, payload.amount, payload.entry_type)
+    if category_id is None:
+        category_id = default_category_ids.get(payload.entry_type)
+    if category_id is None:
+        raise ValueError("No category given and no rule matched")
+
+    category_type = categories.get(category_id)
+    if category_type is None:
+        raise ValueError("Invalid category")
+    if category_type != payload.entry_type:
+        raise ValueError("Category type mismatch")
+    if payload.goal_id is not None and payload.goal_id not in goal_ids:
+        raise ValueError("Invalid goal")
+    currency = payload.currency or base_currency
+    if not rates.convertible(currency, base_currency):
+        raise ValueError("Unknown currency")
+
+    return {
+        "amount": payload.amount,
+        "currency": currency,
+        "category_id": category_id,
+        "type": payload.entry_type,
+        "date": payload.entry_date,
+        "description": payload.description,
+        "goal_id": payload.goal_id,
+    }
+
+
+def _insert_batch(db: Session, user_id: int, batch: list[dict[str, Any]]) -> None:
+    totals: dict[rollups.BucketKey, tuple[Decimal, int]] = {}
+    contributions: dict[goal_progress.ContributionKey, Decimal] = {}
+    for values in batch:
+        values["user_id"] = user_id
+        amount = Decimal(str(values["amount"]))
+        key = (user_id, values["date"].strftime("%Y-%m"), values["category_id"], values["type"], values["currency"])
+        bucket_amount, count = totals.get(key, (Decimal(0), 0))
+        totals[key] = (bucket_amount + amount, count + 1)
+        link = (values["category_id"], values["goal_id"], values["currency"])
+        contributions[link] = contributions.get(link, Decimal(0)) + amount
+
+    db.execute(insert(Transaction), batch)
+    rollups.apply_totals(db, totals)
+    goal_progress.apply_contributions(db, user_id, contributions)
+
+
+def import_transactions(
+    db: Session,
+    user_id: int,
+    rows: Iterable[dict[str, Any]],
+    atomic: bool = False,
+    default_category_ids: dict[str, int] | None = None,
+    on_batch: Callable[[int], None] | None = None,
+    resume: ImportCheckpoint | None = None,
+    on_checkpoint: Callable[[ImportCheckpoint], None] | None = None,
+) -> BulkImportResponse:
+    categories: dict[int, str] = {}
+    categories_by_name: dict[str, int] = {}
+    for category_id, name, category_type in db.execute(
+        select(Category.id, Category.name, Category.type).where(Category.user_id == user_id)
+    ):
+        categories[category_id] = category_type
+        categories_by_name.setdefault(name.lower(), category_id)
+    goal_ids = set(db.scalars(select(Goal.id).where(Goal.user_id == user_id)))
+    matcher = load_matcher(db, user_id)
+    base_currency = db.scalar(select(User.base_currency).where(User.id == user_id))
+    rates = load_rates(db)
+
+    # on_checkpoint runs in the same transaction as every commit, the last one
+    # included, so an import resumed from that checkpoint skips exactly the rows
+    # already written instead of inserting them twice. on_batch follows every
+    # batch, committed or not, and is how a long job keeps its heartbeat.
+    resume = resume or ImportCheckpoint()
+    errors: list[BulkRowError] = list(resume.errors)
+    batch: list[dict[str, Any]] = []
+    inserted = resume.inserted
+    read = resume.rows
+
+    for index, raw in enumerate(rows, start=1):
+        if index <= resume.rows:
+            continue
+        read = index
+        try:
+            batch.append(
+                _resolve_row(
+                    raw,
+                    categories,
+                    categories_by_name,
+                    default_category_ids or {},
+                    goal_ids,
+                    matcher,
+                    rates,
+                    base_currency,
+                )
+            )
+        except ValueError as exc:
+            errors.append(BulkRowError(row=index, detail=str(exc)))
+            continue
+
+        if atomic and errors:
+            batch.clear()
+        elif len(batch) >= BATCH_SIZE:
+            _insert_batch(db, user_id, batch)
+            inserted += len(batch)
+            batch = []
+            if not atomic:
+                if on_checkpoint is not None:
+                    on_checkpoint(ImportCheckpoint(index, inserted, list(errors)))
+                db.commit()
+            if on_batch is not None:
+                on_batch(inserted)
+
+    if atomic and errors:
+        db.rollback()
+        return BulkImportResponse(inserted=0, failed=len(errors), errors=errors)
+
+    if batch:
+        _insert_batch(db, user_id, batch)
+        inserted += len(batch)
+    if on_checkpoint is not None:
+        on_checkpoint(ImportCheckpoint(read, inserted, list(errors)))
+    db.commit()
+    return BulkImportResponse(inserted=inserted, failed=len(errors), errors=errors)
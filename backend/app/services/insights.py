@@ -0,0 +1,213 @@
+import datetime as dt
+import itertools
+from dataclasses import dataclass
+
+import numpy as np
+from sqlalchemy import Float, case, cast, select
+from sqlalchemy.orm import Session
+
+from app.db.functions import epoch_days
+from app.models import MonthlySummary, Transaction
+from app.schemas.insights import (
+    CategorySeasonality,
+    ForecastMonth,
+    InsightsResponse,
+    MonthlyInsight,
+    TransactionOutlier,
+)
+from app.services.fx import load_rates
+
+BASELINE_MONTHS = 6
+SEASONALITY_MIN_MONTHS = 12
+OUTLIER_MIN_GROUP = 5
+OUTLIER_THRESHOLD = 3.5
+MAX_OUTLIERS = 50
+# Scales the median absolute deviation to a standard deviation for normal data.
+_MAD_SCALE = 0.6745
+_EPOCH = dt.date(1970, 1, 1)
+
+
+@dataclass(frozen=True)
+class Ledger:
+    ids: np.ndarray
+    days: np.ndarray
+    amounts: np.ndarray
+    is_income: np.ndarray
+    category_ids: np.ndarray
+
+    @property
+    def months(self) -> np.ndarray:
+        return self.days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+
+
+def load_ledger(db: Session, user_id: int, currency: str) -> Ledger:
+    # Every column is numeric by the time it leaves the database (dates as epoch
+    # days, type as 0/1, currency as an index into `held`), so rows flatten
+    # straight into one float array. Amounts are then converted into `currency`
+    # at each day's rate in one pass per held currency.
+    held = [currency] + list(
+        db.scalars(
+            select(MonthlySummary.currency)
+            .where(MonthlySummary.user_id == user_id, MonthlySummary.currency != currency)
+            .distinct()
+        )
+    )
+    rows = db.execute(
+        select(
+            Transaction.id,
+            epoch_days(Transaction.date),
+            cast(Transaction.amount, Float),
+            case((Transaction.type == "income", 1), else_=0),
+            Transaction.category_id,
+            case({code: index for index, code in enumerate(held)}, value=Transaction.currency, else_=0),
+        ).where(Transaction.user_id == user_id)
+    ).all()
+    data = np.fromiter(itertools.chain.from_iterable(rows), dtype=np.float64, count=len(rows) * 6).reshape(-1, 6)
+    days, amounts = data[:, 1].astype(np.int64), data[:, 2]
+    if len(held) > 1:
+        currencies = np.array(held)[data[:, 5].astype(np.int64)]
+        amounts = amounts * load_rates(db).factors(currencies, days, currency)
+    return Ledger(
+        ids=data[:, 0].astype(np.int64),
+        days=days,
+        amounts=amounts,
+        is_income=data[:, 3].astype(bool),
+        category_ids=data[:, 4].astype(np.int64),
+    )
+
+
+def _month_label(month_index: int) -> str:
+    year, month = divmod(int(month_index), 12)
+    return f"{1970 + year:04d}-{month + 1:02d}"
+
+
+def _rolling_mean(series: np.ndarray, window: int) -> np.ndarray:
+    cumulative = np.concatenate(([0.0], np.cumsum(series)))
+    end = np.arange(1, series.size + 1)
+    start = np.maximum(end - window, 0)
+    return (cumulative[end] - cumulative[start]) / (end - start)
+
+
+def _seasonal_factors(sums: np.ndarray, first_month: int, span: int) -> tuple[np.ndarray, np.ndarray]:
+    # sums has one row per series and 12 calendar-month columns. Factors compare
+    # each calendar month's average with the overall monthly average.
+    sums = sums.astype(np.float64)
+    occurrences = np.bincount(np.arange(first_month, first_month + span) % 12, minlength=12)
+    monthly_average = sums.sum(axis=1) / span
+    by_calendar_month = np.divide(sums, occurrences, out=np.zeros_like(sums), where=occurrences > 0)
+    factors = np.divide(
+        by_calendar_month,
+        monthly_average[:, None],
+        out=np.ones_like(sums),
+        where=(monthly_average[:, None] > 0) & (occurrences > 0),
+    )
+    return monthly_average, factors
+
+
+def _outliers(ledger: Ledger, expenses: np.ndarray, categories: np.ndarray, groups: np.ndarray) -> list[TransactionOutlier]:
+    # Group expenses by category once; each group is then a contiguous slice
+    # whose median and MAD come from np.median's O(n) partition.
+    order = np.argsort(groups, kind="stable")
+    amounts, groups = ledger.amounts[expenses][order], groups[order]
+    bounds = np.concatenate(([0], np.cumsum(np.bincount(groups, minlength=categories.size))))
+
+    scores = np.zeros_like(amounts)
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        if end - start < OUTLIER_MIN_GROUP:
+            continue
+        deviations = amounts[start:end] - np.median(amounts[start:end])
+        mad = np.median(np.abs(deviations))
+        if mad > 0:
+            scores[start:end] = _MAD_SCALE * deviations / mad
+
+    flagged = np.flatnonzero(np.abs(scores) > OUTLIER_THRESHOLD)
+    flagged = flagged[np.argsort(-np.abs(scores[flagged]), kind="stable")][:MAX_OUTLIERS]
+    ids, days = ledger.ids[expenses][order], ledger.days[expenses][order]
+    return [
+        TransactionOutlier(
+            transaction_id=int(ids[i]),
+            date=_EPOCH + dt.timedelta(days=int(days[i])),
+            amount=float(amounts[i]),
+            category_id=int(categories[groups[i]]),
+            score=round(float(scores[i]), 2),
+        )
+        for i in flagged
+    ]
+
+
+def compute_insights(ledger: Ledger, horizon: int, today: dt.date | None = None) -> InsightsResponse:
+    if ledger.ids.size == 0:
+        return InsightsResponse(transaction_count=0, months=[], seasonality=[], forecast=[], outliers=[])
+
+    today = today or dt.date.today()
+    months = ledger.months
+    first_month = int(months.min())
+    last_month = max(int(months.max()), (today.year - 1970) * 12 + today.month - 1)
+    span = last_month - first_month + 1
+    offsets = months - first_month
+
+    income = np.bincount(offsets, weights=np.where(ledger.is_income, ledger.amounts, 0), minlength=span)
+    expense = np.bincount(offsets, weights=np.where(ledger.is_income, 0, ledger.amounts), minlength=span)
+    net = income - expense
+    rolling_3, rolling_6 = _rolling_mean(net, 3), _rolling_mean(net, 6)
+
+    expenses = ~ledger.is_income
+    categories, groups = np.unique(ledger.category_ids[expenses], return_inverse=True)
+    category_sums = np.bincount(
+        groups * 12 + months[expenses] % 12,
+        weights=ledger.amounts[expenses],
+        minlength=categories.size * 12,
+    ).reshape(-1, 12)
+    category_average, category_factors = _seasonal_factors(category_sums, first_month, span)
+
+    # Forecast: recent baseline per flow, shaped by each calendar month's
+    # seasonal factor once a full year of history exists.
+    baseline_income = income[-BASELINE_MONTHS:].mean()
+    baseline_expense = expense[-BASELINE_MONTHS:].mean()
+    calendar_months = np.arange(first_month, last_month + 1) % 12
+    totals = np.vstack(
+        (np.bincount(calendar_months, weights=income, minlength=12), np.bincount(calendar_months, weights=expense, minlength=12))
+    )
+    _, total_factors = _seasonal_factors(totals, first_month, span)
+    if span < SEASONALITY_MIN_MONTHS:
+        total_factors = np.ones_like(total_factors)
+
+    future = np.arange(last_month + 1, last_month + 1 + horizon)
+    projected_income = baseline_income * total_factors[0, future % 12]
+    projected_expense = baseline_expense * total_factors[1, future % 12]
+    projected_net = projected_income - projected_expense
+    cumulative = net.sum() + np.cumsum(projected_net)
+
+    return InsightsResponse(
+        transaction_count=int(ledger.ids.size),
+        months=[
+            MonthlyInsight(
+                month=_month_label(first_month + i),
+                income=round(float(income[i]), 2),
+                expense=round(float(expense[i]), 2),
+                net=round(float(net[i]), 2),
+                rolling_net_3=round(float(rolling_3[i]), 2),
+                rolling_net_6=round(float(rolling_6[i]), 2),
+            )
+            for i in range(span)
+        ],
+        seasonality=[
+            CategorySeasonality(
+                category_id=int(category_id),
+                monthly_average=round(float(category_average[i]), 2),
+                factors=np.round(category_factors[i], 3).tolist(),
+            )
+            for i, category_id in enumerate(categories)
+        ],
+        forecast=[
+            ForecastMonth(
+                month=_month_label(month),
+                income=round(float(projected_income[i]), 2),
+                expense=round(float(projected_expense[i]), 2),
+                net=round(float(projected_net[i]), 2),
+                cumulative_net=round(float(cumulative[i]), 2),
+            )
+            for i, month in enumerate(future)
+        ],
+        outliers=_outliers(ledger, expenses, categories, groups),
+    )
@@ -0,0 +1,380 @@
+import asyncio
+import datetime as dt
+import io
+import logging
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import ColumnElement, and_, case, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal, engine
+from app.models import Job
+from app.services.exports import write_export
+from app.services.imports import ImportCheckpoint, import_transactions, iter_csv_rows, iter_ofx_rows
+from app.schemas.rule import RuleApplyRequest
+from app.schemas.transaction import BulkRowError
+from app.services.rollups import rebuild_monthly_summaries, verify_monthly_summaries
+from app.services.rules import apply_rules
+from app.services.search import search_terms
+from app.services.transactions import selection_filters, transaction_filters
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_INTERVAL_SECONDS = 1.0
+POLL_BATCH_SIZE = 100
+
+
+def _now() -> dt.datetime:
+    return dt.datetime.now(dt.timezone.utc)
+
+
+class JobReclaimed(Exception):
+    pass
+
+
+def holds_claim(job_id: int, attempt: int) -> ColumnElement[bool]:
+    # A job reclaimed as stale belongs to whichever runner claimed it since, so
+    # every write about an attempt is conditional on it still being the current one.
+    return and_(Job.id == job_id, Job.attempts == attempt, Job.status == "running")
+
+
+class JobContext:
+    def __init__(self, job_id: int, attempt: int, user_id: int, payload: dict[str, Any]) -> None:
+        self.job_id = job_id
+        self.attempt = attempt
+        self.user_id = user_id
+        self.payload = payload
+        self.progress = 0
+        self.total: int | None = None
+        self._last_report = 0.0
+
+    def report(self, progress: int, total: int | None = None) -> None:
+        # Written from a separate session so progress is visible while the
+        # handler's own transaction is still open. Doubles as the heartbeat
+        # that keeps a long job from being reclaimed as stale.
+        self.progress, self.total = progress, total
+        now = time.monotonic()
+        if now - self._last_report < PROGRESS_INTERVAL_SECONDS:
+            return
+        self._last_report = now
+        with SessionLocal() as db:
+            db.execute(
+                update(Job)
+                .where(holds_claim(self.job_id, self.attempt))
+                .values(progress=progress, total=total, updated_at=_now())
+            )
+            db.commit()
+
+
+JobHandler = Callable[[Session, JobContext], dict[str, Any] | None]
+
+HANDLERS: dict[str, JobHandler] = {}
+
+
+def register(kind: str) -> Callable[[JobHandler], JobHandler]:
+    def decorator(handler: JobHandler) -> JobHandler:
+        HANDLERS[kind] = handler
+        return handler
+
+    return decorator
+
+
+def enqueue(db: Session, user_id: int, kind: str, payload: dict[str, Any]) -> Job:
+    job = Job(
+        user_id=user_id,
+        kind=kind,
+        payload=payload,
+        max_attempts=settings.job_max_attempts,
+        run_after=_now(),
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    job_runner.submit(job.id)
+    return job
+
+
+def _record_failure(db: Session, job_id: int, attempt: int, error: str, retry: bool = True) -> None:
+    max_attempts = db.scalar(select(Job.max_attempts).where(Job.id == job_id))
+    if max_attempts is None:
+        return
+    values: dict[str, Any] = {"error": error, "updated_at": _now()}
+    if retry and attempt < max_attempts:
+        backoff = dt.timedelta(seconds=settings.job_retry_backoff_seconds * 2 ** (attempt - 1))
+        values.update(status="queued", run_after=_now() + backoff)
+    else:
+        values.update(status="failed", finished_at=_now())
+    db.execute(update(Job).where(holds_claim(job_id, attempt)).values(**values))
+    db.commit()
+
+
+def execute_job(job_id: int) -> tuple[int, str] | None:
+    # Runs in a worker thread or a pool process. The conditional update is the
+    # claim: whichever runner flips the row to running owns this attempt.
+    with SessionLocal() as db:
+        now = _now()
+        claimed = db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == "queued")
+            .values(status="running", attempts=Job.attempts + 1, started_at=now, updated_at=now)
+        )
+        db.commit()
+        if claimed.rowcount != 1:
+            return None
+
+        job = db.get(Job, job_id)
+        if job is None:
+            return None
+        attempt = job.attempts
+        handler = HANDLERS.get(job.kind)
+        if handler is None:
+            _record_failure(db, job_id, attempt, f"Unknown job kind: {job.kind}", retry=False)
+            return None
+
+        user_id, kind = job.user_id, job.kind
+        context = JobContext(job_id, attempt, user_id, dict(job.payload))
+        try:
+            result = handler(db, context)
+        except JobReclaimed:
+            db.rollback()
+            logger.warning("Job %s attempt %s was reclaimed before it finished", job_id, attempt)
+            return None
+        except Exception as exc:
+            db.rollback()
+            _record_failure(db, job_id, attempt, f"{type(exc).__name__}: {exc}")
+            return None
+
+        finished = db.execute(
+            update(Job)
+            .where(holds_claim(job_id, attempt))
+            .values(
+                status="succeeded",
+                result=result,
+                error=None,
+                progress=context.progress,
+                total=context.total,
+                finished_at=_now(),
+                updated_at=_now(),
+            )
+        )
+        if finished.rowcount != 1:
+            db.rollback()
+            logger.warning("Job %s attempt %s was reclaimed before it finished", job_id, attempt)
+            return None
+        db.commit()
+        return user_id, kind
+
+
+def claimable_jobs() -> list[int]:
+    now = _now()
+    with SessionLocal() as db:
+        # A running job that stopped heartbeating belongs to a worker that died;
+        # it gets another attempt, or fails if it has used them all.
+        exhausted = Job.attempts >= Job.max_attempts
+        db.execute(
+            update(Job)
+            .where(Job.status == "running", Job.updated_at < now - dt.timedelta(seconds=settings.job_stale_seconds))
+            .values(
+                status=case((exhausted, "failed"), else_="queued"),
+                finished_at=case((exhausted, now), else_=None),
+                error="Worker stopped responding",
+                run_after=now,
+            )
+        )
+        job_ids = list(
+            db.scalars(
+                select(Job.id)
+                .where(Job.status == "queued", Job.run_after <= now)
+                .order_by(Job.run_after, Job.id)
+                .limit(POLL_BATCH_SIZE)
+            )
+        )
+        db.commit()
+    return job_ids
+
+
+def _init_worker_process() -> None:
+    # Forked workers must not reuse the parent's pooled connections.
+    engine.dispose(close=False)
+
+
+class JobRunner:
+    # Jobs live in the jobs table, so this needs no broker: submit() is only a
+    # fast path, and the poller picks up retries, jobs enqueued by other
+    # processes and anything left over from a restart.
+    def __init__(self, workers: int, mode: str, poll_interval: float) -> None:
+        self.workers = workers
+        self.mode = mode
+        self.poll_interval = poll_interval
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._queue: asyncio.Queue[int] | None = None
+        self._queued: set[int] = set()
+        self._tasks: list[asyncio.Task[None]] = []
+        self._executor: ProcessPoolExecutor | None = None
+        self._on_finished: Callable[[int, str], None] | None = None
+
+    def start(self, on_finished: Callable[[int, str], None] | None = None) -> None:
+        if self.workers <= 0 or self._loop is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._on_finished = on_finished
+        if self.mode == "process":
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker_process)
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._poll()))
+
+    def submit(self, job_id: int) -> None:
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._enqueue, job_id)
+
+    def _enqueue(self, job_id: int) -> None:
+        if self._queue is not None and job_id not in self._queued:
+            self._queued.add(job_id)
+            self._queue.put_nowait(job_id)
+
+    async def _poll(self) -> None:
+        while True:
+            try:
+                for job_id in await asyncio.to_thread(claimable_jobs):
+                    self._enqueue(job_id)
+            except Exception:
+                logger.exception("Polling for jobs failed")
+            await asyncio.sleep(self.poll_interval)
+
+    async def _work(self) -> None:
+        assert self._queue is not None and self._loop is not None
+        while True:
+            job_id = await self._queue.get()
+            try:
+                if self._executor is not None:
+                    finished = await self._loop.run_in_executor(self._executor, execute_job, job_id)
+                else:
+                    finished = await asyncio.to_thread(execute_job, job_id)
+                if finished is not None and self._on_finished is not None:
+                    self._on_finished(*finished)
+            except Exception:
+                logger.exception("Job %s crashed its worker", job_id)
+            finally:
+                self._queued.discard(job_id)
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+        self._loop = self._queue = None
+        self._queued.clear()
+
+
+job_runner = JobRunner(settings.job_workers, settings.job_mode, settings.job_poll_interval_seconds)
+
+
+@register("import_transactions")
+def _import_transactions(db: Session, context: JobContext) -> dict[str, Any]:
+    payload = context.payload
+    content = payload["content"]
+    if payload["format"] == "csv":
+        rows = iter_csv_rows(io.BytesIO(content.encode()))
+    elif payload["format"] == "ofx":
+        rows = iter_ofx_rows(io.BytesIO(content.encode()))
+    else:
+        rows = content
+
+    # The checkpoint is written to the job row in the same transaction as each
+    # commit of the import, and a retry (or a stale job reclaimed by another
+    # worker) carries on from it. Writing it also checks the claim, so an
+    # attempt that was reclaimed meanwhile rolls back instead of committing.
+    job = db.get(Job, context.job_id)
+    saved = (job.result or {}).get("checkpoint") if job is not None else None
+    resume = None
+    if saved is not None:
+        resume = ImportCheckpoint(
+            saved["rows"], saved["inserted"], [BulkRowError.model_validate(error) for error in saved["errors"]]
+        )
+
+    def save_checkpoint(checkpoint: ImportCheckpoint) -> None:
+        written = db.execute(
+            update(Job)
+            .where(holds_claim(context.job_id, context.attempt))
+            .values(
+                result={
+                    "checkpoint": {
+                        "rows": checkpoint.rows,
+                        "inserted": checkpoint.inserted,
+                        "errors": [error.model_dump() for error in checkpoint.errors],
+                    }
+                }
+            )
+        )
+        if written.rowcount != 1:
+            raise JobReclaimed()
+
+    # An atomic import keeps one transaction open throughout, so its heartbeat
+    # comes from uncommitted batches. As for rebuild_rollups, SQLite's single
+    # writer rules that out, and rules out the stale-job reclaim along with it.
+    atomic = payload.get("atomic", False)
+    on_batch = context.report if not atomic or db.get_bind().dialect.name != "sqlite" else None
+    report = import_transactions(
+        db,
+        context.user_id,
+        rows,
+        atomic,
+        payload.get("default_category_ids"),
+        on_batch=on_batch,
+        resume=resume,
+        on_checkpoint=save_checkpoint,
+    )
+    context.progress = report.inserted
+    return report.model_dump()
+
+
+@register("rebuild_rollups")
+def _rebuild_rollups(db: Session, context: JobContext) -> dict[str, Any]:
+    # Progress doubles as the heartbeat while the rebuild's transaction is open.
+    # SQLite has a single writer: nothing else can write then, the stale-job
+    # reclaim included, so there it only reports once the rebuild commits.
+    on_progress = context.report if db.get_bind().dialect.name != "sqlite" else None
+    rows = rebuild_monthly_summaries(db, context.user_id, on_progress=on_progress)
+    db.commit()
+    context.report(rows)
+    return {"rows": rows, "mismatches": len(verify_monthly_summaries(db, context.user_id))}
+
+
+@register("export_transactions")
+def _export_transactions(db: Session, context: JobContext) -> dict[str, Any]:
+    export_format = context.payload["format"]
+    filters = context.payload["filters"]
+    conditions = transaction_filters(
+        context.user_id,
+        dt.date.fromisoformat(filters["start_date"]) if filters["start_date"] else None,
+        dt.date.fromisoformat(filters["end_date"]) if filters["end_date"] else None,
+        filters["category_id"],
+        filters["type"],
+        search_terms(filters["q"]) if filters.get("q") else None,
+    )
+
+    directory = Path(settings.export_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{context.job_id}.{export_format}"
+    with path.open("wb") as stream:
+        rows = write_export(db, export_format, conditions, stream, on_progress=context.report)
+    context.progress = rows
+    return {"file": path.name, "format": export_format, "rows": rows, "size": path.stat().st_size}
+
+
+@register("apply_rules")
+def _apply_rules(db: Session, context: JobContext) -> dict[str, Any]:
+    request = RuleApplyRequest.model_validate(context.payload)
+    conditions = selection_filters(context.user_id, request.ids, request.filter)
+    affected, goals_changed = apply_rules(db, context.user_id, conditions, on_progress=context.report)
+    db.commit()
+    return {"affected": affected, "goals_changed": goals_changed}
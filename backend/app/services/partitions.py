@@ -0,0 +1,328 @@
+import csv
+import datetime as dt
+import gzip
+import io
+import os
+import re
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from sqlalchemy import DefaultClause, MetaData, PrimaryKeyConstraint, Table, column, select, table, text
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from app.db.base import Base
+from app.models import ArchivedPartition, Transaction
+
+# PostgreSQL only: transactions become a table partitioned by RANGE (date),
+# one partition per month or year plus a default partition for dates outside
+# them. The primary key becomes (id, date), as a partitioned table's unique
+# indexes must include the partition key; ids still come from the same sequence.
+PARTITION_PREFIX = "transactions_part_"
+DEFAULT_PARTITION = f"{PARTITION_PREFIX}default"
+STAGING_TABLE = "transactions_next"
+RETIRED_TABLE = "transactions_unpartitioned"
+SYNC_TRIGGER = "transactions_sync_next"
+INTERVALS = ("month", "year")
+COPY_BATCH_SIZE = 10_000
+ARCHIVE_FETCH_SIZE = 5000
+
+_COLUMNS = tuple(column.name for column in Transaction.__table__.columns)
+_COLUMN_LIST = ", ".join(_COLUMNS)
+_RANGE_BOUND = re.compile(r"FROM \('([\d-]+)'\) TO \('([\d-]+)'\)")
+
+
+@dataclass(frozen=True)
+class Partition:
+    name: str
+    start: dt.date
+    end: dt.date
+
+
+def period_start(day: dt.date, interval: str) -> dt.date:
+    return day.replace(month=1, day=1) if interval == "year" else day.replace(day=1)
+
+
+def next_period(start: dt.date, interval: str) -> dt.date:
+    if interval == "year":
+        return start.replace(year=start.year + 1)
+    year, month = divmod(start.month, 12)
+    return dt.date(start.year + year, month + 1, 1)
+
+
+def partition_horizon(interval: str, ahead: int, today: dt.date | None = None) -> dt.date:
+    # The start of the period `ahead` periods after the current one.
+    horizon = period_start(today or dt.date.today(), interval)
+    for _ in range(ahead):
+        horizon = next_period(horizon, interval)
+    return horizon
+
+
+def partition_name(start: dt.date, interval: str) -> str:
+    return f"{PARTITION_PREFIX}{start:%Y}" if interval == "year" else f"{PARTITION_PREFIX}{start:%Y_%m}"
+
+
+def is_partitioned(db: Session, name: str = "transactions") -> bool:
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    return db.scalar(text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:name)"), {"name": name}) == "p"
+
+
+def list_partitions(db: Session, parent: str = "transactions") -> tuple[list[Partition], str | None]:
+    # The ranged partitions in date order, and the default partition if any.
+    partitions: list[Partition] = []
+    default: str | None = None
+    for name, bound in db.execute(
+        text(
+            "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid WHERE i.inhparent = to_regclass(:parent)"
+        ),
+        {"parent": parent},
+    ):
+        match = _RANGE_BOUND.search(bound)
+        if match is None:
+            default = name
+        else:
+            start, end = (dt.date.fromisoformat(value) for value in match.groups())
+            partitions.append(Partition(name, start, end))
+    return sorted(partitions, key=lambda partition: partition.start), default
+
+
+def partition_interval(partitions: list[Partition]) -> str | None:
+    if not partitions:
+        return None
+    return "year" if (partitions[0].end - partitions[0].start).days > 31 else "month"
+
+
+def _attach_partition(db: Session, parent: str, start: dt.date, interval: str, default: str | None) -> str:
+    # CREATE TABLE ... PARTITION OF would lock the whole table; a standalone
+    # table attached afterwards only takes SHARE UPDATE EXCLUSIVE on it, so
+    # reads and writes carry on. Rows that landed in the default partition
+    # for this range move over first, or the attach would be refused.
+    name = partition_name(start, interval)
+    end = next_period(start, interval)
+    db.execute(text(f"CREATE TABLE {name} (LIKE {parent} INCLUDING DEFAULTS)"))
+    if default is not None:
+        db.execute(
+            text(
+                f"WITH moved AS (DELETE FROM {default} WHERE date >= :start AND date < :end "
+                f"RETURNING {_COLUMN_LIST}) INSERT INTO {name} ({_COLUMN_LIST}) SELECT {_COLUMN_LIST} FROM moved"
+            ),
+            {"start": start, "end": end},
+        )
+    db.execute(text(f"ALTER TABLE {parent} ATTACH PARTITION {name} FOR VALUES FROM ('{start}') TO ('{end}')"))
+    return name
+
+
+def create_partitions(db: Session, ahead: int, interval: str = "month", parent: str = "transactions") -> list[str]:
+    # Extends the ranged partitions past the newest one through `ahead` periods
+    # after the current one, each in its own transaction. The interval of the
+    # existing partitions wins over the one given.
+    partitions, default = list_partitions(db, parent)
+    interval = partition_interval(partitions) or interval
+    through = partition_horizon(interval, ahead)
+    start = partitions[-1].end if partitions else period_start(dt.date.today(), interval)
+
+    created: list[str] = []
+    while start <= through:
+        created.append(_attach_partition(db, parent, start, interval, default))
+        db.commit()
+        start = next_period(start, interval)
+    return created
+
+
+def _staging_table(sequence: str) -> Table:
+    metadata = MetaData()
+    for source in Base.metadata.sorted_tables:
+        if source is not Transaction.__table__:
+            source.to_metadata(metadata)
+    staging = Transaction.__table__.to_metadata(metadata, name=STAGING_TABLE)
+    staging.dialect_options["postgresql"]["partition_by"] = "RANGE (date)"
+    staging.c.id.autoincrement = False
+    staging.c.id.server_default = DefaultClause(text(f"nextval('{sequence}'::regclass)"))
+    staging.c.date.primary_key = True
+    staging.append_constraint(PrimaryKeyConstraint("id", "date", name="transactions_pkey_next"))
+    # Built under temporary names, renamed when the tables are swapped.
+    for index in staging.indexes:
+        index.name = f"{index.name.replace(STAGING_TABLE, 'transactions')}_next"
+    return staging
+
+
+def _create_staging(db: Session, sequence: str, interval: str, first: dt.date, through: dt.date) -> None:
+    staging = _staging_table(sequence)
+    db.execute(CreateTable(staging))
+    for index in staging.indexes:
+        db.execute(CreateIndex(index))
+    db.execute(text(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {STAGING_TABLE} DEFAULT"))
+    start = period_start(first, interval)
+    while start <= through:
+        _attach_partition(db, STAGING_TABLE, start, interval, DEFAULT_PARTITION)
+        start = next_period(start, interval)
+    db.commit()
+
+
+def _install_sync_trigger(db: Session) -> None:
+    # From here on every write to the old table is replayed on the new one, so
+    # the batch copy below only has to cover the rows that existed before.
+    values = ", ".join(f"NEW.{name}" for name in _COLUMNS)
+    db.execute(
+        text(
+            f"CREATE OR REPLACE FUNCTION {SYNC_TRIGGER}() RETURNS trigger LANGUAGE plpgsql AS $$\n"
+            "BEGIN\n"
+            "  IF TG_OP IN ('UPDATE', 'DELETE') THEN\n"
+            f"    DELETE FROM {STAGING_TABLE} WHERE id = OLD.id;\n"
+            "  END IF;\n"
+            "  IF TG_OP IN ('INSERT', 'UPDATE') THEN\n"
+            f"    INSERT INTO {STAGING_TABLE} ({_COLUMN_LIST}) VALUES ({values}) ON CONFLICT DO NOTHING;\n"
+            "  END IF;\n"
+            "  RETURN NULL;\n"
+            "END $$"
+        )
+    )
+    db.execute(text(f"DROP TRIGGER IF EXISTS {SYNC_TRIGGER} ON transactions"))
+    db.execute(
+        text(
+            f"CREATE TRIGGER {SYNC_TRIGGER} AFTER INSERT OR UPDATE OR DELETE ON transactions "
+            f"FOR EACH ROW EXECUTE FUNCTION {SYNC_TRIGGER}()"
+        )
+    )
+    db.commit()
+
+
+def _copy_rows(db: Session, batch_size: int, on_progress: Callable[[int], None] | None) -> int:
+    # Keyset batches, one transaction each. FOR SHARE holds off updates to the
+    # batch's rows until it commits, so the trigger can never replay a change
+    # that the copy then overwrites with the older version.
+    last_id = db.scalar(text("SELECT max(id) FROM transactions")) or 0
+    db.commit()
+    copied = 0
+    after = 0
+    while after < last_id:
+        batch_last, batch_rows = db.execute(
+            text(
+                f"WITH batch AS (SELECT {_COLUMN_LIST} FROM transactions WHERE id > :after AND id <= :last "
+                "ORDER BY id LIMIT :size FOR SHARE), "
+                f"copied AS (INSERT INTO {STAGING_TABLE} ({_COLUMN_LIST}) SELECT {_COLUMN_LIST} FROM batch "
+                "ON CONFLICT DO NOTHING) "
+                "SELECT max(id), count(*) FROM batch"
+            ),
+            {"after": after, "last": last_id, "size": batch_size},
+        ).one()
+        db.commit()
+        if batch_last is None:
+            break
+        after = batch_last
+        copied += batch_rows
+        if on_progress is not None:
+            on_progress(copied)
+    return copied
+
+
+def _index_names(db: Session, table_name: str) -> list[str]:
+    return list(
+        db.scalars(
+            text("SELECT indexname FROM pg_indexes WHERE schemaname = current_schema() AND tablename = :name"),
+            {"name": table_name},
+        )
+    )
+
+
+def _swap_tables(db: Session, sequence: str) -> None:
+    # The only step that blocks the application, for as long as a handful of
+    # catalog updates take. The old table is kept, without its foreign keys,
+    # as transactions_unpartitioned until it is dropped by hand.
+    db.execute(text("LOCK TABLE transactions IN ACCESS EXCLUSIVE MODE"))
+    db.execute(text(f"DROP TRIGGER {SYNC_TRIGGER} ON transactions"))
+    db.execute(text(f"DROP FUNCTION {SYNC_TRIGGER}()"))
+    for name in db.scalars(
+        text("SELECT conname FROM pg_constraint WHERE conrelid = 'transactions'::regclass AND contype = 'f'")
+    ).all():
+        db.execute(text(f'ALTER TABLE transactions DROP CONSTRAINT "{name}"'))
+    old_indexes = _index_names(db, "transactions")
+    db.execute(text(f"ALTER TABLE transactions RENAME TO {RETIRED_TABLE}"))
+    for name in old_indexes:
+        db.execute(text(f'ALTER INDEX "{name}" RENAME TO "{name}_unpartitioned"'))
+    db.execute(text(f"ALTER TABLE {STAGING_TABLE} RENAME TO transactions"))
+    for name in _index_names(db, "transactions"):
+        if name.endswith("_next"):
+            db.execute(text(f'ALTER INDEX "{name}" RENAME TO "{name.removesuffix("_next")}"'))
+    db.execute(text(f"ALTER SEQUENCE {sequence} OWNED BY transactions.id"))
+    db.commit()
+
+
+def partition_transactions(
+    db: Session,
+    interval: str,
+    ahead: int,
+    since: dt.date | None = None,
+    batch_size: int = COPY_BATCH_SIZE,
+    on_progress: Callable[[int], None] | None = None,
+) -> int:
+    # Online migration of an unpartitioned table: build the partitioned copy,
+    # mirror writes into it with a trigger, backfill it in batches, then swap
+    # the names. Running it again after a failure resumes where it stopped.
+    if db.get_bind().dialect.name != "postgresql":
+        raise ValueError("partitioning requires PostgreSQL")
+    if interval not in INTERVALS:
+        raise ValueError(f"interval must be one of {', '.join(INTERVALS)}")
+    if is_partitioned(db):
+        raise ValueError("transactions is already partitioned")
+
+    sequence = db.scalar(text("SELECT pg_get_serial_sequence('transactions', 'id')"))
+    if sequence is None:
+        raise ValueError("transactions.id is not backed by a sequence")
+    if db.scalar(text("SELECT to_regclass(:name)"), {"name": STAGING_TABLE}) is None:
+        first = since or db.scalar(text("SELECT min(date) FROM transactions")) or dt.date.today()
+        _create_staging(db, sequence, interval, first, partition_horizon(interval, ahead))
+
+    _install_sync_trigger(db)
+    copied = _copy_rows(db, batch_size, on_progress)
+    _swap_tables(db, sequence)
+    return copied
+
+
+def _write_archive(db: Session, partition: Partition, path: Path) -> int:
+    # Gzipped CSV in PostgreSQL's COPY dialect: strings are quoted, so an
+    # unquoted empty field is a NULL and "" an empty description.
+    source = table(partition.name, *(column(name) for name in _COLUMNS))
+    result = db.execute(select(source).execution_options(yield_per=ARCHIVE_FETCH_SIZE))
+    partial = path.with_name(f"{path.name}.partial")
+    rows = 0
+    with open(partial, "wb") as raw:
+        with io.TextIOWrapper(gzip.GzipFile(fileobj=raw, mode="wb"), encoding="utf-8", newline="") as stream:
+            writer = csv.writer(stream, quoting=csv.QUOTE_NONNUMERIC)
+            writer.writerow(_COLUMNS)
+            for batch in result.partitions():
+                writer.writerows(batch)
+                rows += len(batch)
+        raw.flush()
+        os.fsync(raw.fileno())
+    os.replace(partial, path)
+    return rows
+
+
+def archive_partitions(db: Session, before: dt.date, archive_dir: Path) -> list[tuple[str, Path, int]]:
+    # Each partition wholly before `before` is written out, then detached and
+    # dropped in the same transaction; the SHARE lock keeps its rows from
+    # changing in between. The monthly rollups keep the archived months, and
+    # the archived_partitions row keeps rollup rebuilds off them.
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    archived: list[tuple[str, Path, int]] = []
+    partitions, _ = list_partitions(db)
+    for partition in partitions:
+        if partition.end > before:
+            continue
+        path = archive_dir / f"{partition.name}.csv.gz"
+        db.execute(text(f"LOCK TABLE {partition.name} IN SHARE MODE"))
+        rows = _write_archive(db, partition, path)
+        db.execute(text(f"ALTER TABLE transactions DETACH PARTITION {partition.name}"))
+        db.execute(text(f"DROP TABLE {partition.name}"))
+        db.add(
+            ArchivedPartition(
+                name=partition.name, start_date=partition.start, end_date=partition.end, path=str(path), rows=rows
+            )
+        )
+        db.commit()
+        archived.append((partition.name, path, rows))
+    return archived
@@ -0,0 +1,227 @@
+import asyncio
+import calendar
+import datetime as dt
+import logging
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Any
+
+from sqlalchemy import Row, insert, or_, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+from app.models import RecurringTransaction, Transaction
+from app.services import goals as goal_progress
+from app.services import rollups
+
+logger = logging.getLogger(__name__)
+
+RULE_BATCH_SIZE = 500
+INSERT_BATCH_SIZE = 1000
+
+_STEP_DAYS = {"daily": 1, "weekly": 7}
+_STEP_MONTHS = {"monthly": 1, "yearly": 12}
+_CONFLICT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+_TRANSACTIONS = Transaction.__table__
+
+_POSTED_COLUMNS = (
+    Transaction.user_id,
+    Transaction.category_id,
+    Transaction.goal_id,
+    Transaction.type,
+    Transaction.currency,
+    Transaction.date,
+    Transaction.amount,
+)
+
+
+def _add_months(start: dt.date, months: int) -> dt.date:
+    year, month = divmod(start.month - 1 + months, 12)
+    year += start.year
+    return dt.date(year, month + 1, min(start.day, calendar.monthrange(year, month + 1)[1]))
+
+
+def occurrence(start: dt.date, frequency: str, interval: int, index: int) -> dt.date:
+    # Always measured from the start date, so a rule on the 31st lands on the
+    # last day of short months without drifting to the 28th afterwards.
+    if frequency in _STEP_DAYS:
+        return start + dt.timedelta(days=_STEP_DAYS[frequency] * interval * index)
+    return _add_months(start, _STEP_MONTHS[frequency] * interval * index)
+
+
+def occurrence_index(start: dt.date, frequency: str, interval: int, on_or_after: dt.date) -> int:
+    if on_or_after <= start:
+        return 0
+    if frequency in _STEP_DAYS:
+        step = _STEP_DAYS[frequency] * interval
+        return -(-(on_or_after - start).days // step)
+    step = _STEP_MONTHS[frequency] * interval
+    index = ((on_or_after.year - start.year) * 12 + on_or_after.month - start.month) // step
+    while occurrence(start, frequency, interval, index) < on_or_after:
+        index += 1
+    return index
+
+
+def first_occurrence_on_or_after(start: dt.date, frequency: str, interval: int, day: dt.date) -> dt.date:
+    return occurrence(start, frequency, interval, occurrence_index(start, frequency, interval, day))
+
+
+@dataclass
+class PostingReport:
+    posted: int = 0
+    goal_users: set[int] = field(default_factory=set)
+
+
+def _due_rules(db: Session, through: dt.date, after_id: int) -> Sequence[Row[Any]]:
+    return db.execute(
+        select(
+            RecurringTransaction.id,
+            RecurringTransaction.user_id,
+            RecurringTransaction.category_id,
+            RecurringTransaction.goal_id,
+            RecurringTransaction.amount,
+            RecurringTransaction.currency,
+            RecurringTransaction.type,
+            RecurringTransaction.description,
+            RecurringTransaction.frequency,
+            RecurringTransaction.interval,
+            RecurringTransaction.start_date,
+            RecurringTransaction.end_date,
+            RecurringTransaction.next_occurrence,
+        )
+        .where(
+            RecurringTransaction.active.is_(True),
+            RecurringTransaction.next_occurrence <= through,
+            or_(
+                RecurringTransaction.end_date.is_(None),
+                RecurringTransaction.next_occurrence <= RecurringTransaction.end_date,
+            ),
+            RecurringTransaction.id > after_id,
+        )
+        .order_by(RecurringTransaction.id)
+        .limit(RULE_BATCH_SIZE)
+    ).all()
+
+
+def _insert_occurrences(db: Session, rows: list[dict[str, Any]]) -> Sequence[Sequence[Any]]:
+    # One executemany INSERT (batched into multi-row VALUES by the driver
+    # layer); occurrences another tick already posted are dropped by the unique
+    # (recurring_id, occurrence_date, date) index, and only the rows actually
+    # written come back for the rollup and goal bookkeeping.
+    dialect_insert = _CONFLICT_INSERTS.get(db.get_bind().dialect.name)
+    if dialect_insert is not None:
+        stmt = (
+            dialect_insert(_TRANSACTIONS)
+            .on_conflict_do_nothing(index_elements=["recurring_id", "occurrence_date", "date"])
+            .returning(*(_TRANSACTIONS.c[column.key] for column in _POSTED_COLUMNS))
+        )
+        return db.execute(stmt, rows).all()
+
+    posted = set(
+        db.execute(
+            select(Transaction.recurring_id, Transaction.occurrence_date).where(
+                tuple_(Transaction.recurring_id, Transaction.occurrence_date).in_(
+                    [(row["recurring_id"], row["occurrence_date"]) for row in rows]
+                )
+            )
+        ).all()
+    )
+    fresh = [row for row in rows if (row["recurring_id"], row["occurrence_date"]) not in posted]
+    if fresh:
+        db.execute(insert(_TRANSACTIONS), fresh)
+    return [tuple(row[column.key] for column in _POSTED_COLUMNS) for row in fresh]
+
+
+def _book(db: Session, posted: Sequence[Sequence[Any]], report: PostingReport) -> None:
+    totals: dict[rollups.BucketKey, tuple[Decimal, int]] = {}
+    contributions: dict[tuple[int, int, int | None, str], Decimal] = {}
+    for user_id, category_id, goal_id, transaction_type, currency, date, amount in posted:
+        amount = Decimal(str(amount))
+        key = (user_id, date.strftime("%Y-%m"), category_id, transaction_type, currency)
+        bucket_amount, count = totals.get(key, (Decimal(0), 0))
+        totals[key] = (bucket_amount + amount, count + 1)
+        link = (user_id, category_id, goal_id, currency)
+        contributions[link] = contributions.get(link, Decimal(0)) + amount
+
+    rollups.apply_totals(db, totals)
+    if contributions:
+        report.goal_users |= goal_progress.apply_contributions_for_users(db, contributions)
+    report.posted += len(posted)
+
+
+def post_due_occurrences(db: Session, through: dt.date) -> PostingReport:
+    # Works through due rules of every user in keyset pages. Each page's
+    # occurrences, including any backlog since next_occurrence, go out in
+    # INSERT_BATCH_SIZE chunks, and the rules advance in one bulk UPDATE.
+    report = PostingReport()
+    after_id = 0
+    while rules := _due_rules(db, through, after_id):
+        after_id = rules[-1].id
+        rows: list[dict[str, Any]] = []
+        advances: list[dict[str, Any]] = []
+        for rule in rules:
+            last_day = min(through, rule.end_date) if rule.end_date is not None else through
+            index = occurrence_index(rule.start_date, rule.frequency, rule.interval, rule.next_occurrence)
+            day = occurrence(rule.start_date, rule.frequency, rule.interval, index)
+            while day <= last_day:
+                rows.append(
+                    {
+                        "user_id": rule.user_id,
+                        "category_id": rule.category_id,
+                        "goal_id": rule.goal_id,
+                        "amount": rule.amount,
+                        "currency": rule.currency,
+                        "type": rule.type,
+                        "date": day,
+                        "description": rule.description,
+                        "recurring_id": rule.id,
+                        "occurrence_date": day,
+                    }
+                )
+                index += 1
+                day = occurrence(rule.start_date, rule.frequency, rule.interval, index)
+            advances.append({"id": rule.id, "next_occurrence": day})
+
+        posted: list[Sequence[Any]] = []
+        for start in range(0, len(rows), INSERT_BATCH_SIZE):
+            posted.extend(_insert_occurrences(db, rows[start : start + INSERT_BATCH_SIZE]))
+        _book(db, posted, report)
+        db.execute(update(RecurringTransaction), advances)
+        db.commit()
+    return report
+
+
+def run_tick(through: dt.date | None = None) -> PostingReport:
+    with SessionLocal() as db:
+        return post_due_occurrences(db, through or dt.date.today())
+
+
+class RecurringScheduler:
+    # Every web worker may run one; the unique occurrence index makes
+    # overlapping ticks harmless.
+    def __init__(self, interval_seconds: int) -> None:
+        self.interval_seconds = interval_seconds
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self, on_posted: Callable[[PostingReport], None] | None = None) -> None:
+        if self.interval_seconds > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run(on_posted))
+
+    async def _run(self, on_posted: Callable[[PostingReport], None] | None) -> None:
+        while True:
+            try:
+                report = await asyncio.to_thread(run_tick)
+                if report.posted and on_posted is not None:
+                    on_posted(report)
+            except Exception:
+                logger.exception("Posting recurring transactions failed")
+            await asyncio.sleep(self.interval_seconds)
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
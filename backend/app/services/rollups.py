@@ -0,0 +1,220 @@
+import datetime as dt
+from collections.abc import Callable
+from decimal import Decimal
+from typing import Any
+
+from sqlalchemy import ColumnElement, and_, delete, func, insert, not_, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.db.functions import money_sum, month_of
+from app.models import ArchivedPartition, MonthlySummary, Transaction
+
+BucketKey = tuple[int, str, int, str, str]
+
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def _added_total(stmt: Any) -> ColumnElement[Decimal]:
+    # Rounding back to cents after every addition keeps SQLite's REAL totals on
+    # the exact two-place value instead of drifting; on numeric it is a no-op.
+    return func.round(MonthlySummary.total + stmt.excluded.total, 2)
+
+
+def _adjust_bucket(db: Session, key: BucketKey, amount: Decimal, count: int) -> None:
+    user_id, month, category_id, transaction_type, currency = key
+    dialect_insert = _UPSERT_INSERTS.get(db.get_bind().dialect.name)
+
+    if dialect_insert is not None:
+        stmt = dialect_insert(MonthlySummary).values(
+            user_id=user_id,
+            month=month,
+            category_id=category_id,
+            type=transaction_type,
+            currency=currency,
+            total=amount,
+            count=count,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "month", "category_id", "type", "currency"],
+            set_={
+                "total": _added_total(stmt),
+                "count": MonthlySummary.count + stmt.excluded.count,
+            },
+        )
+        db.execute(stmt)
+    else:
+        summary = db.get(MonthlySummary, key)
+        if summary is None:
+            db.add(
+                MonthlySummary(
+                    user_id=user_id,
+                    month=month,
+                    category_id=category_id,
+                    type=transaction_type,
+                    currency=currency,
+                    total=amount,
+                    count=count,
+                )
+            )
+        else:
+            summary.total = Decimal(summary.total) + amount
+            summary.count += count
+        db.flush()
+
+    if count < 0:
+        db.execute(
+            delete(MonthlySummary).where(
+                MonthlySummary.user_id == user_id,
+                MonthlySummary.month == month,
+                MonthlySummary.category_id == category_id,
+                MonthlySummary.type == transaction_type,
+                MonthlySummary.currency == currency,
+                MonthlySummary.count <= 0,
+            )
+        )
+
+
+def bucket_of(transaction: Transaction) -> BucketKey:
+    return (
+        transaction.user_id,
+        transaction.date.strftime("%Y-%m"),
+        transaction.category_id,
+        transaction.type,
+        transaction.currency,
+    )
+
+
+def credit(db: Session, key: BucketKey, amount: Decimal) -> None:
+    _adjust_bucket(db, key, amount, 1)
+
+
+def debit(db: Session, key: BucketKey, amount: Decimal) -> None:
+    _adjust_bucket(db, key, -amount, -1)
+
+
+def apply_totals(db: Session, totals: dict[BucketKey, tuple[Decimal, int]]) -> None:
+    # Pure additions (bulk imports, recurring postings) go out as one
+    # executemany upsert; anything that can empty a bucket takes the slow path.
+    dialect_insert = _UPSERT_INSERTS.get(db.get_bind().dialect.name)
+    if dialect_insert is None or any(count < 0 for _, count in totals.values()):
+        for key, (amount, count) in totals.items():
+            _adjust_bucket(db, key, amount, count)
+        return
+    if not totals:
+        return
+
+    stmt = dialect_insert(MonthlySummary)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id", "month", "category_id", "type", "currency"],
+        set_={
+            "total": _added_total(stmt),
+            "count": MonthlySummary.count + stmt.excluded.count,
+        },
+    )
+    db.execute(
+        stmt,
+        [
+            {
+                "user_id": user_id,
+                "month": month,
+                "category_id": category_id,
+                "type": kind,
+                "currency": currency,
+                "total": amount,
+                "count": count,
+            }
+            for (user_id, month, category_id, kind, currency), (amount, count) in totals.items()
+        ],
+    )
+
+
+ArchivedRange = tuple[dt.date, dt.date]
+
+
+def _archived_ranges(db: Session) -> list[ArchivedRange]:
+    # Archived partitions took their transactions with them, so their months'
+    # rollups can no longer be recomputed: rebuilds keep them as they are and
+    # verification skips them.
+    return [(start, end) for start, end in db.execute(select(ArchivedPartition.start_date, ArchivedPartition.end_date))]
+
+
+def _live_months(archived: list[ArchivedRange]) -> list[ColumnElement[bool]]:
+    return [
+        not_(and_(MonthlySummary.month >= f"{start:%Y-%m}", MonthlySummary.month < f"{end:%Y-%m}"))
+        for start, end in archived
+    ]
+
+
+def _aggregate_transactions(user_id: int | None, archived: list[ArchivedRange]):
+    month = month_of(Transaction.date)
+    query = select(
+        Transaction.user_id,
+        month,
+        Transaction.category_id,
+        Transaction.type,
+        Transaction.currency,
+        money_sum(Transaction.amount),
+        func.count(Transaction.id),
+    ).group_by(Transaction.user_id, month, Transaction.category_id, Transaction.type, Transaction.currency)
+    if user_id is not None:
+        query = query.where(Transaction.user_id == user_id)
+    for start, end in archived:
+        query = query.where(not_(and_(Transaction.date >= start, Transaction.date < end)))
+    return query
+
+
+def rebuild_monthly_summaries(
+    db: Session, user_id: int | None = None, on_progress: Callable[[int], None] | None = None
+) -> int:
+    archived = _archived_ranges(db)
+    purge = delete(MonthlySummary).where(*_live_months(archived))
+    if user_id is not None:
+        purge = purge.where(MonthlySummary.user_id == user_id)
+    db.execute(purge)
+
+    bounds = select(func.min(Transaction.date), func.max(Transaction.date))
+    if user_id is not None:
+        bounds = bounds.where(Transaction.user_id == user_id)
+    first, last = db.execute(bounds).one()
+    if first is None:
+        return 0
+
+    # One INSERT per year of transactions, so a long rebuild reports progress
+    # (and a job heartbeats) between statements. Buckets never span a year.
+    rows = 0
+    for year in range(first.year, last.year + 1):
+        result = db.execute(
+            insert(MonthlySummary).from_select(
+                ["user_id", "month", "category_id", "type", "currency", "total", "count"],
+                _aggregate_transactions(user_id, archived).where(
+                    Transaction.date >= dt.date(year, 1, 1), Transaction.date < dt.date(year + 1, 1, 1)
+                ),
+            )
+        )
+        rows += result.rowcount
+        if on_progress is not None:
+            on_progress(rows)
+    return rows
+
+
+def verify_monthly_summaries(db: Session, user_id: int | None = None) -> list[BucketKey]:
+    archived = _archived_ranges(db)
+    expected = {
+        tuple(row[:5]): (row[5], row[6])
+        for row in db.execute(_aggregate_transactions(user_id, archived))
+    }
+
+    query = select(MonthlySummary).where(*_live_months(archived))
+    if user_id is not None:
+        query = query.where(MonthlySummary.user_id == user_id)
+    actual = {
+        (summary.user_id, summary.month, summary.category_id, summary.type, summary.currency): (
+            summary.total,
+            summary.count,
+        )
+        for summary in db.scalars(query)
+        if summary.count
+    }
+
+    return sorted(key for key in expected.keys() | actual.keys() if expected.get(key) != actual.get(key))
@@ -0,0 +1,210 @@
+import logging
+import uuid
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any
+
+import ahocorasick
+from sqlalchemy import ColumnElement, select
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache, create_cache_backend
+from app.core.config import settings
+from app.models import Category, CategoryRule, Transaction
+from app.schemas.rule import check_rule_fields, compile_regex
+from app.services.transactions import batch_update
+
+logger = logging.getLogger(__name__)
+
+APPLY_BATCH_SIZE = 5000
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    category_id: int
+    type: str
+    amount_min: Decimal | None
+    amount_max: Decimal | None
+    regexes: tuple[Any, ...] = ()
+
+    def accepts(self, amount: Decimal, transaction_type: str) -> bool:
+        return (
+            self.type == transaction_type
+            and (self.amount_min is None or amount >= self.amount_min)
+            and (self.amount_max is None or amount <= self.amount_max)
+        )
+
+
+def _is_word_edge(text: str, index: int) -> bool:
+    return index < 0 or index >= len(text) or not text[index].isalnum()
+
+
+class RuleMatcher:
+    # Rules are kept in priority order and the first one that accepts a
+    # transaction wins. Every literal (contains and merchant patterns of all
+    # rules) goes into one Aho-Corasick automaton, so a description is scanned
+    # once whatever the number of rules. Only regex rules and pattern-less
+    # (amount-only) rules are evaluated one by one.
+    def __init__(self, rules: Sequence[CompiledRule], literals: Sequence[tuple[str, int, bool]]) -> None:
+        self.rules = list(rules)
+        self._automaton: Any = None
+        if literals:
+            self._automaton = ahocorasick.Automaton()
+            keyed: dict[str, list[tuple[int, bool]]] = {}
+            for literal, index, whole_word in literals:
+                keyed.setdefault(literal, []).append((index, whole_word))
+            for literal, owners in keyed.items():
+                self._automaton.add_word(literal, (len(literal), tuple(owners)))
+            self._automaton.make_automaton()
+        indexed = {index for _, index, _ in literals}
+        self._unindexed = [index for index, rule in enumerate(self.rules) if index not in indexed]
+
+    def __bool__(self) -> bool:
+        return bool(self.rules)
+
+    def _literal_hits(self, text: str) -> set[int]:
+        hits: set[int] = set()
+        if self._automaton is None:
+            return hits
+        for end, (length, owners) in self._automaton.iter(text):
+            for index, whole_word in owners:
+                if not whole_word or (_is_word_edge(text, end - length) and _is_word_edge(text, end + 1)):
+                    hits.add(index)
+        return hits
+
+    def match(self, description: str | None, amount: Any, transaction_type: str) -> int | None:
+        if not self.rules:
+            return None
+        text = (description or "").lower()
+        value = amount if isinstance(amount, Decimal) else Decimal(str(amount))
+        candidates = self._literal_hits(text)
+        candidates.update(self._unindexed)
+        for index in sorted(candidates):
+            rule = self.rules[index]
+            if not rule.accepts(value, transaction_type):
+                continue
+            if rule.regexes and not any(regex.search(description or "") for regex in rule.regexes):
+                continue
+            return rule.category_id
+        return None
+
+
+def compile_rules(rows: Sequence[Any]) -> RuleMatcher:
+    rules: list[CompiledRule] = []
+    literals: list[tuple[str, int, bool]] = []
+    for row in rows:
+        # Rules saved before the current checks may have nothing to match on or
+        # a pattern RE2 cannot run; they are left out rather than failing every write.
+        try:
+            check_rule_fields(row.match_type, row.patterns, row.amount_min, row.amount_max)
+        except ValueError as exc:
+            logger.warning("Skipping a categorization rule for category %s: %s", row.category_id, exc)
+            continue
+        index = len(rules)
+        regexes: tuple[Any, ...] = ()
+        if row.match_type == "regex":
+            regexes = tuple(compile_regex(pattern) for pattern in row.patterns)
+        else:
+            literals.extend((pattern.lower(), index, row.match_type == "merchant") for pattern in row.patterns)
+        rules.append(
+            CompiledRule(
+                category_id=row.category_id,
+                type=row.type,
+                amount_min=None if row.amount_min is None else Decimal(str(row.amount_min)),
+                amount_max=None if row.amount_max is None else Decimal(str(row.amount_max)),
+                regexes=regexes,
+            )
+        )
+    return RuleMatcher(rules, literals)
+
+
+matcher_cache: TTLCache[int, tuple[bytes, RuleMatcher]] = TTLCache(
+    settings.rule_matcher_cache_size, settings.rule_matcher_cache_ttl_seconds
+)
+
+# Per-user rules version, swapped by every write that can change a user's
+# matcher (their rules, or a category's type). It lives in the response cache
+# backend like the response cache's own version tokens, so one worker's write
+# reaches every worker's matcher_cache; a lost token just means a recompile.
+rule_versions = create_cache_backend(
+    settings.response_cache_url, settings.rule_matcher_cache_size, settings.response_cache_ttl_seconds
+)
+
+
+def _rules_version(user_id: int) -> bytes:
+    key = f"rules:{user_id}:version"
+    version = rule_versions.get(key)
+    if version is None:
+        version = uuid.uuid4().hex.encode()
+        rule_versions.set(key, version)
+    return version
+
+
+def invalidate_rules(user_id: int) -> None:
+    rule_versions.set(f"rules:{user_id}:version", uuid.uuid4().hex.encode())
+
+
+def load_matcher(db: Session, user_id: int) -> RuleMatcher:
+    # The version is read before the rules, so a write landing in between only
+    # costs a recompile on the next call, never a stale matcher.
+    version = _rules_version(user_id)
+    cached = matcher_cache.get(user_id)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    rows = db.execute(
+        select(
+            CategoryRule.category_id,
+            CategoryRule.match_type,
+            CategoryRule.patterns,
+            CategoryRule.amount_min,
+            CategoryRule.amount_max,
+            Category.type,
+        )
+        .join(Category, Category.id == CategoryRule.category_id)
+        .where(CategoryRule.user_id == user_id, CategoryRule.active.is_(True))
+        .order_by(CategoryRule.priority, CategoryRule.id)
+    ).all()
+    matcher = compile_rules(rows)
+    matcher_cache.set(user_id, (version, matcher))
+    return matcher
+
+
+def apply_rules(
+    db: Session,
+    user_id: int,
+    conditions: Sequence[ColumnElement[bool]],
+    on_progress: Callable[[int], None] | None = None,
+) -> tuple[int, bool]:
+    # Rows are matched in Python through a server-side cursor; the changes go
+    # back as one set-based batch update per target category and id chunk,
+    # which keeps rollups and goals in step like any other batch edit.
+    matcher = load_matcher(db, user_id)
+    if not matcher:
+        return 0, False
+
+    moves: dict[int, list[int]] = {}
+    scanned = 0
+    result = db.execute(
+        select(Transaction.id, Transaction.description, Transaction.amount, Transaction.type, Transaction.category_id)
+        .where(*conditions)
+        .execution_options(yield_per=APPLY_BATCH_SIZE)
+    )
+    for rows in result.partitions():
+        for transaction_id, description, amount, transaction_type, category_id in rows:
+            target = matcher.match(description, amount, transaction_type)
+            if target is not None and target != category_id:
+                moves.setdefault(target, []).append(transaction_id)
+        scanned += len(rows)
+        if on_progress is not None:
+            on_progress(scanned)
+
+    affected, goals_changed = 0, False
+    for category_id, ids in moves.items():
+        for start in range(0, len(ids), APPLY_BATCH_SIZE):
+            chunk = [Transaction.user_id == user_id, Transaction.id.in_(ids[start : start + APPLY_BATCH_SIZE])]
+            count, changed = batch_update(db, user_id, chunk, {"category_id": category_id})
+            affected += count
+            goals_changed = goals_changed or changed
+    return affected, goals_changed
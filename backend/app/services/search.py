@@ -0,0 +1,55 @@
+import re
+
+from sqlalchemy import ColumnElement, Select, column, func, literal, or_, select, table, text
+
+from app.db.session import engine
+from app.models import Transaction
+from app.models.transaction import description_document
+
+MAX_SEARCH_TERMS = 8
+
+_TERM = re.compile(r"[^\W_]+")
+_fts = table("transactions_fts", column("rowid"), column("rank"), column("transactions_fts"))
+
+
+def search_terms(q: str) -> list[str]:
+    # Only word characters survive, so terms can be spliced into the tsquery
+    # and FTS5 query syntax without escaping.
+    return _TERM.findall(q.lower())[:MAX_SEARCH_TERMS]
+
+
+def _tsquery(terms: list[str]) -> ColumnElement:
+    return func.to_tsquery(text("'simple'::regconfig"), " & ".join(f"{term}:*" for term in terms))
+
+
+def _fts_query(terms: list[str]) -> str:
+    return " AND ".join(f'"{term}"*' for term in terms)
+
+
+def search_condition(terms: list[str]) -> ColumnElement[bool]:
+    # Every term must match a word of the description, the last characters
+    # typed being a prefix. PostgreSQL also accepts fuzzy matches through
+    # trigram word similarity, so small typos still find the row.
+    if engine.dialect.name == "postgresql":
+        return or_(
+            description_document.op("@@")(_tsquery(terms)),
+            literal(" ".join(terms)).op("<%")(Transaction.description),
+        )
+    return Transaction.id.in_(select(_fts.c.rowid).where(_fts.c.transactions_fts.op("MATCH")(_fts_query(terms))))
+
+
+def ranked_search(query: Select, terms: list[str]) -> Select:
+    # Filters query to the matches and orders them best first. On SQLite the
+    # FTS5 table is joined rather than probed per row, so bm25 is computed in
+    # the same pass that finds the matches.
+    if engine.dialect.name == "postgresql":
+        rank = func.greatest(
+            func.ts_rank(description_document, _tsquery(terms)),
+            func.word_similarity(" ".join(terms), Transaction.description),
+        )
+        return query.where(search_condition(terms)).order_by(rank.desc())
+    return (
+        query.join(_fts, _fts.c.rowid == Transaction.id)
+        .where(_fts.c.transactions_fts.op("MATCH")(_fts_query(terms)))
+        .order_by(_fts.c.rank)
+    )
@@ -0,0 +1,162 @@
+import datetime as dt
+from collections.abc import Iterable, Sequence
+from decimal import Decimal
+from typing import Any, Literal
+
+from sqlalchemy import ColumnElement, delete, select, update
+from sqlalchemy.orm import Session
+
+from app.models import Transaction
+from app.services import goals as goal_progress
+from app.services import rollups
+from app.schemas.transaction import TransactionFilter
+from app.services.search import search_condition, search_terms
+
+# Changing any of these moves money between rollup buckets or goals.
+_BOOKED_FIELDS = {"amount", "currency", "category_id", "type", "date", "goal_id"}
+_BOOKED_COLUMNS = ("date", "category_id", "type", "currency", "goal_id", "amount")
+
+_TRANSACTIONS = Transaction.__table__
+
+
+def transaction_filters(
+    user_id: int,
+    start_date: dt.date | None = None,
+    end_date: dt.date | None = None,
+    category_id: int | None = None,
+    transaction_type: Literal["income", "expense"] | None = None,
+    terms: list[str] | None = None,
+) -> list[ColumnElement[bool]]:
+    conditions = [Transaction.user_id == user_id]
+
+    if start_date:
+        conditions.append(Transaction.date >= start_date)
+    if end_date:
+        conditions.append(Transaction.date <= end_date)
+    if category_id:
+        conditions.append(Transaction.category_id == category_id)
+    if transaction_type:
+        conditions.append(Transaction.type == transaction_type)
+    if terms:
+        conditions.append(search_condition(terms))
+    return conditions
+
+
+def selection_filters(
+    user_id: int, ids: list[int] | None = None, criteria: TransactionFilter | None = None
+) -> list[ColumnElement[bool]]:
+    if ids is not None:
+        return [Transaction.user_id == user_id, Transaction.id.in_(ids)]
+    if criteria is None:
+        return transaction_filters(user_id)
+    return transaction_filters(
+        user_id,
+        criteria.start_date,
+        criteria.end_date,
+        criteria.category_id,
+        criteria.entry_type,
+        search_terms(criteria.q) if criteria.q else None,
+    )
+
+
+class _Bookings:
+    def __init__(self) -> None:
+        self.buckets: dict[rollups.BucketKey, tuple[Decimal, int]] = {}
+        self.contributions: dict[goal_progress.ContributionKey, Decimal] = {}
+
+    def add(self, bucket: rollups.BucketKey, link: goal_progress.ContributionKey, amount: Decimal, count: int) -> None:
+        bucket_amount, bucket_count = self.buckets.get(bucket, (Decimal(0), 0))
+        self.buckets[bucket] = (bucket_amount + amount, bucket_count + count)
+        self.contributions[link] = self.contributions.get(link, Decimal(0)) + amount
+
+    def apply(self, db: Session, user_id: int) -> bool:
+        rollups.apply_totals(db, {key: value for key, value in self.buckets.items() if value != (0, 0)})
+        return goal_progress.apply_contributions(
+            db, user_id, {key: amount for key, amount in self.contributions.items() if amount}
+        )
+
+
+def _booked_columns(columns: Any) -> list[Any]:
+    return [columns[name] for name in _BOOKED_COLUMNS]
+
+
+def _book_rows(bookings: _Bookings, user_id: int, rows: Iterable[Sequence[Any]], sign: int) -> int:
+    count = 0
+    for date, category_id, transaction_type, currency, goal_id, amount in rows:
+        bookings.add(
+            (user_id, date.strftime("%Y-%m"), category_id, transaction_type, currency),
+            (category_id, goal_id, currency),
+            sign * amount,
+            sign,
+        )
+        count += 1
+    return count
+
+
+def batch_update(
+    db: Session, user_id: int, conditions: Sequence[ColumnElement[bool]], changes: dict[str, Any]
+) -> tuple[int, bool]:
+    # Rollups and goals move by the rows the UPDATE actually changed, read back
+    # with RETURNING, so a row a concurrent request inserts or edits in the
+    # meantime is never changed without being booked.
+    if not _BOOKED_FIELDS & changes.keys():
+        result = db.execute(
+            update(Transaction).where(*conditions).values(**changes).execution_options(synchronize_session=False)
+        )
+        return result.rowcount, False
+
+    bookings = _Bookings()
+    if db.get_bind().dialect.name == "postgresql":
+        # The selection is locked and read in a subquery of the UPDATE itself,
+        # so each row's old values come back next to its new ones.
+        previous = (
+            select(Transaction.id, *_booked_columns(_TRANSACTIONS.c))
+            .where(*conditions)
+            .with_for_update()
+            .subquery("previous")
+        )
+        rows = db.execute(
+            update(Transaction)
+            .where(Transaction.id == previous.c.id)
+            .values(**changes)
+            .returning(*_booked_columns(previous.c), *_booked_columns(_TRANSACTIONS.c))
+            .execution_options(synchronize_session=False)
+        ).all()
+        width = len(_BOOKED_COLUMNS)
+        _book_rows(bookings, user_id, (row[:width] for row in rows), -1)
+        affected = _book_rows(bookings, user_id, (row[width:] for row in rows), 1)
+    else:
+        # SQLite has no FOR UPDATE and its RETURNING cannot read a subquery. A
+        # no-op UPDATE takes the database write lock and reads the selection;
+        # no other writer can run before the commit, so the real UPDATE changes
+        # exactly those rows.
+        locked = db.execute(
+            update(Transaction)
+            .where(*conditions)
+            .values(type=Transaction.type)
+            .returning(*_booked_columns(_TRANSACTIONS.c))
+            .execution_options(synchronize_session=False)
+        )
+        _book_rows(bookings, user_id, locked, -1)
+        changed = db.execute(
+            update(Transaction)
+            .where(*conditions)
+            .values(**changes)
+            .returning(*_booked_columns(_TRANSACTIONS.c))
+            .execution_options(synchronize_session=False)
+        )
+        affected = _book_rows(bookings, user_id, changed, 1)
+    return affected, bookings.apply(db, user_id)
+
+
+def batch_delete(db: Session, user_id: int, conditions: Sequence[ColumnElement[bool]]) -> tuple[int, bool]:
+    # Booked from the rows the DELETE returns, for the same reason as batch_update.
+    bookings = _Bookings()
+    deleted = db.execute(
+        delete(Transaction)
+        .where(*conditions)
+        .returning(*_booked_columns(_TRANSACTIONS.c))
+        .execution_options(synchronize_session=False)
+    )
+    affected = _book_rows(bookings, user_id, deleted, -1)
+    return affected, bookings.apply(db, user_id)
@@ -0,0 +1,100 @@
+from typing import Any
+
+import pytest
+from fastapi.security import HTTPAuthorizationCredentials
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.api.deps import Principal, get_current_principal, user_cache
+from app.api.transactions import _ensure_category, encode_rows, list_query, list_transactions
+from app.models import Category, Transaction
+from app.schemas.transaction import TransactionResponse
+
+PAGE_SIZE = 50
+SERIALIZED_ROWS = 1000
+
+_list_defaults: dict[str, Any] = {
+    "start_date": None,
+    "end_date": None,
+    "category_id": None,
+    "type": None,
+    "limit": PAGE_SIZE,
+    "cursor": None,
+    "q": None,
+    "sort": "date",
+    "stream": False,
+}
+
+
+def _list(db: Session, principal: Principal, **params: Any) -> bytes:
+    return list_transactions(**{**_list_defaults, **params}, db=db, current_user=principal).body
+
+
+def _groceries(db: Session, principal: Principal) -> Category:
+    return db.scalars(select(Category).where(Category.user_id == principal.id, Category.name == "Groceries")).one()
+
+
+@pytest.mark.benchmark(group="list_transactions")
+def bench_list_transactions_first_page(benchmark: Any, db: Session, principal: Principal) -> None:
+    assert benchmark(_list, db, principal)
+
+
+@pytest.mark.benchmark(group="list_transactions")
+def bench_list_transactions_category_filter(benchmark: Any, db: Session, principal: Principal) -> None:
+    category_id = _groceries(db, principal).id
+    assert benchmark(_list, db, principal, category_id=category_id, type="expense")
+
+
+@pytest.mark.benchmark(group="list_transactions")
+def bench_list_transactions_search(benchmark: Any, db: Session, principal: Principal) -> None:
+    assert benchmark(_list, db, principal, q="starbuck")
+
+
+@pytest.mark.benchmark(group="auth")
+def bench_get_current_principal_cached(benchmark: Any, db: Session, access_token: str) -> None:
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=access_token)
+    get_current_principal(credentials, db)
+    benchmark(get_current_principal, credentials, db)
+
+
+@pytest.mark.benchmark(group="auth")
+def bench_get_current_principal_uncached(benchmark: Any, db: Session, access_token: str) -> None:
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=access_token)
+
+    def cold() -> Principal:
+        user_cache.clear()
+        return get_current_principal(credentials, db)
+
+    benchmark(cold)
+
+
+@pytest.mark.benchmark(group="validation")
+def bench_ensure_category(benchmark: Any, db: Session, principal: Principal) -> None:
+    category_id = _groceries(db, principal).id
+
+    def check() -> None:
+        db.expunge_all()
+        _ensure_category(db, principal.id, category_id, "expense")
+
+    benchmark(check)
+
+
+@pytest.mark.benchmark(group="serialization")
+def bench_serialize_rows_orjson(benchmark: Any, db: Session, principal: Principal) -> None:
+    rows = db.execute(list_query(principal.id).limit(SERIALIZED_ROWS)).all()
+    benchmark(encode_rows, rows)
+
+
+@pytest.mark.benchmark(group="serialization")
+def bench_serialize_models_pydantic(benchmark: Any, db: Session, principal: Principal) -> None:
+    transactions = list(
+        db.scalars(
+            select(Transaction)
+            .where(Transaction.user_id == principal.id)
+            .order_by(Transaction.date.desc(), Transaction.id.desc())
+            .limit(SERIALIZED_ROWS)
+        )
+    )
+    adapter = TypeAdapter(list[TransactionResponse])
+    benchmark(lambda: adapter.dump_json(adapter.validate_python(transactions, from_attributes=True), by_alias=True))
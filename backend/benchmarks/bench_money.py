@@ -0,0 +1,51 @@
+from typing import Any
+
+import numpy as np
+import orjson
+import pytest
+from sqlalchemy import Float, cast, func, select
+from sqlalchemy.orm import Session
+
+from app.api.deps import Principal
+from app.db.functions import cents, money_sum, month_of
+from app.models import Transaction
+
+# Each codec reads a user's amounts and writes them as a JSON array: floats
+# cast in SQL, exact Decimals converted at the edge, and integer cents as the
+# Parquet export reads them. All three have to produce the same bytes.
+AMOUNT_CODECS = {
+    "float": (cast(Transaction.amount, Float), lambda values: orjson.dumps(values)),
+    "decimal": (Transaction.amount, lambda values: orjson.dumps(values, default=float)),
+    "cents": (
+        cents(Transaction.amount),
+        lambda values: orjson.dumps(
+            np.fromiter(values, dtype=np.int64, count=len(values)) / 100, option=orjson.OPT_SERIALIZE_NUMPY
+        ),
+    ),
+}
+
+
+def _amounts_json(db: Session, user_id: int, codec: str) -> bytes:
+    column, encode = AMOUNT_CODECS[codec]
+    values = db.scalars(select(column).where(Transaction.user_id == user_id).order_by(Transaction.id)).all()
+    return encode(values)
+
+
+@pytest.mark.benchmark(group="money_codec")
+@pytest.mark.parametrize("codec", list(AMOUNT_CODECS))
+def bench_amount_codec(benchmark: Any, db: Session, principal: Principal, codec: str) -> None:
+    expected = _amounts_json(db, principal.id, "float")
+    assert benchmark(_amounts_json, db, principal.id, codec) == expected
+
+
+@pytest.mark.benchmark(group="money_sum")
+@pytest.mark.parametrize("aggregate", ["float", "exact"])
+def bench_monthly_totals(benchmark: Any, db: Session, principal: Principal, aggregate: str) -> None:
+    total = func.sum(Transaction.amount) if aggregate == "float" else money_sum(Transaction.amount)
+    month = month_of(Transaction.date)
+    query = (
+        select(month, Transaction.type, total)
+        .where(Transaction.user_id == principal.id)
+        .group_by(month, Transaction.type)
+    )
+    benchmark(lambda: db.execute(query).all())
@@ -0,0 +1,135 @@
+import datetime as dt
+import io
+from collections.abc import Iterator
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+
+from app.api.deps import Principal
+from app.models import Category, RecurringTransaction, Transaction
+from app.services.exports import write_export
+from app.services.insights import compute_insights, load_ledger
+from app.services.recurring import post_due_occurrences
+from app.services.rollups import rebuild_monthly_summaries
+from app.services.rules import compile_rules
+from app.services.search import search_condition, search_terms
+from app.services.transactions import batch_update, transaction_filters
+from benchmarks.generator import CATALOG, LedgerSpec
+
+MATCHED_DESCRIPTIONS = 10_000
+RECURRING_RULES = 20
+
+
+@pytest.mark.benchmark(group="insights")
+def bench_insights(benchmark: Any, db: Session, principal: Principal, ledger: LedgerSpec) -> None:
+    benchmark(lambda: compute_insights(load_ledger(db, principal.id, principal.base_currency), 6, ledger.end_date))
+
+
+@pytest.mark.benchmark(group="search")
+def bench_search_common_term(benchmark: Any, db: Session, principal: Principal) -> None:
+    query = select(Transaction.id).where(Transaction.user_id == principal.id, search_condition(search_terms("lidl")))
+    benchmark(lambda: db.execute(query.limit(50)).all())
+
+
+@pytest.mark.benchmark(group="search")
+def bench_search_prefix_two_terms(benchmark: Any, db: Session, principal: Principal) -> None:
+    query = select(Transaction.id).where(
+        Transaction.user_id == principal.id, search_condition(search_terms("whole foo"))
+    )
+    benchmark(lambda: db.execute(query.limit(50)).all())
+
+
+@pytest.mark.benchmark(group="rules")
+def bench_rule_matcher(benchmark: Any, db: Session, principal: Principal) -> None:
+    categories = dict(db.execute(select(Category.name, Category.id).where(Category.user_id == principal.id)).all())
+    rules = [
+        SimpleNamespace(
+            category_id=categories[profile.name],
+            match_type="contains",
+            patterns=[merchant.lower() for merchant in profile.merchants],
+            amount_min=None,
+            amount_max=None,
+            type=profile.type,
+        )
+        for profile in CATALOG
+        if profile.name in categories
+    ]
+    matcher = compile_rules(rules)
+    rows = db.execute(
+        select(Transaction.description, Transaction.amount, Transaction.type)
+        .where(Transaction.user_id == principal.id)
+        .limit(MATCHED_DESCRIPTIONS)
+    ).all()
+    benchmark(lambda: [matcher.match(description, amount, kind) for description, amount, kind in rows])
+
+
+@pytest.mark.benchmark(group="batch")
+def bench_batch_recategorize_month(benchmark: Any, db: Session, principal: Principal, ledger: LedgerSpec) -> None:
+    categories = dict(db.execute(select(Category.name, Category.id).where(Category.user_id == principal.id)).all())
+    month_start = ledger.end_date.replace(day=1)
+    conditions = transaction_filters(principal.id, month_start, ledger.end_date, categories["Groceries"], "expense")
+    benchmark.pedantic(
+        batch_update,
+        args=(db, principal.id, conditions, {"category_id": categories["Dining"]}),
+        setup=db.rollback,
+        rounds=20,
+    )
+
+
+@pytest.mark.benchmark(group="export")
+@pytest.mark.parametrize("export_format", ["csv", "ndjson", "parquet"])
+def bench_export(benchmark: Any, db: Session, principal: Principal, export_format: str) -> None:
+    conditions = transaction_filters(principal.id)
+    benchmark.pedantic(
+        lambda: write_export(db, export_format, conditions, io.BytesIO()), rounds=3, warmup_rounds=1
+    )
+
+
+@pytest.fixture
+def recurring_rules(db: Session, principal: Principal, ledger: LedgerSpec) -> Iterator[list[int]]:
+    category_id = db.scalar(
+        select(Category.id).where(Category.user_id == principal.id, Category.name == "Subscriptions")
+    )
+    start = ledger.end_date - dt.timedelta(days=365)
+    rules = [
+        RecurringTransaction(
+            user_id=principal.id,
+            category_id=category_id,
+            amount=9.99,
+            type="expense",
+            description=f"Daily subscription {index}",
+            frequency="daily",
+            interval=1,
+            start_date=start,
+            next_occurrence=start,
+        )
+        for index in range(RECURRING_RULES)
+    ]
+    db.add_all(rules)
+    db.commit()
+    rule_ids = [rule.id for rule in rules]
+    yield rule_ids
+
+    db.execute(delete(Transaction).where(Transaction.recurring_id.in_(rule_ids)))
+    db.execute(delete(RecurringTransaction).where(RecurringTransaction.id.in_(rule_ids)))
+    rebuild_monthly_summaries(db, principal.id)
+    db.commit()
+
+
+@pytest.mark.benchmark(group="recurring")
+def bench_recurring_catch_up(benchmark: Any, db: Session, ledger: LedgerSpec, recurring_rules: list[int]) -> None:
+    # A year of daily postings for every rule, as after a long outage.
+    def reset() -> None:
+        db.execute(delete(Transaction).where(Transaction.recurring_id.in_(recurring_rules)))
+        db.execute(
+            update(RecurringTransaction)
+            .where(RecurringTransaction.id.in_(recurring_rules))
+            .values(next_occurrence=RecurringTransaction.start_date)
+        )
+        db.commit()
+
+    report = benchmark.pedantic(post_due_occurrences, args=(db, ledger.end_date), setup=reset, rounds=3)
+    assert report.posted == RECURRING_RULES * 366
@@ -0,0 +1,78 @@
+import logging
+import os
+import tempfile
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+
+# Settings are read at import time, so the database is chosen before the app
+# is imported. BENCH_DATABASE_URL points at a database loaded beforehand with
+# `python -m benchmarks.generator`; without it a fresh SQLite file is filled.
+os.environ["DATABASE_URL"] = os.environ.get("BENCH_DATABASE_URL") or (
+    f"sqlite:///{tempfile.mkdtemp(prefix='finance-bench-')}/ledger.db"
+)
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+from sqlalchemy import func, inspect, select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.api.deps import Principal, user_cache  # noqa: E402
+from app.core.security import create_access_token  # noqa: E402
+from app.db.session import SessionLocal, engine  # noqa: E402
+from app.models import User  # noqa: E402
+from benchmarks.generator import LedgerSpec, generate_ledger  # noqa: E402
+from benchmarks.report import percentile  # noqa: E402
+
+logging.getLogger("app.db").setLevel(logging.ERROR)
+
+
+@pytest.fixture(scope="session")
+def ledger() -> LedgerSpec:
+    spec = LedgerSpec(
+        users=int(os.environ.get("BENCH_USERS", LedgerSpec.users)),
+        transactions=int(os.environ.get("BENCH_TRANSACTIONS", LedgerSpec.transactions)),
+        seed=int(os.environ.get("BENCH_SEED", LedgerSpec.seed)),
+    )
+    with Session(engine) as db:
+        loaded = inspect(engine).has_table("users") and db.scalar(select(func.count()).select_from(User))
+    if not loaded:
+        generate_ledger(engine, spec)
+    return spec
+
+
+@pytest.fixture
+def db(ledger: LedgerSpec) -> Iterator[Session]:
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.close()
+
+
+@pytest.fixture
+def principal(db: Session) -> Principal:
+    row = db.execute(
+        select(User.id, User.full_name, User.email, User.agreed_terms, User.token_version, User.base_currency)
+        .order_by(User.id)
+        .limit(1)
+    ).one()
+    user_cache.clear()
+    return Principal(*row)
+
+
+@pytest.fixture
+def access_token(principal: Principal) -> str:
+    return create_access_token(str(principal.id), principal.token_version)
+
+
+def pytest_benchmark_update_json(config: Any, benchmarks: list[Any], output_json: dict[str, Any]) -> None:
+    # pytest-benchmark reports quartiles only; tail latencies are what the
+    # report compares across commits.
+    samples = {bench.fullname: bench.stats.data for bench in benchmarks if getattr(bench, "stats", None)}
+    for entry in output_json["benchmarks"]:
+        data = samples.get(entry["fullname"])
+        if data:
+            entry["stats"]["p95"] = percentile(data, 0.95)
+            entry["stats"]["p99"] = percentile(data, 0.99)
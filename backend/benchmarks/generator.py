@@ -0,0 +1,224 @@
+import argparse
+import datetime as dt
+import logging
+import math
+import random
+import sys
+import time
+from dataclasses import asdict, dataclass
+from decimal import Decimal
+from typing import Any
+
+from sqlalchemy import Engine, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.security import hash_password
+from app.db.base import Base
+from app.db.session import engine
+from app.models import Budget, Category, Goal, Transaction, User
+from app.services.rollups import rebuild_monthly_summaries
+
+BENCH_PASSWORD = "benchmark-password"
+INSERT_BATCH_SIZE = 10_000
+
+
+@dataclass(frozen=True)
+class CategoryProfile:
+    name: str
+    type: str
+    # Variable spending: lognormal amounts around median, weight is the share
+    # of a user's day-to-day transactions. Fixed entries post once a month.
+    median: float
+    sigma: float = 0.0
+    weight: float = 0.0
+    monthly_day: int | None = None
+    merchants: tuple[str, ...] = ()
+
+
+CATALOG = (
+    CategoryProfile("Salary", "income", 3200, 0.25, monthly_day=25, merchants=("Payroll ACME Corp",)),
+    CategoryProfile(
+        "Groceries", "expense", 42, 0.6, 30, merchants=("Lidl", "Aldi", "Carrefour", "Whole Foods", "Tesco Express")
+    ),
+    CategoryProfile("Rent", "expense", 1150, 0.0, monthly_day=1, merchants=("Rent transfer",)),
+    CategoryProfile(
+        "Dining", "expense", 24, 0.5, 18, merchants=("Starbucks", "Pizza Hut", "Sushi Bar", "Local Cafe", "Burger King")
+    ),
+    CategoryProfile("Transport", "expense", 14, 0.7, 14, merchants=("Uber", "Metro card", "Shell", "BP Fuel")),
+    CategoryProfile("Utilities", "expense", 115, 0.2, monthly_day=12, merchants=("City Power", "Water board")),
+    CategoryProfile(
+        "Shopping", "expense", 55, 0.9, 10, merchants=("Amazon Marketplace", "Zara", "IKEA", "MediaMarkt")
+    ),
+    CategoryProfile("Entertainment", "expense", 28, 0.8, 7, merchants=("Cinema City", "Steam", "Concert tickets")),
+    CategoryProfile("Subscriptions", "expense", 11, 0.4, 5, merchants=("Netflix", "Spotify", "iCloud storage")),
+    CategoryProfile("Health", "expense", 48, 0.8, 3, merchants=("Pharmacy", "Dentist", "Gym membership")),
+    CategoryProfile("Freelance", "income", 450, 0.7, 2, merchants=("Invoice payment", "Upwork payout")),
+    CategoryProfile("Travel", "expense", 280, 0.9, 2, merchants=("Ryanair", "Booking.com", "Airbnb")),
+    CategoryProfile("Gifts", "expense", 40, 0.7, 2, merchants=("Flower shop", "Bookstore")),
+    CategoryProfile("Education", "expense", 90, 0.6, 1, merchants=("Coursera", "Udemy")),
+)
+
+
+@dataclass(frozen=True)
+class LedgerSpec:
+    users: int = 2
+    categories: int = 12
+    transactions: int = 20_000
+    months: int = 36
+    end_date: dt.date = dt.date(2026, 9, 30)
+    seed: int = 42
+
+
+def bench_email(number: int) -> str:
+    return f"bench{number}@example.com"
+
+
+def _profiles(count: int) -> list[CategoryProfile]:
+    profiles = list(CATALOG[: max(count, 2)])
+    for index in range(len(profiles), count):
+        profiles.append(CategoryProfile(f"Misc {index}", "expense", 30, 0.8, 1, merchants=(f"Vendor {index}",)))
+    return profiles
+
+
+def _month_starts(spec: LedgerSpec) -> list[dt.date]:
+    year, month = spec.end_date.year, spec.end_date.month
+    starts = []
+    for _ in range(spec.months):
+        starts.append(dt.date(year, month, 1))
+        year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+    return starts[::-1]
+
+
+def _amount(rng: random.Random, profile: CategoryProfile, scale: float) -> Decimal:
+    value = profile.median * scale * (math.exp(rng.gauss(0, profile.sigma)) if profile.sigma else 1.0)
+    return Decimal(f"{max(value, 0.5):.2f}")
+
+
+def _user_transactions(
+    rng: random.Random, spec: LedgerSpec, user_id: int, categories: list[tuple[int, CategoryProfile]]
+) -> list[dict[str, Any]]:
+    # Fixed monthly entries come first, the rest of the budget is day-to-day
+    # spending spread over the period with weekends busier than weekdays.
+    scale = rng.uniform(0.6, 1.6)
+    months = _month_starts(spec)
+    first_day = months[0]
+    days = [first_day + dt.timedelta(days=offset) for offset in range((spec.end_date - first_day).days + 1)]
+    day_weights = [1.6 if day.weekday() >= 5 else 1.0 for day in days]
+
+    rows: list[dict[str, Any]] = []
+    for category_id, profile in categories:
+        if profile.monthly_day is None:
+            continue
+        for month in months:
+            if len(rows) >= spec.transactions:
+                break
+            rows.append(
+                {
+                    "user_id": user_id,
+                    "category_id": category_id,
+                    "amount": _amount(rng, profile, scale),
+                    "type": profile.type,
+                    "date": month.replace(day=min(profile.monthly_day, 28)),
+                    "description": profile.merchants[0],
+                }
+            )
+
+    variable = [(category_id, profile) for category_id, profile in categories if profile.weight]
+    remaining = spec.transactions - len(rows)
+    if remaining > 0 and variable:
+        picks = rng.choices(variable, weights=[profile.weight for _, profile in variable], k=remaining)
+        dates = rng.choices(days, weights=day_weights, k=remaining)
+        for (category_id, profile), day in zip(picks, dates):
+            rows.append(
+                {
+                    "user_id": user_id,
+                    "category_id": category_id,
+                    "amount": _amount(rng, profile, scale),
+                    "type": profile.type,
+                    "date": day,
+                    "description": f"{rng.choice(profile.merchants)} #{rng.randint(100, 999)}",
+                }
+            )
+    rows.sort(key=lambda row: row["date"])
+    return rows
+
+
+def generate_ledger(bind: Engine, spec: LedgerSpec) -> dict[str, Any]:
+    # Deterministic for a given spec: the same seed always yields the same
+    # users, categories, amounts and dates, so runs on different commits
+    # measure the same data.
+    Base.metadata.create_all(bind)
+    rng = random.Random(spec.seed)
+    started = time.perf_counter()
+    with Session(bind) as db:
+        if db.scalar(select(func.count()).select_from(User)):
+            raise RuntimeError("The benchmark database already has users; point DATABASE_URL at an empty database")
+
+        hashed = hash_password(BENCH_PASSWORD)
+        profiles = _profiles(spec.categories)
+        months = _month_starts(spec)
+        inserted = 0
+        for number in range(1, spec.users + 1):
+            user = User(
+                full_name=f"Bench User {number}",
+                email=bench_email(number),
+                hashed_password=hashed,
+                agreed_terms=True,
+            )
+            db.add(user)
+            db.flush()
+
+            categories = []
+            for profile in profiles:
+                category = Category(user_id=user.id, name=profile.name, type=profile.type)
+                db.add(category)
+                db.flush()
+                categories.append((category.id, profile))
+
+            rows = _user_transactions(rng, spec, user.id, categories)
+            for start in range(0, len(rows), INSERT_BATCH_SIZE):
+                db.execute(insert(Transaction), rows[start : start + INSERT_BATCH_SIZE])
+            inserted += len(rows)
+
+            # Budgets sit about 10% above the expected monthly spend of each
+            # day-to-day category, so some months overrun and some do not.
+            total_weight = sum(profile.weight for profile in profiles)
+            per_month = spec.transactions / spec.months
+            for category_id, profile in categories:
+                if profile.type != "expense" or not profile.weight:
+                    continue
+                amount = round(per_month * profile.weight / total_weight * profile.median * 1.1, 2)
+                db.add_all(
+                    Budget(user_id=user.id, category_id=category_id, amount=amount, month=month.strftime("%Y-%m"))
+                    for month in months[-3:]
+                )
+            db.add(Goal(user_id=user.id, name="Emergency fund", target_amount=10_000, current_amount=0))
+            db.add(Goal(user_id=user.id, name="Holiday", target_amount=2_500, current_amount=0, deadline=spec.end_date))
+            rebuild_monthly_summaries(db, user.id)
+            db.commit()
+
+    summary = {**asdict(spec), "end_date": spec.end_date.isoformat(), "inserted": inserted}
+    return {**summary, "seconds": time.perf_counter() - started}
+
+
+def main(argv: list[str] | None = None) -> int:
+    # Bulk inserts are slow statements by design; keep the log readable.
+    logging.getLogger("app.db").setLevel(logging.ERROR)
+
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.generator")
+    parser.add_argument("--users", type=int, default=LedgerSpec.users)
+    parser.add_argument("--categories", type=int, default=LedgerSpec.categories)
+    parser.add_argument("--transactions", type=int, default=LedgerSpec.transactions, help="per user")
+    parser.add_argument("--months", type=int, default=LedgerSpec.months)
+    parser.add_argument("--end-date", type=dt.date.fromisoformat, default=LedgerSpec.end_date)
+    parser.add_argument("--seed", type=int, default=LedgerSpec.seed)
+    args = parser.parse_args(argv)
+
+    spec = LedgerSpec(args.users, args.categories, args.transactions, args.months, args.end_date, args.seed)
+    summary = generate_ledger(engine, spec)
+    print(f"Loaded {summary['inserted']} transactions for {spec.users} users in {summary['seconds']:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
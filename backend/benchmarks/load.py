@@ -0,0 +1,176 @@
+import argparse
+import asyncio
+import random
+import sys
+import time
+from collections import defaultdict
+from typing import Any
+
+import httpx
+from fastapi import FastAPI
+
+from app.core.config import settings
+from app.main import app, create_app
+from benchmarks.generator import BENCH_PASSWORD, bench_email
+from benchmarks.report import build_report, environment, summarize, write_report
+
+# What each frontend page fetches when it is opened, requested concurrently as
+# the pages do with Promise.all, and how often users open it.
+PAGES: dict[str, tuple[int, tuple[tuple[str, dict[str, Any] | None], ...]]] = {
+    "dashboard": (4, (("/api/analytics", None),)),
+    "transactions": (4, (("/api/transactions", {"limit": 50}), ("/api/categories", None))),
+    "budgets": (2, (("/api/budgets/status", None), ("/api/categories", None))),
+    "goals": (1, (("/api/goals", None),)),
+    "categories": (1, (("/api/categories", None),)),
+}
+NEXT_PAGE_PROBABILITY = 0.3
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.samples: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+        self.recording = False
+
+    def add(self, name: str, seconds: float, ok: bool = True) -> None:
+        if not self.recording:
+            return
+        self.samples[name].append(seconds)
+        if not ok:
+            self.errors[name] += 1
+
+    def results(self, elapsed: float) -> dict[str, dict[str, float]]:
+        return {name: summarize(samples, elapsed, self.errors[name]) for name, samples in sorted(self.samples.items())}
+
+
+async def _request(
+    client: httpx.AsyncClient, recorder: Recorder, method: str, url: str, **kwargs: Any
+) -> httpx.Response:
+    started = time.perf_counter()
+    response = await client.request(method, url, **kwargs)
+    recorder.add(f"{method} {url}", time.perf_counter() - started, response.status_code < 400)
+    return response
+
+
+async def _login(client: httpx.AsyncClient, recorder: Recorder, number: int) -> str:
+    response = await _request(
+        client, recorder, "POST", "/api/auth/login", json={"email": bench_email(number), "password": BENCH_PASSWORD}
+    )
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def _browse(client: httpx.AsyncClient, recorder: Recorder, rng: random.Random, number: int, stop: float) -> None:
+    headers = {"Authorization": f"Bearer {await _login(client, recorder, number)}"}
+    await _request(client, recorder, "GET", "/api/auth/me", headers=headers)
+    names = list(PAGES)
+    weights = [PAGES[name][0] for name in names]
+    while time.perf_counter() < stop:
+        page = rng.choices(names, weights)[0]
+        started = time.perf_counter()
+        responses = await asyncio.gather(
+            *(_request(client, recorder, "GET", url, params=params, headers=headers) for url, params in PAGES[page][1])
+        )
+        cursor = responses[0].headers.get("X-Next-Cursor")
+        if page == "transactions" and cursor and rng.random() < NEXT_PAGE_PROBABILITY:
+            await _request(
+                client, recorder, "GET", "/api/transactions", params={"limit": 50, "cursor": cursor}, headers=headers
+            )
+        recorder.add(f"page {page}", time.perf_counter() - started, all(r.status_code < 400 for r in responses))
+
+
+async def _login_storm(
+    client: httpx.AsyncClient, recorder: Recorder, rng: random.Random, number: int, stop: float
+) -> None:
+    while time.perf_counter() < stop:
+        await _login(client, recorder, number)
+
+
+SCENARIOS = {"pages": _browse, "login": _login_storm}
+
+
+def _client(base_url: str | None, timeout: float, target: FastAPI) -> httpx.AsyncClient:
+    if base_url:
+        return httpx.AsyncClient(base_url=base_url, timeout=timeout)
+    # In-process: no network or server, the app runs on this event loop and
+    # its threadpool, which is what the numbers then describe.
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=target), base_url="http://bench", timeout=timeout)
+
+
+async def run_load(
+    scenario: str,
+    concurrency: int,
+    duration: float,
+    warmup: float,
+    users: int,
+    seed: int,
+    base_url: str | None = None,
+    timeout: float = 30.0,
+    target: FastAPI = app,
+) -> dict[str, dict[str, float]]:
+    recorder = Recorder()
+    async with _client(base_url, timeout, target) as client:
+        start = time.perf_counter()
+        stop = start + warmup + duration
+        user_scenario = SCENARIOS[scenario]
+        workers = [
+            asyncio.create_task(user_scenario(client, recorder, random.Random(seed + index), index % users + 1, stop))
+            for index in range(concurrency)
+        ]
+        await asyncio.sleep(warmup)
+        recorder.recording = True
+        measured = time.perf_counter()
+        await asyncio.gather(*workers)
+        return recorder.results(time.perf_counter() - measured)
+
+
+async def compare_sync_async(
+    scenario: str, concurrency: int, duration: float, warmup: float, users: int, seed: int
+) -> dict[str, dict[str, float]]:
+    # The same load, with the same seed, against the threadpool routes and then
+    # against the async read routes; results are prefixed with the mode. Only
+    # the read endpoints in app/api/async_reads.py differ between the two.
+    results = {}
+    for mode, async_reads in (("sync", False), ("async", True)):
+        target = create_app(async_reads=async_reads)
+        mode_results = await run_load(scenario, concurrency, duration, warmup, users, seed, target=target)
+        results.update({f"{mode} {name}": summary for name, summary in mode_results.items()})
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="pages")
+    parser.add_argument("--base-url", default=None, help="a running server; the app is run in-process if omitted")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--warmup", type=float, default=3.0)
+    parser.add_argument("--users", type=int, default=2, help="how many generated users to spread the load over")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--compare-async", action="store_true", help="run in-process with sync, then async reads")
+    parser.add_argument("--output", default="-")
+    args = parser.parse_args(argv)
+
+    options = (args.scenario, args.concurrency, args.duration, args.warmup, args.users, args.seed)
+    if args.compare_async:
+        if args.base_url:
+            parser.error("--compare-async runs the app in-process; run each server with --base-url instead")
+        if not settings.async_database:
+            parser.error("--compare-async needs ASYNC_DATABASE=true, which creates the async engine")
+        results = asyncio.run(compare_sync_async(*options))
+    else:
+        results = asyncio.run(run_load(*options, args.base_url))
+    meta = environment(None if args.base_url else settings.database_url)
+    meta.update(
+        scenario=args.scenario,
+        concurrency=args.concurrency,
+        duration=args.duration,
+        base_url=args.base_url,
+        compare_async=args.compare_async,
+    )
+    write_report(build_report("load", results, **meta), args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+import argparse
+import datetime as dt
+import json
+import math
+import platform
+import subprocess
+import sys
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+REPORT_VERSION = 1
+
+
+def percentile(samples: Sequence[float], fraction: float) -> float:
+    # Nearest-rank on the sorted samples, the definition most load tools use.
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    rank = max(math.ceil(fraction * len(ordered)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def summarize(samples: Sequence[float], elapsed: float | None = None, errors: int = 0) -> dict[str, float]:
+    # Samples are seconds; the report is in milliseconds and requests/s.
+    count = len(samples)
+    summary = {
+        "count": count,
+        "errors": errors,
+        "mean_ms": sum(samples) / count * 1000 if count else 0.0,
+        "p50_ms": percentile(samples, 0.50) * 1000,
+        "p95_ms": percentile(samples, 0.95) * 1000,
+        "p99_ms": percentile(samples, 0.99) * 1000,
+        "max_ms": max(samples, default=0.0) * 1000,
+    }
+    if elapsed:
+        summary["throughput_per_s"] = count / elapsed
+    return summary
+
+
+def _git(*args: str) -> str | None:
+    try:
+        return subprocess.run(["git", *args], capture_output=True, text=True, check=True).stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment(database_url: str | None = None) -> dict[str, Any]:
+    return {
+        "commit": _git("rev-parse", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "created_at": dt.datetime.now(dt.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "processor": platform.processor() or None,
+        "database": database_url.split(":", 1)[0] if database_url else None,
+    }
+
+
+def build_report(kind: str, results: dict[str, dict[str, float]], **meta: Any) -> dict[str, Any]:
+    return {"version": REPORT_VERSION, "kind": kind, "meta": meta, "results": results}
+
+
+def write_report(report: dict[str, Any], path: str | None) -> None:
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if path is None or path == "-":
+        print(text)
+    else:
+        Path(path).write_text(text + "\n")
+
+
+def load_results(path: str) -> dict[str, dict[str, float]]:
+    # Reads our own reports as well as pytest-benchmark's --benchmark-json
+    # output, whose stats are in seconds.
+    data = json.loads(Path(path).read_text())
+    if "results" in data:
+        return data["results"]
+    results = {}
+    for bench in data.get("benchmarks", []):
+        stats = bench["stats"]
+        results[bench["fullname"]] = {
+            "count": stats["rounds"],
+            "mean_ms": stats["mean"] * 1000,
+            "p50_ms": stats["median"] * 1000,
+            "p95_ms": stats.get("p95", stats["max"]) * 1000,
+            "p99_ms": stats.get("p99", stats["max"]) * 1000,
+            "throughput_per_s": stats["ops"],
+        }
+    return results
+
+
+def compare(baseline: dict[str, dict[str, float]], candidate: dict[str, dict[str, float]], metric: str) -> list[str]:
+    lines = [f"{'name':60} {'baseline':>12} {'candidate':>12} {'change':>8}"]
+    for name in sorted(baseline.keys() | candidate.keys()):
+        before = baseline.get(name, {}).get(metric)
+        after = candidate.get(name, {}).get(metric)
+        if before is None or after is None:
+            change = "new" if before is None else "gone"
+        else:
+            change = f"{(after - before) / before * 100:+.1f}%" if before else "n/a"
+        lines.append(
+            f"{name[:60]:60} {'' if before is None else f'{before:.3f}':>12} "
+            f"{'' if after is None else f'{after:.3f}':>12} {change:>8}"
+        )
+    return lines
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.report")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--metric", default="p95_ms", help="p50_ms, p95_ms, p99_ms, mean_ms or throughput_per_s")
+    args = parser.parse_args(argv)
+
+    for line in compare(load_results(args.baseline), load_results(args.candidate), args.metric):
+        print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+import os
+import tempfile
+import uuid
+from collections.abc import Iterator
+
+import pytest
+
+# Settings are read at import time, so the test database and the in-process
+# knobs are set before the app is imported: no background job workers or
+# recurring scheduler, and cheap password hashes on the threadpool.
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='finance-tests-')}/app.db"
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ["DATABASE_REPLICA_URLS"] = "[]"
+os.environ["JOB_WORKERS"] = "0"
+os.environ["RECURRING_INTERVAL_SECONDS"] = "0"
+os.environ["PASSWORD_HASH_WORKERS"] = "0"
+os.environ["BCRYPT_ROUNDS"] = "4"
+
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.db.base import Base  # noqa: E402
+from app.db.session import SessionLocal, engine  # noqa: E402
+from app.models import Category, User  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def schema() -> None:
+    Base.metadata.create_all(engine)
+
+
+@pytest.fixture
+def db() -> Iterator[Session]:
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.close()
+
+
+@pytest.fixture
+def user(db: Session) -> User:
+    user = User(
+        full_name="Test User",
+        email=f"{uuid.uuid4().hex}@example.com",
+        hashed_password="not-a-hash",
+        agreed_terms=True,
+    )
+    db.add(user)
+    db.commit()
+    return user
+
+
+@pytest.fixture
+def expense_category(db: Session, user: User) -> Category:
+    category = Category(user_id=user.id, name="Groceries", type="expense")
+    db.add(category)
+    db.commit()
+    return category
@@ -0,0 +1,60 @@
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.security import create_access_token
+from app.main import app
+from app.models import Category, User
+from app.services.imports import import_transactions
+
+
+@pytest.fixture
+def ledger(db: Session, user: User, expense_category: Category) -> TestClient:
+    salary = Category(user_id=user.id, name="Salary", type="income")
+    rent = Category(user_id=user.id, name="Rent", type="expense")
+    db.add_all([salary, rent])
+    db.commit()
+    rows = [
+        {"amount": "3000.00", "date": "2024-01-31", "category_id": salary.id},
+        {"amount": "-1200.00", "date": "2024-01-01", "category_id": rent.id},
+        {"amount": "-45.10", "date": "2024-01-12", "category_id": expense_category.id},
+        {"amount": "-54.90", "date": "2024-01-20", "category_id": expense_category.id},
+        {"amount": "-1200.00", "date": "2024-02-01", "category_id": rent.id},
+        {"amount": "-80.25", "date": "2024-02-15", "category_id": expense_category.id},
+    ]
+    assert import_transactions(db, user.id, rows).inserted == len(rows)
+    return TestClient(app, headers={"Authorization": f"Bearer {create_access_token(str(user.id), 0)}"})
+
+
+def _analytics(client: TestClient, **params: Any) -> dict[str, Any]:
+    response = client.get("/api/analytics", params=params)
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_analytics_totals_months_and_categories(ledger: TestClient) -> None:
+    body = _analytics(ledger)
+
+    assert body["currency"] == "USD"
+    assert body["totals"] == {"income": 3000, "expense": 2580.25, "balance": 419.75}
+    assert body["monthly"] == [
+        {"month": "2024-01", "income": 3000, "expense": 1300, "balance": 1700, "running_balance": 1700},
+        {"month": "2024-02", "income": 0, "expense": 1280.25, "balance": -1280.25, "running_balance": 419.75},
+    ]
+    assert [(row["name"], row["type"], row["total"], row["count"]) for row in body["categories"]] == [
+        ("Salary", "income", 3000, 1),
+        ("Rent", "expense", 2400, 2),
+        ("Groceries", "expense", 180.25, 3),
+    ]
+
+
+def test_analytics_filters_agree_between_rollups_and_transactions(ledger: TestClient) -> None:
+    # A whole month is read from the rollups, a partial one from the transactions.
+    whole = _analytics(ledger, start_date="2024-01-01", end_date="2024-01-31", type="expense")
+    partial = _analytics(ledger, start_date="2024-01-10", end_date="2024-01-31", type="expense")
+
+    assert whole["totals"] == {"income": 0, "expense": 1300, "balance": -1300}
+    assert partial["totals"] == {"income": 0, "expense": 100, "balance": -100}
+    assert [(row["name"], row["count"]) for row in partial["categories"]] == [("Groceries", 2)]
@@ -0,0 +1,43 @@
+import pytest
+from fastapi.testclient import TestClient
+from passlib.context import CryptContext
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.security import password_hasher
+from app.main import app
+from app.models import User
+
+
+def _login(user: User, password: str) -> tuple[int, dict[str, str]]:
+    response = TestClient(app).post("/api/auth/login", json={"email": user.email, "password": password})
+    return response.status_code, dict(response.headers)
+
+
+def test_login_upgrades_a_hash_made_with_other_settings(db: Session, user: User) -> None:
+    user.hashed_password = CryptContext(schemes=["bcrypt"], bcrypt__rounds=5).hash("correct horse")
+    db.commit()
+
+    assert _login(user, "wrong horse")[0] == 401
+    assert db.scalar(select(User.hashed_password).where(User.id == user.id)).startswith("$2b$05$")
+
+    assert _login(user, "correct horse")[0] == 200
+    db.expire_all()
+    upgraded = db.scalar(select(User.hashed_password).where(User.id == user.id))
+    assert upgraded.startswith("$2b$04$")
+    assert _login(user, "correct horse")[0] == 200
+
+
+def test_login_fails_fast_when_the_hash_queue_is_full(
+    db: Session, user: User, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    user.hashed_password = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash("correct horse")
+    db.commit()
+
+    with monkeypatch.context() as patch:
+        patch.setattr(password_hasher, "queue_limit", 0)
+        status_code, headers = _login(user, "correct horse")
+    assert status_code == 503
+    assert headers["retry-after"] == "1"
+
+    assert _login(user, "correct horse")[0] == 200
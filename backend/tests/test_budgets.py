@@ -0,0 +1,76 @@
+import datetime as dt
+from collections.abc import Iterator
+from decimal import Decimal
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.security import create_access_token
+from app.db.session import engine
+from app.main import app
+from app.models import Budget, Category, FxRate, User
+from app.services.fx import rate_cache
+from app.services.imports import import_transactions
+
+
+@pytest.fixture
+def gbp_rate(db: Session) -> Iterator[None]:
+    db.merge(FxRate(currency="GBP", date=dt.date(2024, 1, 1), rate=Decimal("0.8")))
+    db.commit()
+    rate_cache.clear()
+    yield
+    rate_cache.clear()
+
+
+def _client(user: User) -> TestClient:
+    return TestClient(app, headers={"Authorization": f"Bearer {create_access_token(str(user.id), 0)}"})
+
+
+def _status(client: TestClient) -> tuple[list[dict[str, Any]], int]:
+    statements: list[str] = []
+
+    def record(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = client.get("/api/budgets/status", params={"start_month": "2024-01", "end_month": "2024-02"})
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert response.status_code == 200
+    return response.json(), len(statements)
+
+
+def test_budget_status_reads_spending_with_the_budgets(
+    db: Session, user: User, expense_category: Category, gbp_rate: None
+) -> None:
+    user.base_currency = "EUR"
+    db.add_all(
+        [
+            Budget(user_id=user.id, category_id=expense_category.id, month="2024-01", amount=100, currency="EUR"),
+            Budget(user_id=user.id, category_id=expense_category.id, month="2024-02", amount=50, currency="EUR"),
+        ]
+    )
+    db.commit()
+    rows = [{"amount": "-30.00", "date": "2024-01-05", "category_id": expense_category.id, "currency": "EUR"}]
+    import_transactions(db, user.id, rows)
+    client = _client(user)
+    client.get("/api/budgets/status")
+
+    statuses, statements = _status(client)
+    assert [(status["month"], status["spent"], status["remaining"]) for status in statuses] == [
+        ("2024-02", 0, 50),
+        ("2024-01", 30, 70),
+    ]
+    assert statements == 1
+
+    # A bucket in another currency is converted from its transactions.
+    rows = [{"amount": "-8.00", "date": "2024-01-09", "category_id": expense_category.id, "currency": "GBP"}]
+    import_transactions(db, user.id, rows)
+
+    statuses, statements = _status(client)
+    assert [(status["month"], status["spent"]) for status in statuses] == [("2024-02", 0), ("2024-01", 40)]
+    assert statements == 2
@@ -0,0 +1,50 @@
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.api import categories
+from app.api.caching import cache_response, response_cache
+from app.core.security import create_access_token
+from app.main import app
+from app.models import Category, User
+
+
+def _client(user: User) -> TestClient:
+    return TestClient(app, headers={"Authorization": f"Bearer {create_access_token(str(user.id), 0)}"})
+
+
+def test_list_is_served_from_the_cache_with_an_etag(db: Session, user: User, expense_category: Category) -> None:
+    client = _client(user)
+
+    first = client.get("/api/categories")
+    assert [category["name"] for category in first.json()] == ["Groceries"]
+    assert client.get("/api/categories", headers={"If-None-Match": first.headers["ETag"]}).status_code == 304
+
+    # Written without going through the API, so the cache is not told.
+    db.add(Category(user_id=user.id, name="Rent", type="expense"))
+    db.commit()
+    assert client.get("/api/categories").json() == first.json()
+
+    response_cache.invalidate(user.id, "categories")
+    assert [category["name"] for category in client.get("/api/categories").json()] == ["Groceries", "Rent"]
+
+
+def test_write_between_the_query_and_the_cache_fill_is_not_hidden(
+    db: Session, user: User, expense_category: Category, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def write_then_cache(*args: Any) -> Any:
+        # Another request commits a category and invalidates after this
+        # request's query ran but before its body is cached.
+        db.add(Category(user_id=user.id, name="Rent", type="expense"))
+        db.commit()
+        response_cache.invalidate(user.id, "categories")
+        return cache_response(*args)
+
+    client = _client(user)
+    monkeypatch.setattr(categories, "cache_response", write_then_cache)
+    assert [category["name"] for category in client.get("/api/categories").json()] == ["Groceries"]
+    monkeypatch.undo()
+
+    assert [category["name"] for category in client.get("/api/categories").json()] == ["Groceries", "Rent"]
@@ -0,0 +1,115 @@
+import datetime as dt
+import io
+from decimal import Decimal
+from pathlib import Path
+
+import orjson
+import pyarrow.parquet as pq
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.main import app
+from app.models import Category, Transaction, User
+from app.services import jobs
+from app.services.imports import import_transactions
+
+
+@pytest.fixture
+def client(db: Session, user: User, expense_category: Category) -> TestClient:
+    rows = [
+        {"amount": "-1234567.89", "date": "2024-01-05", "category_id": expense_category.id, "description": "Rent, Jan"},
+        {"amount": "-0.10", "date": "2024-01-06", "category_id": expense_category.id},
+        {"amount": "-5.00", "date": "2024-02-01", "category_id": expense_category.id, "description": "Bus"},
+    ]
+    import_transactions(db, user.id, rows)
+    return TestClient(app, headers={"Authorization": f"Bearer {create_access_token(str(user.id), 0)}"})
+
+
+def _ids(db: Session, user: User) -> list[int]:
+    return list(
+        db.scalars(select(Transaction.id).where(Transaction.user_id == user.id).order_by(Transaction.date.desc()))
+    )
+
+
+def _export(client: TestClient, **params: str) -> bytes:
+    response = client.get("/api/transactions/export", params={"end_date": "2024-01-31", **params})
+    assert response.status_code == 200
+    return response.content
+
+
+def test_csv_export(db: Session, user: User, expense_category: Category, client: TestClient) -> None:
+    _, gum, rent = _ids(db, user)
+    category = expense_category.id
+
+    assert _export(client, format="csv").decode().splitlines() == [
+        "id,date,type,amount,currency,category_id,category,description,goal_id",
+        f"{gum},2024-01-06,expense,0.10,USD,{category},Groceries,,",
+        f'{rent},2024-01-05,expense,1234567.89,USD,{category},Groceries,"Rent, Jan",',
+    ]
+
+
+def test_ndjson_export(db: Session, user: User, expense_category: Category, client: TestClient) -> None:
+    _, gum, rent = _ids(db, user)
+
+    lines = _export(client, format="ndjson").splitlines()
+
+    assert [orjson.loads(line) for line in lines] == [
+        {
+            "id": gum,
+            "date": "2024-01-06",
+            "type": "expense",
+            "amount": 0.1,
+            "currency": "USD",
+            "category_id": expense_category.id,
+            "category": "Groceries",
+            "description": None,
+            "goal_id": None,
+        },
+        {
+            "id": rent,
+            "date": "2024-01-05",
+            "type": "expense",
+            "amount": 1234567.89,
+            "currency": "USD",
+            "category_id": expense_category.id,
+            "category": "Groceries",
+            "description": "Rent, Jan",
+            "goal_id": None,
+        },
+    ]
+
+
+def test_parquet_export(db: Session, user: User, expense_category: Category, client: TestClient) -> None:
+    _, gum, rent = _ids(db, user)
+
+    table = pq.read_table(io.BytesIO(_export(client, format="parquet")))
+
+    assert str(table.schema.field("amount").type) == "decimal128(12, 2)"
+    assert table.select(["id", "date", "amount", "description"]).to_pylist() == [
+        {"id": gum, "date": dt.date(2024, 1, 6), "amount": Decimal("0.10"), "description": None},
+        {"id": rent, "date": dt.date(2024, 1, 5), "amount": Decimal("1234567.89"), "description": "Rent, Jan"},
+    ]
+
+
+def test_background_export_is_downloaded_from_its_job(
+    client: TestClient, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "export_dir", str(tmp_path))
+
+    accepted = client.get("/api/transactions/export", params={"format": "csv", "background": True})
+    assert accepted.status_code == 202
+    job_id = accepted.json()["id"]
+    assert client.get(f"/api/jobs/{job_id}/download").status_code == 409
+
+    jobs.execute_job(job_id)
+
+    job = client.get(f"/api/jobs/{job_id}").json()
+    assert (job["status"], job["progress"], job["result"]["rows"]) == ("succeeded", 3, 3)
+    download = client.get(f"/api/jobs/{job_id}/download")
+    assert download.status_code == 200
+    assert download.headers["content-type"].startswith("text/csv")
+    assert download.content == client.get("/api/transactions/export", params={"format": "csv"}).content
@@ -0,0 +1,46 @@
+import datetime as dt
+from decimal import Decimal
+
+from sqlalchemy.orm import Session
+
+from app.models import Category, Goal, Transaction, User
+from app.services.goals import MAX_FORECAST_MONTHS, forecast
+
+
+def _goal_with_contribution(db: Session, user: User, category: Category, amount: str) -> Goal:
+    goal = Goal(user_id=user.id, name="House", target_amount=Decimal("5000.00"), category_id=category.id)
+    db.add(goal)
+    db.add(
+        Transaction(
+            user_id=user.id,
+            category_id=category.id,
+            amount=Decimal(amount),
+            type="expense",
+            date=dt.date(2024, 3, 5),
+        )
+    )
+    db.commit()
+    return goal
+
+
+def test_forecast_projects_completion_from_the_contribution_rate(
+    db: Session, user: User, expense_category: Category
+) -> None:
+    goal = _goal_with_contribution(db, user, expense_category, "500.00")
+
+    result = forecast(db, goal, today=dt.date(2024, 3, 20))
+
+    assert result.months_to_completion == 10
+    assert result.projected_completion == dt.date(2025, 1, 31)
+
+
+def test_forecast_beyond_the_horizon_is_not_projected(db: Session, user: User, expense_category: Category) -> None:
+    # 0.02 a month towards 5000 would take over 20000 years.
+    goal = _goal_with_contribution(db, user, expense_category, "0.02")
+
+    result = forecast(db, goal, today=dt.date(2024, 3, 20))
+
+    assert result.monthly_rate > 0
+    assert float(result.remaining) / result.monthly_rate > MAX_FORECAST_MONTHS
+    assert result.months_to_completion is None
+    assert result.projected_completion is None
@@ -0,0 +1,49 @@
+import csv
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.security import create_access_token
+from app.main import app
+from app.models import Category, Transaction, User
+from app.services.imports import import_transactions
+
+
+@pytest.mark.parametrize("amount", ["NaN", "sNaN", "-Infinity"])
+def test_signed_amount_must_be_finite(db: Session, user: User, expense_category: Category, amount: str) -> None:
+    rows = [
+        {"amount": amount, "date": "2024-01-05", "category_id": expense_category.id},
+        {"amount": "-12.50", "date": "2024-01-06", "category_id": expense_category.id},
+    ]
+
+    report = import_transactions(db, user.id, rows)
+
+    assert report.inserted == 1
+    assert [(error.row, error.detail) for error in report.errors] == [(1, "amount: Input should be a finite number")]
+    assert db.scalar(select(func.count()).where(Transaction.user_id == user.id)) == 1
+
+
+def _client(user: User) -> TestClient:
+    return TestClient(app, headers={"Authorization": f"Bearer {create_access_token(str(user.id), 0)}"})
+
+
+def test_csv_upload_that_is_not_utf8_is_imported(db: Session, user: User, expense_category: Category) -> None:
+    content = f"amount,date,description,category_id\n-4.50,2024-01-05,caf\xe9,{expense_category.id}\n".encode("latin-1")
+
+    response = _client(user).post("/api/transactions/bulk", files={"file": ("statement.csv", content, "text/csv")})
+
+    assert response.status_code == 200
+    assert response.json()["inserted"] == 1
+    assert db.scalar(select(Transaction.description).where(Transaction.user_id == user.id)) == "caf�"
+
+
+def test_malformed_csv_upload_is_a_bad_request(user: User, expense_category: Category) -> None:
+    oversized = "x" * (csv.field_size_limit() + 1)
+    content = f"amount,date,description,category_id\n-4.50,2024-01-05,{oversized},{expense_category.id}\n".encode()
+
+    response = _client(user).post("/api/transactions/bulk", files={"file": ("statement.csv", content, "text/csv")})
+
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Malformed CSV file")
@@ -0,0 +1,25 @@
+import datetime as dt
+
+from sqlalchemy.orm import Session
+
+from app.api.insights import _watermark
+from app.models import Category, User
+from app.services.imports import import_transactions
+from app.services.transactions import batch_update, selection_filters
+
+
+def test_watermark_moves_when_an_edit_leaves_the_rollups_unchanged(
+    db: Session, user: User, expense_category: Category
+) -> None:
+    rows = [{"amount": "-40.00", "date": "2024-03-05", "category_id": expense_category.id, "description": "Rent"}]
+    import_transactions(db, user.id, rows)
+    db.commit()
+    before = _watermark(db, user.id, "USD")
+    assert _watermark(db, user.id, "USD") == before
+
+    # Same month, amount and category: no rollup bucket changes.
+    changed, _ = batch_update(db, user.id, selection_filters(user.id, None, None), {"date": dt.date(2024, 3, 20)})
+    db.commit()
+
+    assert changed == 1
+    assert _watermark(db, user.id, "USD") != before
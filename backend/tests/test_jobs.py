@@ -0,0 +1,116 @@
+import datetime as dt
+from typing import Any
+
+import pytest
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+from app.models import Category, Job, Transaction, User
+from app.services import imports, jobs
+from app.services.imports import ImportCheckpoint, import_transactions
+
+
+def _rows(category: Category, count: int) -> list[dict[str, Any]]:
+    return [{"amount": "-1.00", "date": "2024-01-05", "category_id": category.id} for _ in range(count)]
+
+
+def _job(db: Session, user: User, kind: str, payload: dict[str, Any]) -> Job:
+    job = Job(user_id=user.id, kind=kind, payload=payload, run_after=dt.datetime.now(dt.timezone.utc))
+    db.add(job)
+    db.commit()
+    return job
+
+
+def _reclaim(job_id: int) -> None:
+    # What claimable_jobs does to a running job that stopped heartbeating.
+    with SessionLocal() as other:
+        other.execute(update(Job).where(Job.id == job_id).values(status="queued", error="Worker stopped responding"))
+        other.commit()
+
+
+def _count(db: Session, user: User) -> int:
+    return db.scalar(select(func.count()).where(Transaction.user_id == user.id))
+
+
+def test_atomic_import_reports_every_batch_and_checkpoints_its_commit(
+    db: Session, user: User, expense_category: Category, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(imports, "BATCH_SIZE", 2)
+    reported: list[int] = []
+    checkpoints: list[ImportCheckpoint] = []
+
+    report = import_transactions(
+        db,
+        user.id,
+        _rows(expense_category, 5),
+        atomic=True,
+        on_batch=reported.append,
+        on_checkpoint=checkpoints.append,
+    )
+
+    assert report.inserted == 5
+    assert reported == [2, 4]
+    assert [(checkpoint.rows, checkpoint.inserted) for checkpoint in checkpoints] == [(5, 5)]
+
+    # A retry after that commit, say from a worker that died before marking the
+    # job as done, carries on from the checkpoint and inserts nothing more.
+    again = import_transactions(db, user.id, _rows(expense_category, 5), atomic=True, resume=checkpoints[-1])
+    assert again.inserted == 5
+    assert _count(db, user) == 5
+
+
+def test_reclaimed_import_stops_at_its_next_commit_and_the_retry_resumes(
+    db: Session, user: User, expense_category: Category, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(imports, "BATCH_SIZE", 2)
+    job = _job(db, user, "import_transactions", {"format": "rows", "content": _rows(expense_category, 5)})
+
+    def report(self: jobs.JobContext, progress: int, total: int | None = None) -> None:
+        _reclaim(self.job_id)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(jobs.JobContext, "report", report)
+        assert jobs.execute_job(job.id) is None
+
+    db.refresh(job)
+    assert (job.status, job.attempts, job.error) == ("queued", 1, "Worker stopped responding")
+    assert job.result == {"checkpoint": {"rows": 2, "inserted": 2, "errors": []}}
+    assert _count(db, user) == 2
+
+    assert jobs.execute_job(job.id) == (user.id, "import_transactions")
+    db.refresh(job)
+    assert (job.status, job.attempts, job.result["inserted"]) == ("succeeded", 2, 5)
+    assert _count(db, user) == 5
+
+
+def test_reclaimed_attempt_cannot_settle_the_job(
+    db: Session, user: User, expense_category: Category, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def succeed(session: Session, context: jobs.JobContext) -> dict[str, Any]:
+        _reclaim(context.job_id)
+        session.add(
+            Transaction(
+                user_id=context.user_id,
+                amount="1.00",
+                currency="USD",
+                category_id=expense_category.id,
+                type="expense",
+                date=dt.date(2024, 1, 5),
+            )
+        )
+        return {"done": True}
+
+    def fail(session: Session, context: jobs.JobContext) -> None:
+        _reclaim(context.job_id)
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(jobs.HANDLERS, "succeed", succeed)
+    monkeypatch.setitem(jobs.HANDLERS, "fail", fail)
+
+    for kind in ("succeed", "fail"):
+        job = _job(db, user, kind, {})
+        assert jobs.execute_job(job.id) is None
+        db.refresh(job)
+        assert (job.status, job.attempts, job.result, job.error) == ("queued", 1, None, "Worker stopped responding")
+    assert _count(db, user) == 0
@@ -0,0 +1,85 @@
+import logging
+import re
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.db.session import SessionLocal
+from app.main import create_app
+from app.models import User
+
+
+@pytest.fixture
+def metrics_app() -> FastAPI:
+    test_app = create_app(async_reads=False)
+
+    @test_app.get("/api/test/users/{count}")
+    def one_query_per_user(count: int) -> int:
+        with SessionLocal() as db:
+            return sum(1 for user_id in range(count) if db.scalar(select(User.id).where(User.id == user_id)))
+
+    return test_app
+
+
+def _sample(body: str, name: str, labels: str) -> float:
+    match = re.search(rf"^{re.escape(name + '{' + labels)}[^}}]*}} (\S+)$", body, re.MULTILINE)
+    return float(match.group(1)) if match else 0
+
+
+def test_metrics_count_requests_and_their_queries(metrics_app: FastAPI, user: User) -> None:
+    client = TestClient(metrics_app, headers={"Authorization": f"Bearer {create_access_token(str(user.id), 0)}"})
+    labels = 'method="GET",route="/api/transactions"'
+    before = client.get("/api/metrics").text
+
+    assert client.get("/api/transactions").status_code == 200
+
+    response = client.get("/api/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    after = response.text
+    assert "# TYPE http_request_duration_seconds histogram" in after
+    duration = f'{labels},status="200",le="+Inf"'
+    assert _sample(after, "http_request_duration_seconds_bucket", duration) == (
+        _sample(before, "http_request_duration_seconds_bucket", duration) + 1
+    )
+    queries = _sample(after, "http_request_db_queries_sum", labels) - _sample(
+        before, "http_request_db_queries_sum", labels
+    )
+    assert queries >= 1
+
+
+def test_repeated_statement_is_reported_as_a_possible_n_plus_one(
+    metrics_app: FastAPI, monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    monkeypatch.setattr(settings, "repeated_statement_threshold", 5)
+    client = TestClient(metrics_app)
+    route = 'route="/api/test/users/{count}"'
+    before = _sample(client.get("/api/metrics").text, "http_request_repeated_statements_total", route)
+
+    with caplog.at_level(logging.WARNING, logger="app.db.repeated"):
+        client.get("/api/test/users/4")
+        assert caplog.records == []
+        client.get("/api/test/users/5")
+
+    assert len(caplog.records) == 1
+    assert caplog.records[0].getMessage().startswith(
+        "Possible N+1 on GET /api/test/users/{count}: statement ran 5 times: SELECT users.id"
+    )
+    after = _sample(client.get("/api/metrics").text, "http_request_repeated_statements_total", route)
+    assert after == before + 1
+
+
+def test_slow_statements_are_logged_with_their_route(
+    metrics_app: FastAPI, monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    monkeypatch.setattr(settings, "slow_query_threshold_ms", 0)
+
+    with caplog.at_level(logging.WARNING, logger="app.db.slow"):
+        TestClient(metrics_app).get("/api/test/users/1")
+
+    assert len(caplog.records) == 1
+    assert " on /api/test/users/{count}: SELECT users.id" in caplog.records[0].getMessage()
@@ -0,0 +1,53 @@
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.security import create_access_token
+from app.main import app
+from app.models import Category, MonthlySummary, User
+from app.services.imports import import_transactions
+
+
+def _client(user: User) -> TestClient:
+    return TestClient(app, headers={"Authorization": f"Bearer {create_access_token(str(user.id), 0)}"})
+
+
+def test_sums_of_cents_stay_exact(db: Session, user: User, expense_category: Category) -> None:
+    # Summed as floats, these twenty amounts come to 3.0000000000000013.
+    rows = [
+        {"amount": amount, "date": f"2024-01-{day:02d}", "category_id": expense_category.id}
+        for day in range(1, 11)
+        for amount in ("-0.10", "-0.20")
+    ]
+    import_transactions(db, user.id, rows)
+    client = _client(user)
+
+    total = db.scalar(select(MonthlySummary.total).where(MonthlySummary.user_id == user.id))
+    assert total == Decimal("3.00")
+    # The whole month is read from the rollups, a part of it from the transactions.
+    for params, expense in (
+        ({"start_date": "2024-01-01", "end_date": "2024-01-31"}, 3),
+        ({"start_date": "2024-01-01", "end_date": "2024-01-05"}, 1.5),
+    ):
+        response = client.get("/api/analytics", params=params)
+        assert response.json()["totals"] == {"income": 0, "expense": expense, "balance": -expense}
+
+
+def test_amounts_round_trip_exactly(user: User, expense_category: Category) -> None:
+    client = _client(user)
+    payload = {"amount": "1234567890.12", "type": "expense", "date": "2024-01-05", "category_id": expense_category.id}
+
+    created = client.post("/api/transactions", json=payload)
+    assert created.status_code == 201
+    assert '"amount":1234567890.12' in created.text
+    listed = client.get("/api/transactions")
+    assert '"amount":1234567890.12' in listed.text
+
+
+@pytest.mark.parametrize("amount", ["0.001", "12345678901.00"])
+def test_amounts_that_do_not_fit_are_rejected(user: User, expense_category: Category, amount: str) -> None:
+    payload = {"amount": amount, "type": "expense", "date": "2024-01-05", "category_id": expense_category.id}
+    assert _client(user).post("/api/transactions", json=payload).status_code == 422
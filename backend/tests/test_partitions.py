@@ -0,0 +1,54 @@
+import datetime as dt
+import os
+import uuid
+from collections.abc import Iterator
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.cli import pruning_queries
+from app.db.base import Base
+from app.db.explain import explain, scanned_relations
+from app.services.partitions import PARTITION_PREFIX, list_partitions, partition_transactions
+
+POSTGRES_URL = os.environ.get("TEST_POSTGRES_URL")
+
+pytestmark = [
+    pytest.mark.postgres,
+    pytest.mark.skipif(not POSTGRES_URL, reason="TEST_POSTGRES_URL is not set"),
+]
+
+
+@pytest.fixture
+def pg() -> Iterator[Session]:
+    # A throwaway schema on the server, dropped afterwards.
+    schema = f"test_{uuid.uuid4().hex[:12]}"
+    admin = create_engine(POSTGRES_URL)
+    with admin.begin() as connection:
+        connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        connection.execute(text(f"CREATE SCHEMA {schema}"))
+    engine = create_engine(POSTGRES_URL, connect_args={"options": f"-csearch_path={schema},public"})
+    try:
+        Base.metadata.create_all(engine)
+        with Session(engine) as db:
+            yield db
+    finally:
+        engine.dispose()
+        with admin.begin() as connection:
+            connection.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+        admin.dispose()
+
+
+def test_date_range_queries_scan_one_partition(pg: Session) -> None:
+    today = dt.date.today()
+    partition_transactions(pg, "month", ahead=2, since=dt.date(today.year - 1, 1, 1))
+    partitions, default = list_partitions(pg)
+    assert default is not None
+    target = next(partition for partition in partitions if partition.start <= today < partition.end)
+    start, end = target.start, target.end - dt.timedelta(days=1)
+
+    for name, query in pruning_queries(start, end).items():
+        scanned = scanned_relations(explain(pg, query))
+        pg.rollback()
+        assert {relation for relation in scanned if relation.startswith(PARTITION_PREFIX)} == {target.name}, name
@@ -0,0 +1,11 @@
+import pytest
+from sqlalchemy.orm import Session
+
+from app.cli import endpoint_queries
+from app.db.explain import explain, uses_index
+
+
+@pytest.mark.parametrize("name", list(endpoint_queries()))
+def test_endpoint_query_uses_an_index(db: Session, name: str) -> None:
+    plan = explain(db, endpoint_queries()[name])
+    assert uses_index(plan), "\n".join(plan)
@@ -0,0 +1,113 @@
+import datetime as dt
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.security import create_access_token
+from app.main import app
+from app.models import Category, RecurringTransaction, Transaction, User
+from app.services.recurring import post_due_occurrences
+from app.services.rollups import verify_monthly_summaries
+
+
+def _client(user: User) -> TestClient:
+    return TestClient(app, headers={"Authorization": f"Bearer {create_access_token(str(user.id), 0)}"})
+
+
+def _rule(db: Session, user: User, category: Category, start_date: dt.date, **fields: object) -> RecurringTransaction:
+    values = {"amount": Decimal("1200.00"), "description": "Rent", "frequency": "monthly", **fields}
+    rule = RecurringTransaction(
+        user_id=user.id,
+        category_id=category.id,
+        type=category.type,
+        start_date=start_date,
+        next_occurrence=start_date,
+        **values,
+    )
+    db.add(rule)
+    db.commit()
+    return rule
+
+
+def _posted_dates(db: Session, rule: RecurringTransaction) -> list[dt.date]:
+    return list(
+        db.scalars(select(Transaction.date).where(Transaction.recurring_id == rule.id).order_by(Transaction.date))
+    )
+
+
+def test_scheduler_backfills_and_clamps_to_the_end_of_the_month(
+    db: Session, user: User, expense_category: Category
+) -> None:
+    rule = _rule(db, user, expense_category, dt.date(2024, 1, 31))
+
+    report = post_due_occurrences(db, dt.date(2024, 4, 30))
+
+    assert report.posted >= 4
+    assert _posted_dates(db, rule) == [
+        dt.date(2024, 1, 31),
+        dt.date(2024, 2, 29),
+        dt.date(2024, 3, 31),
+        dt.date(2024, 4, 30),
+    ]
+    db.refresh(rule)
+    assert rule.next_occurrence == dt.date(2024, 5, 31)
+    assert verify_monthly_summaries(db, user.id) == []
+
+
+def test_scheduler_ticks_are_idempotent(db: Session, user: User, expense_category: Category) -> None:
+    rule = _rule(db, user, expense_category, dt.date(2024, 1, 1), frequency="weekly", interval=2)
+    post_due_occurrences(db, dt.date(2024, 2, 1))
+
+    # A tick from another worker that read the rule before it was advanced.
+    rule.next_occurrence = dt.date(2024, 1, 1)
+    db.commit()
+    post_due_occurrences(db, dt.date(2024, 2, 1))
+
+    assert _posted_dates(db, rule) == [dt.date(2024, 1, 1), dt.date(2024, 1, 15), dt.date(2024, 1, 29)]
+    assert verify_monthly_summaries(db, user.id) == []
+
+
+def test_scheduler_stops_at_the_end_date(db: Session, user: User, expense_category: Category) -> None:
+    rule = _rule(db, user, expense_category, dt.date(2024, 1, 10), end_date=dt.date(2024, 2, 10))
+
+    post_due_occurrences(db, dt.date(2024, 6, 1))
+
+    assert _posted_dates(db, rule) == [dt.date(2024, 1, 10), dt.date(2024, 2, 10)]
+
+
+def test_create_and_update_a_recurring_transaction(user: User, expense_category: Category) -> None:
+    client = _client(user)
+    created = client.post(
+        "/api/recurring",
+        json={
+            "amount": "15.99",
+            "category_id": expense_category.id,
+            "type": "expense",
+            "frequency": "monthly",
+            "start_date": "2024-01-15",
+        },
+    )
+    assert created.status_code == 201
+    assert created.json()["next_occurrence"] == "2024-01-15"
+
+    updated = client.put(f"/api/recurring/{created.json()['id']}", json={"interval": 3, "end_date": None})
+    assert updated.status_code == 200
+    assert updated.json()["interval"] == 3
+    assert updated.json()["end_date"] is None
+
+
+@pytest.mark.parametrize(
+    "field", ["amount", "currency", "category_id", "type", "frequency", "interval", "start_date", "active"]
+)
+def test_update_rejects_null_for_required_fields(
+    db: Session, user: User, expense_category: Category, field: str
+) -> None:
+    rule = _rule(db, user, expense_category, dt.date(2024, 1, 1))
+
+    response = _client(user).put(f"/api/recurring/{rule.id}", json={field: None})
+
+    assert response.status_code == 422
+    assert f"{field} cannot be null" in response.text
@@ -0,0 +1,130 @@
+import itertools
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from sqlalchemy import Engine, create_engine, event, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.api import deps
+from app.db import session as db_session
+from app.db.base import Base
+from app.db.session import RoutingSession, engine
+from app.models import Category, User
+
+
+def _routing_factory(replica: Engine) -> sessionmaker[Session]:
+    return sessionmaker(class_=RoutingSession, primary=engine, replicas=itertools.cycle([replica]), autoflush=False)
+
+
+def _track_writes(factory: sessionmaker[Session]) -> None:
+    event.listen(factory, "after_flush", db_session._note_flush)
+    event.listen(factory, "do_orm_execute", db_session._note_statement)
+    event.listen(factory, "after_commit", db_session._mark_writer)
+
+
+@pytest.fixture
+def replica(tmp_path: Path) -> Iterator[Engine]:
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    Base.metadata.create_all(replica)
+    yield replica
+    replica.dispose()
+
+
+@pytest.fixture
+def primary(monkeypatch: pytest.MonkeyPatch) -> sessionmaker[Session]:
+    factory = sessionmaker(bind=engine, autoflush=False)
+    _track_writes(factory)
+    monkeypatch.setattr(deps, "SessionLocal", factory)
+    return factory
+
+
+@pytest.fixture
+def routing(
+    primary: sessionmaker[Session], replica: Engine, monkeypatch: pytest.MonkeyPatch
+) -> sessionmaker[Session]:
+    # Wired up the way app.db.session does it when DATABASE_REPLICA_URLS is set.
+    factory = _routing_factory(replica)
+    _track_writes(factory)
+    monkeypatch.setattr(db_session, "replica_engines", [replica])
+    monkeypatch.setattr(db_session, "_replica_down_until", {})
+    monkeypatch.setattr(deps, "ReadSessionLocal", factory)
+    return factory
+
+
+def _copy_user(replica: Engine, user: User) -> None:
+    with Session(replica) as db:
+        db.add(
+            User(
+                id=user.id,
+                full_name=user.full_name,
+                email=user.email,
+                hashed_password=user.hashed_password,
+                agreed_terms=user.agreed_terms,
+            )
+        )
+        db.commit()
+
+
+def test_reads_go_to_the_replica(routing: sessionmaker[Session], replica: Engine, user: User) -> None:
+    with routing() as db:
+        assert db.get(User, user.id) is None
+
+    _copy_user(replica, user)
+    with routing() as db:
+        assert db.scalar(select(User.email).where(User.id == user.id)) == user.email
+        assert db.replica is replica
+
+
+def test_writes_go_to_the_primary(
+    primary: sessionmaker[Session], routing: sessionmaker[Session], replica: Engine, user: User
+) -> None:
+    with routing() as db:
+        db.add(Category(user_id=user.id, name="Rent", type="expense"))
+        db.commit()
+        # The session stays on the primary after its first write.
+        assert db.replica is None
+        assert db.scalar(select(Category.name).where(Category.user_id == user.id)) == "Rent"
+
+    with primary() as db:
+        assert db.scalar(select(Category.name).where(Category.user_id == user.id)) == "Rent"
+    with Session(replica) as db:
+        assert db.scalar(select(Category.name).where(Category.user_id == user.id)) is None
+
+
+def test_reads_stay_on_the_primary_after_a_write(
+    primary: sessionmaker[Session], routing: sessionmaker[Session], user: User
+) -> None:
+    assert deps.read_session_factory(user.id) is routing
+
+    with primary() as db:
+        db.info["user_id"] = user.id
+        db.add(Category(user_id=user.id, name="Salary", type="income"))
+        db.commit()
+
+    assert deps.read_session_factory(user.id) is primary
+
+
+def test_unavailable_replica_falls_back_to_the_primary(
+    routing: sessionmaker[Session], tmp_path: Path, user: User
+) -> None:
+    missing = create_engine(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    factory = _routing_factory(missing)
+
+    with factory() as db:
+        assert db.scalar(select(User.email).where(User.id == user.id)) == user.email
+        assert db.replica is None
+    assert missing in db_session._replica_down_until
+
+
+def test_read_principal_resolves_on_the_replica(routing: sessionmaker[Session], replica: Engine, user: User) -> None:
+    deps.invalidate_user(user.id)
+    with routing() as db:
+        # Not on the replica yet: looked up on the primary instead of failing.
+        assert deps.get_read_principal((user.id, 0), db).email == user.email
+
+    deps.invalidate_user(user.id)
+    _copy_user(replica, user)
+    with routing() as db:
+        assert deps.get_read_principal((user.id, 0), db).email == user.email
+        assert db.replica is replica
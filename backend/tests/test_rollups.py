@@ -0,0 +1,67 @@
+import datetime as dt
+from collections.abc import Iterator
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app.models import ArchivedPartition, Category, MonthlySummary, Transaction, User
+from app.services.rollups import rebuild_monthly_summaries, verify_monthly_summaries
+
+
+@pytest.fixture
+def archived_2023(db: Session) -> Iterator[ArchivedPartition]:
+    archived = ArchivedPartition(
+        name="transactions_part_2023",
+        start_date=dt.date(2023, 1, 1),
+        end_date=dt.date(2024, 1, 1),
+        path="archive/transactions_part_2023.csv.gz",
+        rows=3,
+    )
+    db.add(archived)
+    db.commit()
+    yield archived
+    db.rollback()
+    db.execute(delete(ArchivedPartition).where(ArchivedPartition.name == archived.name))
+    db.commit()
+
+
+def test_rebuild_keeps_archived_months(
+    db: Session, user: User, expense_category: Category, archived_2023: ArchivedPartition
+) -> None:
+    # The 2023 transactions went with the archived partition; only their rollup is left.
+    db.add(
+        MonthlySummary(
+            user_id=user.id,
+            month="2023-06",
+            category_id=expense_category.id,
+            type="expense",
+            currency="USD",
+            total=Decimal("90.00"),
+            count=3,
+        )
+    )
+    db.add(
+        Transaction(
+            user_id=user.id,
+            category_id=expense_category.id,
+            amount=Decimal("12.50"),
+            type="expense",
+            date=dt.date(2024, 3, 5),
+        )
+    )
+    db.commit()
+
+    assert verify_monthly_summaries(db, user.id) == [(user.id, "2024-03", expense_category.id, "expense", "USD")]
+
+    assert rebuild_monthly_summaries(db, user.id) == 1
+    db.commit()
+
+    summaries = db.execute(
+        select(MonthlySummary.month, MonthlySummary.total, MonthlySummary.count)
+        .where(MonthlySummary.user_id == user.id)
+        .order_by(MonthlySummary.month)
+    ).all()
+    assert summaries == [("2023-06", Decimal("90.00"), 3), ("2024-03", Decimal("12.50"), 1)]
+    assert verify_monthly_summaries(db, user.id) == []
@@ -0,0 +1,85 @@
+import time
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from app.models import Category, CategoryRule, User
+from app.schemas.rule import CategoryRuleCreate
+from app.services.rules import compile_rules, invalidate_rules, load_matcher
+
+
+def _stored_rule(category_id: int, match_type: str, patterns: list[str]) -> SimpleNamespace:
+    return SimpleNamespace(
+        category_id=category_id,
+        type="expense",
+        match_type=match_type,
+        patterns=patterns,
+        amount_min=None,
+        amount_max=None,
+    )
+
+
+@pytest.mark.parametrize(
+    ("pattern", "problem"),
+    [
+        (r"(\d)\1", "invalid escape sequence"),
+        ("(?P<word>a)(?P=word)", "invalid perl operator"),
+        ("(?=amzn)", "invalid perl operator"),
+        ("(unclosed", "missing \\)"),
+    ],
+)
+def test_regex_rules_reject_what_re2_cannot_run(pattern: str, problem: str) -> None:
+    with pytest.raises(ValidationError, match=problem):
+        CategoryRuleCreate(category_id=1, match_type="regex", patterns=[pattern])
+
+
+@pytest.mark.parametrize("pattern", ["^(a+)+$", "^(a|a)+$", "^(a|aa)+$", r"^(\w+\s?)*$"])
+def test_regex_rules_match_in_linear_time(pattern: str) -> None:
+    CategoryRuleCreate(category_id=1, match_type="regex", patterns=[pattern])
+    matcher = compile_rules([_stored_rule(1, "regex", [pattern])])
+
+    # Exponential on a backtracking engine: this would not finish.
+    started = time.perf_counter()
+    assert matcher.match("a" * 10_000 + "!", "-1.00", "expense") is None
+    assert time.perf_counter() - started < 1
+
+
+def test_regex_rules_ignore_case() -> None:
+    matcher = compile_rules([_stored_rule(1, "regex", [r"\bamzn\b.*prime"])])
+    assert matcher.match("AMZN Mktp PRIME", "-8.99", "expense") == 1
+    assert matcher.match("amznprime", "-8.99", "expense") is None
+
+
+def test_rules_need_a_pattern_or_an_amount_bound() -> None:
+    with pytest.raises(ValidationError, match="at least one pattern or an amount bound"):
+        CategoryRuleCreate(category_id=1)
+    CategoryRuleCreate(category_id=1, amount_min=Decimal("100"))
+
+
+def test_stored_rules_that_fail_the_checks_are_skipped() -> None:
+    # Saved before the checks: a catch-all and a lookahead.
+    matcher = compile_rules(
+        [_stored_rule(1, "contains", []), _stored_rule(2, "regex", ["(?=x)"]), _stored_rule(3, "contains", ["tesco"])]
+    )
+    assert matcher.match("TESCO STORES", "-9.99", "expense") == 3
+    assert matcher.match("Aldi", "-9.99", "expense") is None
+
+
+def test_matcher_is_cached_per_rules_version(db: Session, user: User, expense_category: Category) -> None:
+    db.add(CategoryRule(user_id=user.id, category_id=expense_category.id, match_type="contains", patterns=["tesco"]))
+    db.commit()
+    invalidate_rules(user.id)
+
+    matcher = load_matcher(db, user.id)
+    assert load_matcher(db, user.id) is matcher
+    assert matcher.match("TESCO STORES", "-9.99", "expense") == expense_category.id
+    assert matcher.match("Aldi", "-9.99", "expense") is None
+
+    db.add(CategoryRule(user_id=user.id, category_id=expense_category.id, match_type="contains", patterns=["aldi"]))
+    db.commit()
+    invalidate_rules(user.id)
+
+    assert load_matcher(db, user.id).match("Aldi", "-9.99", "expense") == expense_category.id
@@ -0,0 +1,73 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.security import create_access_token
+from app.main import app
+from app.models import Category, User
+from app.services.imports import import_transactions
+
+
+@pytest.fixture
+def client(db: Session, user: User, expense_category: Category) -> TestClient:
+    refunds = Category(user_id=user.id, name="Refunds", type="income")
+    db.add(refunds)
+    db.commit()
+    rows = [
+        {"amount": "-20.00", "date": "2024-01-03", "category_id": expense_category.id, "description": description}
+        for description in (
+            "Amazon Marketplace order 113-2841 shipped to home address",
+            "AMAZON amazon Prime",
+            "Tesco groceries",
+            "Amazing Thai",
+        )
+    ]
+    rows.append({"amount": "20.00", "date": "2024-02-10", "category_id": refunds.id, "description": "Amazon refund"})
+    import_transactions(db, user.id, rows)
+    return TestClient(app, headers={"Authorization": f"Bearer {create_access_token(str(user.id), 0)}"})
+
+
+def _descriptions(client: TestClient, **params: str) -> list[str]:
+    response = client.get("/api/transactions", params=params)
+    assert response.status_code == 200
+    return [row["description"] for row in response.json()]
+
+
+def test_search_matches_word_prefixes_and_every_term(client: TestClient) -> None:
+    assert sorted(_descriptions(client, q="ama")) == [
+        "AMAZON amazon Prime",
+        "Amazing Thai",
+        "Amazon Marketplace order 113-2841 shipped to home address",
+        "Amazon refund",
+    ]
+    assert _descriptions(client, q="amazon pri") == ["AMAZON amazon Prime"]
+    assert _descriptions(client, q="groc!!") == ["Tesco groceries"]
+    assert _descriptions(client, q="zon") == []
+
+
+def test_search_combines_with_the_other_filters(client: TestClient) -> None:
+    assert _descriptions(client, q="amazon", type="income") == ["Amazon refund"]
+    assert _descriptions(client, q="amazon", sort="relevance", end_date="2024-01-31") == [
+        "AMAZON amazon Prime",
+        "Amazon Marketplace order 113-2841 shipped to home address",
+    ]
+
+
+def test_relevance_ranks_the_best_match_first(client: TestClient) -> None:
+    ranked = _descriptions(client, q="amazon", sort="relevance")
+    assert ranked[0] == "AMAZON amazon Prime"
+    assert ranked[-1] == "Amazon Marketplace order 113-2841 shipped to home address"
+
+
+@pytest.mark.parametrize(
+    ("params", "detail"),
+    [
+        ({"sort": "relevance"}, "sort=relevance requires q"),
+        ({"q": "!!"}, "Search query has no words"),
+        ({"q": "amazon", "sort": "relevance", "cursor": "MjAyNC0wMS0wM3wx"}, "Relevance-sorted results have no cursor"),
+    ],
+)
+def test_search_rejects_unusable_requests(client: TestClient, params: dict[str, str], detail: str) -> None:
+    response = client.get("/api/transactions", params=params)
+    assert response.status_code == 400
+    assert response.json()["detail"] == detail
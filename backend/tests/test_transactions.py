@@ -0,0 +1,176 @@
+import datetime as dt
+from decimal import Decimal
+
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.api.transactions import DEFAULT_PAGE_SIZE, NEXT_CURSOR_HEADER
+from app.core.security import create_access_token
+from app.main import app
+from app.models import Category, Goal, Transaction, User
+from app.schemas.transaction import TransactionResponse
+from app.services.imports import import_transactions
+from app.services.rollups import verify_monthly_summaries
+
+
+def test_list_is_paginated_and_the_cursor_reaches_every_row(
+    db: Session, user: User, expense_category: Category
+) -> None:
+    total = DEFAULT_PAGE_SIZE + 5
+    first_day = dt.date(2024, 1, 1)
+    rows = [
+        {"amount": "-1.00", "date": str(first_day + dt.timedelta(days=index % 40)), "category_id": expense_category.id}
+        for index in range(total)
+    ]
+    import_transactions(db, user.id, rows)
+    db.commit()
+    client = TestClient(app, headers={"Authorization": f"Bearer {create_access_token(str(user.id), 0)}"})
+
+    first = client.get("/api/transactions")
+    assert first.status_code == 200
+    assert len(first.json()) == DEFAULT_PAGE_SIZE
+    cursor = first.headers[NEXT_CURSOR_HEADER]
+
+    rest = client.get("/api/transactions", params={"cursor": cursor})
+    assert rest.status_code == 200
+    assert NEXT_CURSOR_HEADER not in rest.headers
+
+    listed = first.json() + rest.json()
+    assert len({row["id"] for row in listed}) == total
+    assert [(row["date"], row["id"]) for row in listed] == sorted(
+        ((row["date"], row["id"]) for row in listed), reverse=True
+    )
+
+
+def test_list_bodies_match_the_response_model(db: Session, user: User, expense_category: Category) -> None:
+    goal = Goal(user_id=user.id, name="Holiday", target_amount=500, currency="USD")
+    db.add(goal)
+    db.commit()
+    rows = [
+        {"amount": "-0.10", "date": "2024-01-05", "category_id": expense_category.id, "description": "Gum"},
+        {"amount": "-1234567.89", "date": "2024-01-06", "category_id": expense_category.id, "goal_id": goal.id},
+    ]
+    import_transactions(db, user.id, rows)
+    db.commit()
+    transactions = db.scalars(
+        select(Transaction)
+        .where(Transaction.user_id == user.id)
+        .order_by(Transaction.date.desc(), Transaction.id.desc())
+    )
+    expected = [
+        TransactionResponse.model_validate(transaction).model_dump(mode="json", by_alias=True)
+        for transaction in transactions
+    ]
+    client = _client(user)
+
+    page = client.get("/api/transactions")
+    assert page.json() == expected
+    assert [list(row) for row in page.json()] == [list(row) for row in expected]
+    assert '"amount":1234567.89' in page.text and '"amount":0.1' in page.text
+
+    streamed = client.get("/api/transactions", params={"stream": True})
+    assert streamed.headers["content-type"] == "application/x-ndjson"
+    assert [orjson.loads(line) for line in streamed.text.splitlines()] == expected
+
+
+@pytest.mark.parametrize("field", ["amount", "currency", "category_id", "type", "date"])
+def test_update_rejects_null_for_required_fields(
+    db: Session, user: User, expense_category: Category, field: str
+) -> None:
+    import_transactions(db, user.id, [{"amount": "-9.99", "date": "2024-01-05", "category_id": expense_category.id}])
+    db.commit()
+    transaction_id = db.scalar(select(Transaction.id).where(Transaction.user_id == user.id))
+    client = TestClient(app, headers={"Authorization": f"Bearer {create_access_token(str(user.id), 0)}"})
+
+    response = client.put(f"/api/transactions/{transaction_id}", json={field: None})
+
+    assert response.status_code == 422
+    assert f"{field} cannot be null" in response.text
+    assert client.put(f"/api/transactions/{transaction_id}", json={"description": None}).status_code == 200
+
+
+def _client(user: User) -> TestClient:
+    return TestClient(app, headers={"Authorization": f"Bearer {create_access_token(str(user.id), 0)}"})
+
+
+def _ledger(db: Session, user: User, category: Category) -> list[int]:
+    rows = [
+        {"amount": "-10.00", "date": "2024-01-05", "category_id": category.id, "description": "Coffee"},
+        {"amount": "-20.00", "date": "2024-01-20", "category_id": category.id, "description": "Lunch"},
+        {"amount": "-30.00", "date": "2024-02-03", "category_id": category.id, "description": "Dinner"},
+    ]
+    import_transactions(db, user.id, rows)
+    db.commit()
+    return list(db.scalars(select(Transaction.id).where(Transaction.user_id == user.id).order_by(Transaction.date)))
+
+
+def _other_category(db: Session, user: User) -> Category:
+    category = Category(user_id=user.id, name="Eating out", type="expense")
+    db.add(category)
+    db.commit()
+    return category
+
+
+def test_batch_update_by_ids_keeps_rollups_and_goals_in_step(
+    db: Session, user: User, expense_category: Category
+) -> None:
+    ids = _ledger(db, user, expense_category)
+    target = _other_category(db, user)
+    goal = Goal(user_id=user.id, name="Less eating out", target_amount=Decimal("500.00"), category_id=target.id)
+    db.add(goal)
+    db.commit()
+
+    response = _client(user).patch(
+        "/api/transactions/batch", json={"ids": ids[1:], "changes": {"category_id": target.id}}
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"affected": 2}
+    db.expire_all()
+    categories = select(Transaction.category_id).where(Transaction.user_id == user.id).order_by(Transaction.date)
+    assert db.scalars(categories).all() == [expense_category.id, target.id, target.id]
+    assert goal.current_amount == Decimal("50.00")
+    assert verify_monthly_summaries(db, user.id) == []
+
+
+def test_batch_update_by_filter(db: Session, user: User, expense_category: Category) -> None:
+    _ledger(db, user, expense_category)
+
+    response = _client(user).patch(
+        "/api/transactions/batch",
+        json={"filter": {"start_date": "2024-01-01", "end_date": "2024-01-31"}, "changes": {"date": "2024-03-01"}},
+    )
+
+    assert response.json() == {"affected": 2}
+    months = db.scalars(select(Transaction.date).where(Transaction.user_id == user.id).order_by(Transaction.date))
+    assert [day.isoformat() for day in months] == ["2024-02-03", "2024-03-01", "2024-03-01"]
+    assert verify_monthly_summaries(db, user.id) == []
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"ids": [1], "changes": {"currency": None}},
+        {"ids": [1], "changes": {}},
+        {"ids": [1], "filter": {"type": "expense"}, "changes": {"description": "x"}},
+        {"filter": {}, "changes": {"description": "x"}},
+    ],
+)
+def test_batch_update_rejects_invalid_requests(user: User, payload: dict[str, object]) -> None:
+    assert _client(user).patch("/api/transactions/batch", json=payload).status_code == 422
+
+
+def test_batch_delete_by_filter_and_ids(db: Session, user: User, expense_category: Category) -> None:
+    ids = _ledger(db, user, expense_category)
+    client = _client(user)
+
+    by_filter = client.request("DELETE", "/api/transactions/batch", json={"filter": {"q": "lunch"}})
+    by_ids = client.request("DELETE", "/api/transactions/batch", json={"ids": [ids[2], ids[1]]})
+
+    assert by_filter.json() == {"affected": 1}
+    assert by_ids.json() == {"affected": 1}
+    assert db.scalars(select(Transaction.id).where(Transaction.user_id == user.id)).all() == [ids[0]]
+    assert verify_monthly_summaries(db, user.id) == []
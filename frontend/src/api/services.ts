@@ -1,5 +1,5 @@
 import apiClient from './client';
-import type { Budget, Category, Goal, Transaction, UserProfile } from '../types';
+import type { Analytics, Budget, BudgetStatus, Category, Goal, GoalForecast, Transaction, UserProfile } from '../types';
 
 export const authService = {
   register: async (payload: {
@@ -21,11 +21,15 @@ export const authService = {
 };
 
 export const transactionService = {
-  list: async () => apiClient.get<Transaction[]>('/transactions'),
-  create: async (payload: Omit<Transaction, 'id'>) => apiClient.post<Transaction>('/transactions', payload),
+  list: async (params?: { limit?: number; cursor?: string; q?: string }) =>
+    apiClient.get<Transaction[]>('/transactions', { params }),
+  create: async (payload: Omit<Transaction, 'id' | 'currency'> & { currency?: string }) =>
+    apiClient.post<Transaction>('/transactions', payload),
   update: async (id: number, payload: Partial<Transaction>) =>
     apiClient.put<Transaction>(`/transactions/${id}`, payload),
-  remove: async (id: number) => apiClient.delete(`/transactions/${id}`)
+  remove: async (id: number) => apiClient.delete(`/transactions/${id}`),
+  export: async (format: 'csv' | 'parquet' | 'ndjson') =>
+    apiClient.get<Blob>('/transactions/export', { params: { format }, responseType: 'blob' })
 };
 
 export const categoryService = {
@@ -36,12 +40,22 @@ export const categoryService = {
 
 export const budgetService = {
   list: async () => apiClient.get<Budget[]>('/budgets'),
-  create: async (payload: Omit<Budget, 'id'>) => apiClient.post<Budget>('/budgets', payload),
+  status: async (params?: { month?: string; start_month?: string; end_month?: string }) =>
+    apiClient.get<BudgetStatus[]>('/budgets/status', { params }),
+  create: async (payload: Omit<Budget, 'id' | 'currency'> & { currency?: string }) =>
+    apiClient.post<Budget>('/budgets', payload),
   remove: async (id: number) => apiClient.delete(`/budgets/${id}`)
 };
 
 export const goalService = {
   list: async () => apiClient.get<Goal[]>('/goals'),
-  create: async (payload: Omit<Goal, 'id'>) => apiClient.post<Goal>('/goals', payload),
+  create: async (payload: Omit<Goal, 'id' | 'currency'> & { currency?: string }) =>
+    apiClient.post<Goal>('/goals', payload),
+  forecast: async (id: number) => apiClient.get<GoalForecast>(`/goals/${id}/forecast`),
   remove: async (id: number) => apiClient.delete(`/goals/${id}`)
 };
+
+export const analyticsService = {
+  summary: async (params?: { start_date?: string; end_date?: string; category_id?: number; type?: string }) =>
+    apiClient.get<Analytics>('/analytics', { params })
+};
@@ -1,10 +1,10 @@
 import { FormEvent, useEffect, useMemo, useState } from 'react';
 
 import { budgetService, categoryService } from '../api/services';
-import type { Budget, Category } from '../types';
+import type { BudgetStatus, Category } from '../types';
 
 export default function BudgetsPage() {
-  const [budgets, setBudgets] = useState<Budget[]>([]);
+  const [budgets, setBudgets] = useState<BudgetStatus[]>([]);
   const [categories, setCategories] = useState<Category[]>([]);
   const [categoryId, setCategoryId] = useState('');
   const [amount, setAmount] = useState('');
@@ -16,7 +16,7 @@ export default function BudgetsPage() {
   );
 
   const loadData = async () => {
-    const [budgetRes, categoryRes] = await Promise.all([budgetService.list(), categoryService.list()]);
+    const [budgetRes, categoryRes] = await Promise.all([budgetService.status(), categoryService.list()]);
     setBudgets(budgetRes.data);
     setCategories(categoryRes.data);
     if (categoryRes.data.length > 0) {
@@ -72,7 +72,11 @@ export default function BudgetsPage() {
           <h3>Current Budgets</h3>
           {budgets.map((budget) => (
             <div key={budget.id} className="row-item">
-              <span>Category #{budget.category_id} • ${Number(budget.amount).toFixed(2)} • {budget.month}</span>
+              <span>
+                {budget.category_name} • {Number(budget.spent).toFixed(2)} / {Number(budget.amount).toFixed(2)} {budget.currency} (
+                {budget.percent_used}%) • {budget.month}
+                {budget.projected_overrun > 0 && ` • projected overrun ${budget.projected_overrun.toFixed(2)} ${budget.currency}`}
+              </span>
               <button className="danger" onClick={() => removeBudget(budget.id)}>Delete</button>
             </div>
           ))}
@@ -1,4 +1,4 @@
-import { useEffect, useMemo, useState } from 'react';
+import { useEffect, useState } from 'react';
 import {
   ArcElement,
   BarElement,
@@ -12,8 +12,8 @@ import {
 } from 'chart.js';
 import { Bar, Line, Pie } from 'react-chartjs-2';
 
-import { transactionService } from '../api/services';
-import type { Transaction } from '../types';
+import { analyticsService } from '../api/services';
+import type { Analytics } from '../types';
 
 ChartJS.register(
   ArcElement,
@@ -26,34 +26,22 @@ ChartJS.register(
   Legend
 );
 
+const emptyAnalytics: Analytics = {
+  currency: '',
+  totals: { income: 0, expense: 0, balance: 0 },
+  monthly: [],
+  categories: []
+};
+
 export default function DashboardPage() {
-  const [transactions, setTransactions] = useState<Transaction[]>([]);
+  const [analytics, setAnalytics] = useState<Analytics>(emptyAnalytics);
 
   useEffect(() => {
-    transactionService.list().then(({ data }) => setTransactions(data)).catch(() => setTransactions([]));
+    analyticsService.summary().then(({ data }) => setAnalytics(data)).catch(() => setAnalytics(emptyAnalytics));
   }, []);
 
-  const summary = useMemo(() => {
-    const income = transactions.filter((t) => t.type === 'income').reduce((acc, t) => acc + Number(t.amount), 0);
-    const expense = transactions.filter((t) => t.type === 'expense').reduce((acc, t) => acc + Number(t.amount), 0);
-    return { income, expense, balance: income - expense };
-  }, [transactions]);
-
-  const monthlyEvolution = useMemo(() => {
-    const bucket = new Map<string, { month: string; income: number; expense: number; balance: number }>();
-    transactions.forEach((tx) => {
-      const month = tx.date.slice(0, 7);
-      if (!bucket.has(month)) {
-        bucket.set(month, { month, income: 0, expense: 0, balance: 0 });
-      }
-      const item = bucket.get(month)!;
-      if (tx.type === 'income') item.income += Number(tx.amount);
-      if (tx.type === 'expense') item.expense += Number(tx.amount);
-      item.balance = item.income - item.expense;
-    });
-
-    return Array.from(bucket.values()).sort((a, b) => a.month.localeCompare(b.month));
-  }, [transactions]);
+  const summary = analytics.totals;
+  const monthlyEvolution = analytics.monthly;
 
   const pieData = {
     labels: ['Income', 'Expense'],
@@ -99,9 +87,9 @@ export default function DashboardPage() {
     <section>
       <h1>Financial Dashboard</h1>
       <div className="stats-grid">
-        <div className="card neo"><h3>Total Income</h3><p>${summary.income.toFixed(2)}</p></div>
-        <div className="card neo"><h3>Total Expense</h3><p>${summary.expense.toFixed(2)}</p></div>
-        <div className="card neo"><h3>Net Balance</h3><p>${summary.balance.toFixed(2)}</p></div>
+        <div className="card neo"><h3>Total Income</h3><p>{summary.income.toFixed(2)} {analytics.currency}</p></div>
+        <div className="card neo"><h3>Total Expense</h3><p>{summary.expense.toFixed(2)} {analytics.currency}</p></div>
+        <div className="card neo"><h3>Net Balance</h3><p>{summary.balance.toFixed(2)} {analytics.currency}</p></div>
       </div>
 
       <div className="grid-two">
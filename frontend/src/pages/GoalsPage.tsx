@@ -81,7 +81,7 @@ export default function GoalsPage() {
                   <button className="danger" onClick={() => removeGoal(goal.id)}>Delete</button>
                 </div>
                 <p>
-                  ${Number(goal.current_amount).toFixed(2)} / ${Number(goal.target_amount).toFixed(2)}
+                  {Number(goal.current_amount).toFixed(2)} / {Number(goal.target_amount).toFixed(2)} {goal.currency}
                 </p>
                 <div className="progress-track">
                   <div className="progress-fill" style={{ width: `${Math.min(progress, 100)}%` }} />
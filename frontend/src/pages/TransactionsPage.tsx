@@ -3,6 +3,10 @@ import { FormEvent, useEffect, useMemo, useState } from 'react';
 import { categoryService, transactionService } from '../api/services';
 import type { Category, Transaction, TransactionType } from '../types';
 
+// GET /transactions returns one page at a time; the rest is fetched with the
+// X-Next-Cursor of the previous page.
+const PAGE_SIZE = 100;
+
 export default function TransactionsPage() {
   const [transactions, setTransactions] = useState<Transaction[]>([]);
   const [categories, setCategories] = useState<Category[]>([]);
@@ -12,10 +16,18 @@ export default function TransactionsPage() {
   const [description, setDescription] = useState('');
   const [categoryId, setCategoryId] = useState('');
   const [error, setError] = useState('');
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [search, setSearch] = useState('');
+
+  const searchParams = () => ({ limit: PAGE_SIZE, ...(search.trim() ? { q: search.trim() } : {}) });
 
   const loadData = async () => {
-    const [txRes, catRes] = await Promise.all([transactionService.list(), categoryService.list()]);
+    const [txRes, catRes] = await Promise.all([
+      transactionService.list(searchParams()),
+      categoryService.list()
+    ]);
     setTransactions(txRes.data);
+    setNextCursor(txRes.headers['x-next-cursor'] ?? null);
     setCategories(catRes.data);
     if (!categoryId && catRes.data.length > 0) {
       setCategoryId(String(catRes.data[0].id));
@@ -56,6 +68,42 @@ export default function TransactionsPage() {
     }
   };
 
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    setError('');
+    try {
+      const { data, headers } = await transactionService.list({ ...searchParams(), cursor: nextCursor });
+      setTransactions((current) => [...current, ...data]);
+      setNextCursor(headers['x-next-cursor'] ?? null);
+    } catch (err: any) {
+      setError(err?.response?.data?.detail ?? 'Failed to load more transactions.');
+    }
+  };
+
+  const searchTransactions = async (e: FormEvent) => {
+    e.preventDefault();
+    setError('');
+    try {
+      await loadData();
+    } catch (err: any) {
+      setError(err?.response?.data?.detail ?? 'Search failed.');
+    }
+  };
+
+  const exportTransactions = async () => {
+    try {
+      const { data } = await transactionService.export('csv');
+      const url = URL.createObjectURL(data);
+      const link = document.createElement('a');
+      link.href = url;
+      link.download = 'transactions.csv';
+      link.click();
+      URL.revokeObjectURL(url);
+    } catch {
+      setError('Failed to export transactions.');
+    }
+  };
+
   const removeTransaction = async (id: number) => {
     try {
       await transactionService.remove(id);
@@ -105,6 +153,14 @@ export default function TransactionsPage() {
 
         <div className="card neo">
           <h3>Transaction History</h3>
+          <form onSubmit={searchTransactions}>
+            <input
+              placeholder="Search descriptions"
+              value={search}
+              onChange={(e) => setSearch(e.target.value)}
+            />
+            <button type="submit">Search</button>
+          </form>
           <table>
             <thead>
               <tr>
@@ -120,7 +176,7 @@ export default function TransactionsPage() {
                 <tr key={transaction.id}>
                   <td>{transaction.date}</td>
                   <td>{transaction.type}</td>
-                  <td>${Number(transaction.amount).toFixed(2)}</td>
+                  <td>{Number(transaction.amount).toFixed(2)} {transaction.currency}</td>
                   <td>{transaction.description ?? '-'}</td>
                   <td>
                     <button className="danger" onClick={() => removeTransaction(transaction.id)}>Delete</button>
@@ -129,6 +185,8 @@ export default function TransactionsPage() {
               ))}
             </tbody>
           </table>
+          {nextCursor && <button onClick={loadMore}>Load more</button>}
+          <button onClick={exportTransactions}>Export CSV</button>
         </div>
       </div>
     </section>
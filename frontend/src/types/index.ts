@@ -5,6 +5,7 @@ export interface UserProfile {
   full_name: string;
   email: string;
   agreed_terms: boolean;
+  base_currency: string;
 }
 
 export interface Category {
@@ -16,23 +17,74 @@ export interface Category {
 export interface Transaction {
   id: number;
   amount: number;
+  currency: string;
   type: TransactionType;
   date: string;
   description?: string;
   category_id: number;
+  goal_id?: number | null;
 }
 
 export interface Budget {
   id: number;
   category_id: number;
   amount: number;
+  currency: string;
   month: string;
 }
 
+export interface BudgetStatus extends Budget {
+  category_name: string;
+  spent: number;
+  remaining: number;
+  percent_used: number;
+  projected_spent: number;
+  projected_overrun: number;
+}
+
 export interface Goal {
   id: number;
   name: string;
   target_amount: number;
+  currency: string;
   current_amount: number;
   deadline?: string;
+  category_id?: number | null;
+}
+
+export interface GoalForecast {
+  goal_id: number;
+  target_amount: number;
+  current_amount: number;
+  remaining: number;
+  monthly_rate: number;
+  months_to_completion: number | null;
+  projected_completion: string | null;
+  deadline: string | null;
+  on_track: boolean | null;
+  required_monthly: number | null;
+  history: { month: string; amount: number }[];
+}
+
+export interface MonthlyAnalytics {
+  month: string;
+  income: number;
+  expense: number;
+  balance: number;
+  running_balance: number;
+}
+
+export interface CategoryAnalytics {
+  category_id: number;
+  name: string;
+  type: TransactionType;
+  total: number;
+  count: number;
+}
+
+export interface Analytics {
+  currency: string;
+  totals: { income: number; expense: number; balance: number };
+  monthly: MonthlyAnalytics[];
+  categories: CategoryAnalytics[];
 }